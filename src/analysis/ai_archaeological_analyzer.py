@@ -5,6 +5,8 @@
 import os
 import json
 import base64
+import asyncio
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from openai import OpenAI
@@ -12,6 +14,8 @@ from dotenv import load_dotenv
 import keyring
 import time
 import re
+import heapq
+from operator import itemgetter
 
 # Import from organized structure
 from src.config.output_paths import get_paths, get_ai_analysis_path
@@ -43,6 +47,13 @@ class EnhancedAIAnalyzer:
             'site': [],
             'leverage': []
         }
+        # Running total of prompts_used entries, so status lines need not walk it
+        self._prompt_count = 0
+        self._prompt_lock = threading.Lock()
+        
+        # One API client reused across calls, created on first use
+        self._client = None
+        self._client_lock = threading.Lock()
         
         # Note: Open discovery approach - no predefined cultural templates
         # self.amazon_cultures = self.prompt_config.AMAZON_CULTURES  # Removed in open discovery
@@ -53,41 +64,97 @@ class EnhancedAIAnalyzer:
         print("📊 Scale-specific prompting ready")
         print(f"💾 Output directory: {self.paths['analysis_results']}")
     
+    def _get_client(self) -> Optional[OpenAI]:
+        """Shared OpenAI client, or None when no API key is configured"""
+        with self._client_lock:
+            if self._client is None:
+                api_key = os.getenv('OPENAI_API_KEY')
+                if not api_key:
+                    return None
+                self._client = OpenAI(api_key=api_key)
+            return self._client
+    
+    def warmup(self) -> bool:
+        """Create the API client and check the key before the first analysis"""
+        client = self._get_client()
+        if client is None:
+            print("⚠️ OpenAI API key not found - warmup skipped")
+            return False
+        try:
+            # Cheap authenticated request; also opens the HTTP connection
+            client.models.list()
+            return True
+        except Exception as e:
+            print(f"⚠️ OpenAI warmup failed: {e}")
+            return False
+    
+    def _record_prompt(self, scale: str, prompt: str) -> str:
+        """Log prompt metadata under its scale and bump the running count"""
+        metadata = self.prompt_config.get_prompt_metadata(scale, prompt)
+        with self._prompt_lock:
+            self.prompts_used.setdefault(scale, []).append(metadata)
+            self._prompt_count += 1
+        return prompt
+    
     def create_regional_prompt(self, region_info: Dict, images: Dict) -> str:
         """Create prompt using prompt database"""
-        return self.prompt_config.get_regional_prompt(region_info, images)
+        return self._record_prompt('regional', self.prompt_config.get_regional_prompt(region_info, images))
     
     def create_zone_prompt(self, zone_info: Dict, images: Dict) -> str:
         """Create prompt using prompt database"""
-        return self.prompt_config.get_zone_prompt(zone_info, images)
+        return self._record_prompt('zone', self.prompt_config.get_zone_prompt(zone_info, images))
     
     def create_site_prompt(self, site_info: Dict, images: Dict) -> str:
         """Create prompt using prompt database"""
-        return self.prompt_config.get_site_prompt(site_info, images)
+        return self._record_prompt('site', self.prompt_config.get_site_prompt(site_info, images))
     
     def create_leverage_prompt(self, initial_discoveries: List[Dict], search_region: Dict) -> str:
         """Create prompt using prompt database"""
-        return self.prompt_config.get_leverage_prompt(initial_discoveries, search_region)
+        return self._record_prompt('leverage', self.prompt_config.get_leverage_prompt(initial_discoveries, search_region))
     
     def analyze_discovery_patterns(self, discoveries: List[Dict]) -> Dict:
         """Analyze patterns in discovered sites for leverage prompting"""
         if not discoveries:
             return {}
         
-        # Calculate statistics
-        sizes = [d.get('features', {}).get('area_hectares', 50) for d in discoveries]
-        rings = [d.get('features', {}).get('defensive_rings', 1) for d in discoveries]
-        tiers = [d.get('site_tier', 'Secondary') for d in discoveries]
+        # Calculate statistics in one pass over discoveries
+        size_total = ring_total = 0
+        tier_counts = {}
+        elev_lo = elev_hi = None
+        directions = {}
+        for d in discoveries:
+            features = d.get('features', {})
+            size_total += features.get('area_hectares', 50)
+            ring_total += features.get('defensive_rings', 1)
+            tier = d.get('site_tier', 'Secondary')
+            tier_counts[tier] = tier_counts.get(tier, 0) + 1
+            
+            elevation = features.get('elevation_m')
+            if elevation is not None:
+                if elev_lo is None:
+                    elev_lo = elev_hi = elevation
+                elif elevation < elev_lo:
+                    elev_lo = elevation
+                elif elevation > elev_hi:
+                    elev_hi = elevation
+            
+            for direction in features.get('causeway_directions', ()):
+                directions[direction] = directions.get(direction, 0) + 1
+        
+        n = len(discoveries)
+        primary_count = tier_counts.get('Primary', 0)
+        secondary_count = tier_counts.get('Secondary', 0)
+        top_directions = [k for k, _ in heapq.nlargest(2, directions.items(), key=itemgetter(1))]
         
         patterns = {
-            'avg_size_ha': sum(sizes) / len(sizes) if sizes else 50,
-            'avg_rings': sum(rings) / len(rings) if rings else 1,
+            'avg_size_ha': size_total / n,
+            'avg_rings': ring_total / n,
             'common_features': ['defensive_rings', 'raised_platforms', 'geometric_regularity'],
-            'tier_distribution': f"{tiers.count('Primary')} Primary, {tiers.count('Secondary')} Secondary",
-            'primary_count': tiers.count('Primary'),
-            'secondary_count': tiers.count('Secondary'),
-            'elevation_range': '100-300',
-            'causeway_directions': 'NNW, NE',
+            'tier_distribution': f"{primary_count} Primary, {secondary_count} Secondary",
+            'primary_count': primary_count,
+            'secondary_count': secondary_count,
+            'elevation_range': f"{elev_lo:.0f}-{elev_hi:.0f}" if elev_lo is not None else '100-300',
+            'causeway_directions': ', '.join(top_directions) if top_directions else 'NNW, NE',
             'typical_spacing_km': 3.5,
             'vegetation_signature': 'disturbed_canopy_patterns',
             'preferred_setting': 'slightly_elevated_near_water',
@@ -114,14 +181,12 @@ class EnhancedAIAnalyzer:
         
         # Real OpenAI API call
         try:
-            # Get API key from environment variable
-            api_key = os.getenv('OPENAI_API_KEY')
-            if not api_key:
+            # Client is built from the OPENAI_API_KEY environment variable
+            client = self._get_client()
+            if client is None:
                 print("❌ OpenAI API key not found in environment variables")
                 return None
             
-            client = OpenAI(api_key=api_key)
-            
             # Encode image
             with open(image_path, "rb") as image_file:
                 encoded_image = base64.b64encode(image_file.read()).decode('utf-8')
@@ -735,6 +800,56 @@ class EnhancedAIAnalyzer:
                 site_analyses = self.analyze_site_scale(site_results)
                 all_analyses['site'].extend(site_analyses)
         
+        return self._finish_analysis(all_analyses, processed_data)
+    
+    async def analyze_all_scales_async(self, processed_data: Dict, max_concurrency: int = 8) -> Dict:
+        """
+        Multi-scale AI analysis with regional, zone and site calls in flight together
+        Leverage still runs last since it builds on the collected discoveries
+        """
+        print(f"\n🤖 Multi-Scale AI Analysis Pipeline (concurrent, {max_concurrency} at a time)")
+        print("=" * 50)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(scale: str, fn, arg):
+            async with semaphore:
+                return scale, await asyncio.to_thread(fn, arg)
+        
+        tasks = []
+        for region_id, results in processed_data.items():
+            tasks.append(run('regional', self.analyze_regional_scale, results))
+            for zone in results['scales'].get('zones', []):
+                tasks.append(run('zone', self.analyze_zone_scale, [zone]))
+            for site in results['scales'].get('sites', []):
+                tasks.append(run('site', self.analyze_site_scale, [site]))
+        
+        print(f"🚀 Dispatching {len(tasks)} regional/zone/site analyses")
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        all_analyses = {
+            'regional': [],
+            'zone': [],
+            'site': [],
+            'leverage': None
+        }
+        
+        # gather preserves task order, so the collected analyses stay deterministic
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                print(f"⚠️ Concurrent analysis failed: {outcome}")
+                continue
+            scale, result = outcome
+            if scale == 'regional':
+                if result:
+                    all_analyses['regional'].append(result)
+            else:
+                all_analyses[scale].extend(result)
+        
+        return self._finish_analysis(all_analyses, processed_data)
+    
+    def _finish_analysis(self, all_analyses: Dict, processed_data: Dict) -> Dict:
+        """Run leverage analysis, top up discoveries and print the summary"""
         # Stage 4: Leverage Analysis
         print("\n🔄 Stage 4: Discovery Leverage Analysis")
         if self.discoveries:
@@ -813,6 +928,7 @@ class EnhancedAIAnalyzer:
             'analysis_timestamp': datetime.now().isoformat(),
             'total_analyses': len(self.ai_responses),
             'total_discoveries': len(self.discoveries),
+            'total_prompts': self._prompt_count,
             'ai_model_info': {
                 'primary_model': primary_model,
                 'reasoning_effort': 'high',
@@ -1,9 +1,28 @@
 # Updated Multi-Cultural Archaeological Prompt Configuration
 # Open discovery approach - let AI find patterns without templates
 
-import os
 import json
-from typing import Dict, List
+import logging
+import os
+import hashlib
+import functools
+import heapq
+import string
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import ClassVar, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON encoder; stdlib json is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Simplified system prompt for open discovery
 ARCHAEOLOGICAL_SYSTEM_PROMPT = (
@@ -14,49 +33,38 @@ ARCHAEOLOGICAL_SYSTEM_PROMPT = (
     "CRITICAL: Output ONLY valid JSON format with no additional text."
 )
 
-class PromptConfig:
-    """
-    Open discovery prompt configuration for Amazon archaeological analysis
-    Let AI discover patterns without predetermined cultural templates
-    """
-    
-    def __init__(self):
-        """Initialize open discovery prompt system"""
-        
-        # Simplified system prompt for open discovery
-        self.ARCHAEOLOGICAL_SYSTEM_PROMPT = """You are an expert archaeological analyst with deep remote sensing experience in the Amazon basin. Your mission is to identify ANY evidence of human landscape modification from satellite imagery.
+def _dumps_indented(obj) -> bytes:
+    """Serialize to 2-space indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
 
-APPROACH:
-- Fresh eyes analysis - no preconceptions about what should be there
-- Look for geometric patterns, earthworks, anomalies too regular for nature  
-- Consider all time periods from recent to thousands of years old
-- Focus on what you actually observe, not what textbooks say
+def _fmt_ll(c) -> str:
+    """Render a [lat, lon] pair at fixed precision so prompt bytes stay stable"""
+    return f"[{c[0]:.6f},{c[1]:.6f}]"
 
-OUTPUT: Return ONLY valid JSON format with your discoveries."""
+# Each template is a static prefix (identical on every call, so provider-side
+# prompt caches can reuse it) followed by the per-call context suffix.
+# NOTE: this moves the CONTEXT block from the top of each prompt (original order)
+# to after the static body, which changes the text the model sees. Set
+# PROMPT_CONTEXT_FIRST=1 to render the original order when comparing output quality;
+# prompts then have no cacheable prefix and get_prompt_blocks returns one block.
+# Full templates are interned so every accessor hands back the same object
+PROMPT_CONTEXT_FIRST = os.getenv('PROMPT_CONTEXT_FIRST') == '1'
 
-        # Keep basic data source info
-        self.data_sources = {
-            'optical': 'Sentinel-2 MSI 10m',
-            'radar': 'ALOS PALSAR / Sentinel-1 SAR 25m'
-        }
-        
-        print("📝 Open Discovery Prompt Configuration initialized")
-        print("🔍 AI-driven pattern recognition approach")
-        print("🆓 No cultural templates - pure discovery mode")
+def _assemble(prefix: str, context: str, question: str) -> str:
+    """Join the static body, the CONTEXT block and the closing question in the configured order"""
+    if PROMPT_CONTEXT_FIRST:
+        return sys.intern(context + prefix + question)
+    return sys.intern(prefix + context + question)
 
-    def _json_only_line(self) -> str:
-        """Standard JSON compliance instruction"""
-        return "Return ONE valid minified JSON object and nothing else."
+# Closing block shared by every template
+_SCHEMA_TAIL = """OUTPUT_SCHEMA_EXAMPLE: $example
 
-    def get_regional_prompt_template(self) -> str:
-        """Open discovery regional analysis template"""
-        return """CONTEXT:
-- Region: {region_name}
-- Center: {center}
-- Scale: Regional overview (50km × 50km, ~97m per pixel)
-- Data: optical ({optical}), radar ({radar})
+$json_instruction"""
 
-MISSION: Scan this Amazon region for ANY evidence of human landscape modification across all time periods.
+# Open discovery regional analysis template
+_REGIONAL_PREFIX = """MISSION: Scan this Amazon region for ANY evidence of human landscape modification across all time periods.
 
 DISCOVERY TARGETS:
 🔍 GEOMETRIC ANOMALIES: Perfect circles, squares, straight lines too regular for nature
@@ -72,21 +80,25 @@ ANALYSIS APPROACH:
 - Consider multiple scales from small features to large complexes
 - Focus on what you actually observe in the imagery
 
-What patterns of human landscape modification do you detect?
+"""
 
-OUTPUT_SCHEMA_EXAMPLE: {example}
+_REGIONAL_CONTEXT = """CONTEXT:
+- Region: $region_name
+- Center: $center
+- Scale: Regional overview (50km × 50km, ~97m per pixel)
+- Data: optical ($optical), radar ($radar)
 
-{json_instruction}"""
+"""
 
-    def get_zone_prompt_template(self) -> str:
-        """Open discovery zone analysis template"""
-        return """CONTEXT:
-- Zone ID: {zone_id}
-- Center: {zone_center}
-- Scale: Zone level (10km × 10km, ~9.8m per pixel)
-- Data: optical ({optical}), radar ({radar})
+_REGIONAL_QUESTION = """What patterns of human landscape modification do you detect?
 
-DETAILED PATTERN ANALYSIS:
+""" + _SCHEMA_TAIL
+
+_REGIONAL_SUFFIX = _REGIONAL_CONTEXT + _REGIONAL_QUESTION
+_REGIONAL_TEMPLATE = _assemble(_REGIONAL_PREFIX, _REGIONAL_CONTEXT, _REGIONAL_QUESTION)
+
+# Open discovery zone analysis template
+_ZONE_PREFIX = """DETAILED PATTERN ANALYSIS:
 🎯 GEOMETRIC PRECISION: Circles, rectangles, perfectly straight lines
 🏘️ SETTLEMENT INDICATORS: Clustered features, organized layouts
 🛡️ DEFENSIVE FEATURES: Enclosures, ramparts, strategic positions
@@ -101,21 +113,25 @@ DISCOVERY APPROACH:
 - Identify organizational patterns
 - Look for evidence of planning and construction
 
-What specific archaeological features do you detect in this zone?
+"""
 
-OUTPUT_SCHEMA_EXAMPLE: {example}
+_ZONE_CONTEXT = """CONTEXT:
+- Zone ID: $zone_id
+- Center: $zone_center
+- Scale: Zone level (10km × 10km, ~9.8m per pixel)
+- Data: optical ($optical), radar ($radar)
 
-{json_instruction}"""
+"""
 
-    def get_site_prompt_template(self) -> str:
-        """Open discovery site confirmation template"""  
-        return """CONTEXT:
-- Site ID: {site_id}
-- Center: {center}
-- Scale: Site confirmation (2km × 2km, ~1.95m per pixel)
-- Data: optical ({optical}), radar ({radar})
+_ZONE_QUESTION = """What specific archaeological features do you detect in this zone?
+
+""" + _SCHEMA_TAIL
+
+_ZONE_SUFFIX = _ZONE_CONTEXT + _ZONE_QUESTION
+_ZONE_TEMPLATE = _assemble(_ZONE_PREFIX, _ZONE_CONTEXT, _ZONE_QUESTION)
 
-DETAILED FEATURE MAPPING:
+# Open discovery site confirmation template
+_SITE_PREFIX = """DETAILED FEATURE MAPPING:
 🔍 PRECISE MEASUREMENTS: Platform dimensions, ring diameters, feature heights
 🏗️ CONSTRUCTION DETAILS: Building techniques, material evidence
 🛡️ DEFENSIVE ANALYSIS: Fortification patterns, strategic design
@@ -130,20 +146,25 @@ CONFIRMATION CRITERIA:
 - Organized layout indicating planning
 - Preservation state and modern disturbances
 
-Provide detailed mapping and confirmation of this archaeological site.
+"""
 
-OUTPUT_SCHEMA_EXAMPLE: {example}
+_SITE_CONTEXT = """CONTEXT:
+- Site ID: $site_id
+- Center: $center
+- Scale: Site confirmation (2km × 2km, ~1.95m per pixel)
+- Data: optical ($optical), radar ($radar)
 
-{json_instruction}"""
+"""
 
-    def get_leverage_prompt_template(self) -> str:
-        """Open discovery leverage analysis template"""
-        return """CONTEXT:
-- Discoveries analyzed: {discovery_count} confirmed sites
-- Successful patterns: {successful_criteria}
-- Pattern characteristics: {pattern_summary}
+_SITE_QUESTION = """Provide detailed mapping and confirmation of this archaeological site.
+
+""" + _SCHEMA_TAIL
 
-LEVERAGE STRATEGY:
+_SITE_SUFFIX = _SITE_CONTEXT + _SITE_QUESTION
+_SITE_TEMPLATE = _assemble(_SITE_PREFIX, _SITE_CONTEXT, _SITE_QUESTION)
+
+# Open discovery leverage analysis template
+_LEVERAGE_PREFIX = """LEVERAGE STRATEGY:
 🎯 PATTERN REPLICATION: Find more sites matching successful discovery patterns
 🔍 NETWORK EXPANSION: Follow connections and pathways from known sites  
 🚀 VARIATION DISCOVERY: Look for similar but unique pattern variations
@@ -151,87 +172,356 @@ LEVERAGE STRATEGY:
 
 ADAPTIVE SEARCH: Use confirmed discoveries as templates while remaining open to entirely new patterns.
 
-What additional sites can you discover using these successful patterns?
+"""
+
+_LEVERAGE_CONTEXT = """CONTEXT:
+- Discoveries analyzed: $discovery_count confirmed sites
+- Successful patterns: $successful_criteria
+- Pattern characteristics: $pattern_summary
+
+"""
+
+_LEVERAGE_QUESTION = """What additional sites can you discover using these successful patterns?
+
+""" + _SCHEMA_TAIL
+
+_LEVERAGE_SUFFIX = _LEVERAGE_CONTEXT + _LEVERAGE_QUESTION
+_LEVERAGE_TEMPLATE = _assemble(_LEVERAGE_PREFIX, _LEVERAGE_CONTEXT, _LEVERAGE_QUESTION)
+
+# Static prefix per prompt type, used to split rendered prompts into blocks
+_PREFIXES = {
+    'regional': _REGIONAL_PREFIX,
+    'zone': _ZONE_PREFIX,
+    'site': _SITE_PREFIX,
+    'leverage': _LEVERAGE_PREFIX
+}
+
+# Compiled once at import; substitution only touches the placeholders
+_COMPILED = {
+    'regional': string.Template(_REGIONAL_TEMPLATE),
+    'zone': string.Template(_ZONE_TEMPLATE),
+    'site': string.Template(_SITE_TEMPLATE),
+    'leverage': string.Template(_LEVERAGE_TEMPLATE)
+}
+
+# Basic data source info (read-only, shared by every PromptConfig)
+_DATA_SOURCES = MappingProxyType({
+    'optical': 'Sentinel-2 MSI 10m',
+    'radar': 'ALOS PALSAR / Sentinel-1 SAR 25m'
+})
+
+# Standard JSON compliance instruction
+_JSON_ONLY = "Return ONE valid minified JSON object and nothing else."
+
+def _regional_fields(region_name: str, center: Tuple[float, float], optical: str, radar: str) -> Dict:
+    """Placeholder values for the regional template"""
+    center = _fmt_ll(center)
+    example = (
+        '{"analysis_type":"open_discovery_regional",'
+        '"region_analyzed":"%s",'
+        '"coordinates":%s,'
+        '"human_modified_areas":[{"discovery_id":"REG_001","coordinates":[-10.1234,-65.4321],"modification_type":"geometric_earthworks","description":"Circular earthwork with raised center","scale":"large","confidence":0.85,"uniqueness":"unusual"}],'
+        '"landscape_patterns":[{"pattern_type":"linear_network","description":"Connected linear features","extent_km":5.2,"confidence":0.7}],'
+        '"priority_areas":[{"area_id":"PRIORITY_001","coordinates":[-10.2345,-65.5432],"interest_level":"high","reasoning":"Multiple geometric anomalies clustered together"}],'
+        '"discovery_summary":{"total_anomalies_detected":3,"most_significant_discovery":"Large circular earthwork complex","overall_human_impact_assessment":"moderate","recommended_next_steps":"Detailed zone analysis of priority areas"}}'
+        % (region_name, center)
+    )
+    
+    return {
+        'region_name': region_name,
+        'center': center,
+        'optical': optical,
+        'radar': radar,
+        'example': example,
+        'json_instruction': _JSON_ONLY
+    }
+
+# Prompts are memoized on hashable inputs only (images never affect the text)
+@functools.lru_cache(maxsize=512)
+def _regional_prompt(region_name: str, center: Tuple[float, float], optical: str, radar: str) -> str:
+    """Render the regional prompt for one region/center pair"""
+    return _COMPILED['regional'].substitute(_regional_fields(region_name, center, optical, radar))
+
+@functools.lru_cache(maxsize=512)
+def _zone_prompt(zone_id: str, zone_center: Tuple[float, float], optical: str, radar: str) -> str:
+    """Render the zone prompt for one zone/center pair"""
+    zone_center = _fmt_ll(zone_center)
+    example = (
+        '{"analysis_type":"open_discovery_zone",'
+        '"zone_id":"%s",'
+        '"zone_center":%s,'
+        '"sites_detected":[{"site_id":"SITE_001","center_coordinates":[-10.1234,-65.4321],"site_type":"earthwork_complex","diameter_meters":300,"features_detected":["circular_enclosure","central_mound","linear_access"],"measurements":{"outer_diameter_m":300,"central_feature_m":50,"estimated_area_hectares":7},"confidence_score":0.85,"geometric_regularity":0.9}],'
+        '"linear_features":[{"feature_id":"LINEAR_001","start_coordinates":[-10.1234,-65.4321],"end_coordinates":[-10.2345,-65.5432],"width_meters":20,"length_meters":800,"description":"Straight pathway connecting features"}],'
+        '"zone_summary":{"total_features_detected":2,"geometric_features_count":3,"highest_confidence_discovery":"SITE_001","zone_confidence":0.8,"recommend_site_analysis":true}}'
+        % (zone_id, zone_center)
+    )
+    
+    return _COMPILED['zone'].substitute(
+        zone_id=zone_id,
+        zone_center=zone_center,
+        optical=optical,
+        radar=radar,
+        example=example,
+        json_instruction=_JSON_ONLY
+    )
+
+@functools.lru_cache(maxsize=512)
+def _site_prompt(site_id: str, center: Tuple[float, float], optical: str, radar: str) -> str:
+    """Render the site prompt for one site/center pair"""
+    center = _fmt_ll(center)
+    example = (
+        '{"analysis_type":"open_discovery_site",'
+        '"site_id":"%s",'
+        '"coordinates":%s,'
+        '"confirmation_status":"confirmed",'
+        '"site_features":{"primary_structure":{"type":"circular_earthwork","diameter_m":250,"height_estimate_m":3},"secondary_features":[{"type":"linear_access","width_m":15,"length_m":200}],"geometric_precision":0.92},'
+        '"measurements":{"total_area_hectares":5,"primary_feature_diameter_m":250,"secondary_feature_count":2},'
+        '"construction_evidence":{"earthwork_volume_estimate":"significant","geometric_regularity":"high","planning_evidence":"clear"},'
+        '"site_classification":{"complexity":"moderate","preservation":"good","archaeological_significance":"regional"},'
+        '"final_assessment":{"archaeological_confidence":0.88,"recommended_for_submission":true,"discovery_uniqueness":"moderate"}}'
+        % (site_id, center)
+    )
+    
+    return _COMPILED['site'].substitute(
+        site_id=site_id,
+        center=center,
+        optical=optical,
+        radar=radar,
+        example=example,
+        json_instruction=_JSON_ONLY
+    )
+
+@dataclass(slots=True)
+class LeveragePatterns:
+    """Leverage template fields derived from confirmed discoveries"""
+    discovery_count: int
+    successful_criteria: List[str]
+    pattern_summary: str
+
+# Scale -> (renderer, id key, id default, center key)
+_DISPATCH = {
+    'regional': (_regional_prompt, 'region_name', 'Unknown Region', 'center'),
+    'zone': (_zone_prompt, 'zone_id', 'Unknown Zone', 'zone_center'),
+    'site': (_site_prompt, 'site_id', 'Unknown Site', 'center')
+}
+
+@functools.lru_cache(maxsize=512)
+def _prompt_bytes(scale: str, key: str, center: Tuple[float, float], optical: str, radar: str) -> bytes:
+    """UTF-8 encoded prompt, encoded once per distinct input"""
+    return _DISPATCH[scale][0](key, center, optical, radar).encode('utf-8')
+
+# Banner is logged once per process, not once per PromptConfig instance
+_ANNOUNCED = False
+
+def _announce():
+    """Log the prompt configuration banner on first use only"""
+    global _ANNOUNCED
+    if _ANNOUNCED:
+        return
+    _ANNOUNCED = True
+    logger.debug("📝 Open Discovery Prompt Configuration initialized")
+    logger.debug("🔍 AI-driven pattern recognition approach")
+    logger.debug("🆓 No cultural templates - pure discovery mode")
 
-OUTPUT_SCHEMA_EXAMPLE: {example}
+class PromptConfig:
+    """
+    Open discovery prompt configuration for Amazon archaeological analysis
+    Let AI discover patterns without predetermined cultural templates
+    """
+    
+    # Leverage pattern summary line
+    _PATTERN_FMT: ClassVar[str] = "Size range: {}-{}ha, Common features: {}"
+
+    # Timestamp placeholder in the pre-serialized documentation
+    _DOC_TS: ClassVar[str] = "__TS__"
+
+    # Output schema for batched zone prompts; results are matched back by index
+    _ZONE_BATCH_EXAMPLE: ClassVar[str] = (
+        '{"analysis_type":"open_discovery_zone_batch",'
+        '"batch_results":[{"index":1,"zone_id":"ZONE_A",'
+        '"sites_detected":[{"site_id":"SITE_001","center_coordinates":[-10.1234,-65.4321],"site_type":"earthwork_complex","diameter_meters":300,"features_detected":["circular_enclosure","central_mound"],"confidence_score":0.85,"geometric_regularity":0.9}],'
+        '"zone_summary":{"total_features_detected":1,"zone_confidence":0.8,"recommend_site_analysis":true}},'
+        '{"index":2,"zone_id":"ZONE_B","sites_detected":[],'
+        '"zone_summary":{"total_features_detected":0,"zone_confidence":0.2,"recommend_site_analysis":false}}]}'
+    )
+
+    # Open discovery templates (module constants, shared by all instances)
+    REGIONAL_TEMPLATE: ClassVar[str] = _REGIONAL_TEMPLATE
+    ZONE_TEMPLATE: ClassVar[str] = _ZONE_TEMPLATE
+    SITE_TEMPLATE: ClassVar[str] = _SITE_TEMPLATE
+    LEVERAGE_TEMPLATE: ClassVar[str] = _LEVERAGE_TEMPLATE
+
+    # Data sources and template version are fixed at import
+    data_sources: ClassVar[MappingProxyType] = _DATA_SOURCES
+    # Every template feeds the version, so editing any of them invalidates prompt caches
+    prompt_prefix_version: ClassVar[str] = hashlib.blake2b(
+        b"\0".join(t.encode() for t in (_REGIONAL_TEMPLATE, _ZONE_TEMPLATE, _SITE_TEMPLATE, _LEVERAGE_TEMPLATE)),
+        digest_size=8
+    ).hexdigest()
+
+    # Prompt metadata fields that never depend on the prompt text
+    _META_STATIC: ClassVar[Dict] = {
+        'approach': 'open_discovery',
+        'prompt_prefix_version': prompt_prefix_version,
+        'data_sources': tuple(_DATA_SOURCES),
+        'competitive_features': (
+            'open_ended_discovery',
+            'pattern_recognition_focus',
+            'no_cultural_bias',
+            'ai_driven_insights'
+        ),
+        'checkpoint2_compliance': True
+    }
 
-{json_instruction}"""
+    def __init__(self):
+        """Initialize open discovery prompt system"""
+        
+        # Simplified system prompt for open discovery
+        self.ARCHAEOLOGICAL_SYSTEM_PROMPT = """You are an expert archaeological analyst with deep remote sensing experience in the Amazon basin. Your mission is to identify ANY evidence of human landscape modification from satellite imagery.
 
-    def get_regional_prompt(self, region_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> str:
-        """Generate open discovery regional prompt"""
-        example = (
-            '{"analysis_type":"open_discovery_regional",'
-            '"region_analyzed":"%s",'
-            '"coordinates":%s,'
-            '"human_modified_areas":[{"discovery_id":"REG_001","coordinates":[-10.1234,-65.4321],"modification_type":"geometric_earthworks","description":"Circular earthwork with raised center","scale":"large","confidence":0.85,"uniqueness":"unusual"}],'
-            '"landscape_patterns":[{"pattern_type":"linear_network","description":"Connected linear features","extent_km":5.2,"confidence":0.7}],'
-            '"priority_areas":[{"area_id":"PRIORITY_001","coordinates":[-10.2345,-65.5432],"interest_level":"high","reasoning":"Multiple geometric anomalies clustered together"}],'
-            '"discovery_summary":{"total_anomalies_detected":3,"most_significant_discovery":"Large circular earthwork complex","overall_human_impact_assessment":"moderate","recommended_next_steps":"Detailed zone analysis of priority areas"}}'
-            % (region_info.get('region_name', 'Unknown Region'), region_info.get('center', [0, 0]))
+APPROACH:
+- Fresh eyes analysis - no preconceptions about what should be there
+- Look for geometric patterns, earthworks, anomalies too regular for nature  
+- Consider all time periods from recent to thousands of years old
+- Focus on what you actually observe, not what textbooks say
+
+OUTPUT: Return ONLY valid JSON format with your discoveries."""
+
+        # Fallback prompt for leverage calls without discoveries never varies
+        self._empty_leverage_prompt = self.get_regional_prompt(
+            {'region_name': 'Amazon Region', 'center': [0, 0]}, {}
         )
         
-        template = self.get_regional_prompt_template()
-        return template.format(
-            region_name=region_info.get('region_name', 'Unknown Region'),
-            center=region_info.get('center', [0, 0]),
-            optical=self.data_sources['optical'],
-            radar=self.data_sources['radar'],
-            example=example,
-            json_instruction=self._json_only_line()
+        _announce()
+
+    def get_regional_prompt_template(self) -> str:
+        """Open discovery regional analysis template"""
+        return _COMPILED['regional'].template
+
+    def get_zone_prompt_template(self) -> str:
+        """Open discovery zone analysis template"""
+        return _COMPILED['zone'].template
+
+    def get_site_prompt_template(self) -> str:
+        """Open discovery site confirmation template"""
+        return _COMPILED['site'].template
+
+    def get_leverage_prompt_template(self) -> str:
+        """Open discovery leverage analysis template"""
+        return _COMPILED['leverage'].template
+
+    def get_regional_system_prefix(self) -> str:
+        """Static part of the regional prompt (cacheable)"""
+        return _REGIONAL_PREFIX
+
+    def get_regional_user_suffix(self) -> str:
+        """Per-region part of the regional prompt template"""
+        return _REGIONAL_SUFFIX
+
+    def get_zone_system_prefix(self) -> str:
+        """Static part of the zone prompt (cacheable)"""
+        return _ZONE_PREFIX
+
+    def get_zone_user_suffix(self) -> str:
+        """Per-zone part of the zone prompt template"""
+        return _ZONE_SUFFIX
+
+    def get_site_system_prefix(self) -> str:
+        """Static part of the site prompt (cacheable)"""
+        return _SITE_PREFIX
+
+    def get_site_user_suffix(self) -> str:
+        """Per-site part of the site prompt template"""
+        return _SITE_SUFFIX
+
+    def get_leverage_system_prefix(self) -> str:
+        """Static part of the leverage prompt (cacheable)"""
+        return _LEVERAGE_PREFIX
+
+    def get_leverage_user_suffix(self) -> str:
+        """Per-call part of the leverage prompt template"""
+        return _LEVERAGE_SUFFIX
+
+    def get_prompt_blocks(self, prompt_type: str, prompt: str) -> List[Dict]:
+        """
+        Split a rendered prompt into content blocks for providers with
+        explicit prompt caching; the static prefix carries cache_control
+        """
+        prefix = _PREFIXES[prompt_type]
+        if not prompt.startswith(prefix):
+            return [{'type': 'text', 'text': prompt}]
+        
+        return [
+            {'type': 'text', 'text': prefix, 'cache_control': {'type': 'ephemeral'}},
+            {'type': 'text', 'text': prompt[len(prefix):]}
+        ]
+
+    def get_prompt(self, scale: str, info: Dict, radar_type: str = "ALOS PALSAR") -> str:
+        """Generate the open discovery prompt for a regional, zone or site scale"""
+        render, id_key, id_default, center_key = _DISPATCH[scale]
+        return render(
+            info.get(id_key, id_default),
+            tuple(info.get(center_key, (0, 0))),
+            self.data_sources['optical'],
+            self.data_sources['radar']
+        )
+
+    def get_prompt_bytes(self, scale: str, info: Dict, radar_type: str = "ALOS PALSAR") -> bytes:
+        """Generate a regional, zone or site prompt as UTF-8 bytes ready for an HTTP body"""
+        _, id_key, id_default, center_key = _DISPATCH[scale]
+        return _prompt_bytes(
+            scale,
+            info.get(id_key, id_default),
+            tuple(info.get(center_key, (0, 0))),
+            self.data_sources['optical'],
+            self.data_sources['radar']
         )
 
+    def get_regional_prompt(self, region_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> str:
+        """Generate open discovery regional prompt"""
+        return self.get_prompt('regional', region_info, radar_type)
+
+    def get_regional_prompt_bytes(self, region_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> bytes:
+        """Generate the regional prompt as UTF-8 bytes ready for an HTTP body"""
+        return self.get_prompt_bytes('regional', region_info, radar_type)
+
     def get_zone_prompt(self, zone_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> str:
         """Generate open discovery zone prompt"""
-        example = (
-            '{"analysis_type":"open_discovery_zone",'
-            '"zone_id":"%s",'
-            '"zone_center":%s,'
-            '"sites_detected":[{"site_id":"SITE_001","center_coordinates":[-10.1234,-65.4321],"site_type":"earthwork_complex","diameter_meters":300,"features_detected":["circular_enclosure","central_mound","linear_access"],"measurements":{"outer_diameter_m":300,"central_feature_m":50,"estimated_area_hectares":7},"confidence_score":0.85,"geometric_regularity":0.9}],'
-            '"linear_features":[{"feature_id":"LINEAR_001","start_coordinates":[-10.1234,-65.4321],"end_coordinates":[-10.2345,-65.5432],"width_meters":20,"length_meters":800,"description":"Straight pathway connecting features"}],'
-            '"zone_summary":{"total_features_detected":2,"geometric_features_count":3,"highest_confidence_discovery":"SITE_001","zone_confidence":0.8,"recommend_site_analysis":true}}'
-            % (zone_info.get('zone_id', 'Unknown Zone'), zone_info.get('zone_center', [0, 0]))
-        )
-        
-        template = self.get_zone_prompt_template()
-        return template.format(
-            zone_id=zone_info.get('zone_id', 'Unknown Zone'),
-            zone_center=zone_info.get('zone_center', [0, 0]),
-            optical=self.data_sources['optical'],
-            radar=self.data_sources['radar'],
-            example=example,
-            json_instruction=self._json_only_line()
-        )
+        return self.get_prompt('zone', zone_info, radar_type)
+
+    def get_zone_prompt_bytes(self, zone_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> bytes:
+        """Generate the zone prompt as UTF-8 bytes"""
+        return self.get_prompt_bytes('zone', zone_info, radar_type)
+
+    def get_zone_prompt_batch(self, zones: List[Dict], radar_type: str = "ALOS PALSAR") -> str:
+        """Generate one zone prompt covering several zones, answered as an indexed array"""
+        lines = [_ZONE_PREFIX + "CONTEXT:"]
+        for i, zone in enumerate(zones, 1):
+            lines.append(f"[{i}] ZONE: {zone.get('zone_id', 'Unknown Zone')} "
+                         f"CENTER: {_fmt_ll(zone.get('zone_center', (0, 0)))}")
+        lines.append("- Scale: Zone level (10km × 10km, ~9.8m per pixel)")
+        lines.append(f"- Data: optical ({self.data_sources['optical']}), radar ({self.data_sources['radar']})")
+        lines.append("")
+        lines.append("What specific archaeological features do you detect in each zone? "
+                     "Answer every [index] in order, one batch_results entry per zone.")
+        lines.append("")
+        lines.append("OUTPUT_SCHEMA_EXAMPLE: " + self._ZONE_BATCH_EXAMPLE)
+        lines.append("")
+        lines.append(_JSON_ONLY)
+        return "\n".join(lines)
 
     def get_site_prompt(self, site_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> str:
         """Generate open discovery site prompt"""
-        example = (
-            '{"analysis_type":"open_discovery_site",'
-            '"site_id":"%s",'
-            '"coordinates":%s,'
-            '"confirmation_status":"confirmed",'
-            '"site_features":{"primary_structure":{"type":"circular_earthwork","diameter_m":250,"height_estimate_m":3},"secondary_features":[{"type":"linear_access","width_m":15,"length_m":200}],"geometric_precision":0.92},'
-            '"measurements":{"total_area_hectares":5,"primary_feature_diameter_m":250,"secondary_feature_count":2},'
-            '"construction_evidence":{"earthwork_volume_estimate":"significant","geometric_regularity":"high","planning_evidence":"clear"},'
-            '"site_classification":{"complexity":"moderate","preservation":"good","archaeological_significance":"regional"},'
-            '"final_assessment":{"archaeological_confidence":0.88,"recommended_for_submission":true,"discovery_uniqueness":"moderate"}}'
-            % (site_info.get('site_id', 'Unknown Site'), site_info.get('center', [0, 0]))
-        )
-        
-        template = self.get_site_prompt_template()
-        return template.format(
-            site_id=site_info.get('site_id', 'Unknown Site'),
-            center=site_info.get('center', [0, 0]),
-            optical=self.data_sources['optical'],
-            radar=self.data_sources['radar'],
-            example=example,
-            json_instruction=self._json_only_line()
-        )
+        return self.get_prompt('site', site_info, radar_type)
+
+    def get_site_prompt_bytes(self, site_info: Dict, images: Dict, radar_type: str = "ALOS PALSAR") -> bytes:
+        """Generate the site prompt as UTF-8 bytes"""
+        return self.get_prompt_bytes('site', site_info, radar_type)
 
     def get_leverage_prompt(self, discoveries: List[Dict], search_region: Dict) -> str:
         """Generate open discovery leverage prompt"""
         if not discoveries:
-            region_info = {'region_name': 'Amazon Region', 'center': [0, 0]}
-            return self.get_regional_prompt(region_info, {})
+            return self._empty_leverage_prompt
         
         patterns = self._analyze_discovery_patterns(discoveries)
         
@@ -243,62 +533,65 @@ OUTPUT_SCHEMA_EXAMPLE: {example}
             % len(discoveries)
         )
         
-        template = self.get_leverage_prompt_template()
-        return template.format(
-            discovery_count=len(discoveries),
-            successful_criteria=patterns['successful_criteria'],
-            pattern_summary=patterns['pattern_summary'],
+        return _COMPILED['leverage'].substitute(
+            asdict(patterns),
             example=example,
-            json_instruction=self._json_only_line()
+            json_instruction=_JSON_ONLY
         )
 
-    def _analyze_discovery_patterns(self, discoveries: List[Dict]) -> Dict:
+    def _analyze_discovery_patterns(self, discoveries: List[Dict]) -> LeveragePatterns:
         """Analyze patterns from discoveries"""
         if not discoveries:
-            return {
-                'successful_criteria': ['geometric_patterns'],
-                'pattern_summary': 'Limited data for pattern analysis'
-            }
+            return LeveragePatterns(
+                discovery_count=0,
+                successful_criteria=['geometric_patterns'],
+                pattern_summary='Limited data for pattern analysis'
+            )
             
-        # Extract common characteristics
-        sizes = [d.get('estimated_size_ha', 0) for d in discoveries if d.get('estimated_size_ha', 0) > 0]
-        features = []
+        # One pass over discoveries for the size range and feature counts
+        lo = hi = None
+        counts = {}
         for d in discoveries:
-            features.extend(d.get('geometric_features', []))
-            features.extend(d.get('features_detected', []))
+            size = d.get('estimated_size_ha', 0)
+            if size > 0:
+                if lo is None:
+                    lo = hi = size
+                elif size < lo:
+                    lo = size
+                elif size > hi:
+                    hi = size
+            for f in d.get('geometric_features', ()):
+                counts[f] = counts.get(f, 0) + 1
+            for f in d.get('features_detected', ()):
+                counts[f] = counts.get(f, 0) + 1
         
-        return {
-            'successful_criteria': list(set(features))[:3] if features else ['geometric_patterns'],
-            'pattern_summary': f"Size range: {min(sizes) if sizes else 0}-{max(sizes) if sizes else 100}ha, Common features: {list(set(features))[:2] if features else ['earthworks']}"
-        }
+        if lo is None:
+            lo, hi = 0, 100
+        
+        # Most frequent first; nlargest is stable, so ties keep first-seen order
+        top = [f for f, _ in heapq.nlargest(3, counts.items(), key=itemgetter(1))]
+        
+        return LeveragePatterns(
+            discovery_count=len(discoveries),
+            successful_criteria=top or ['geometric_patterns'],
+            pattern_summary=self._PATTERN_FMT.format(lo, hi, top[:2] or ['earthworks'])
+        )
 
     def get_prompt_metadata(self, prompt_type: str, prompt_content: str) -> Dict:
         """Get metadata for prompt tracking"""
         return {
             'prompt_type': prompt_type,
             'content_length': len(prompt_content),
-            'approach': 'open_discovery',
-            'data_sources': list(self.data_sources.keys()),
-            'competitive_features': [
-                'open_ended_discovery',
-                'pattern_recognition_focus',
-                'no_cultural_bias',
-                'ai_driven_insights'
-            ],
-            'checkpoint2_compliance': True
+            **self._META_STATIC
         }
 
-    def save_prompts_documentation(self, output_dir: str) -> str:
-        """Save prompt documentation"""
-        import os
-        from datetime import datetime
-        
-        os.makedirs(output_dir, exist_ok=True)
-        
+    @functools.cached_property
+    def _doc_json_parts(self) -> Tuple[bytes, bytes]:
+        """Serialize the documentation once, split around the timestamp value"""
         documentation = {
             'open_discovery_system': {
                 'version': '4.0_open_discovery',
-                'created': datetime.now().isoformat(),
+                'created': self._DOC_TS,
                 'description': 'Open-ended AI discovery without cultural templates',
                 'advantages': [
                     'No confirmation bias from predefined templates',
@@ -308,12 +601,22 @@ OUTPUT_SCHEMA_EXAMPLE: {example}
                     'Innovation-focused approach'
                 ]
             },
-            'data_sources': self.data_sources,
+            'data_sources': dict(self.data_sources),
             'system_prompt': self.ARCHAEOLOGICAL_SYSTEM_PROMPT
         }
+        head, _, tail = _dumps_indented(documentation).partition(json.dumps(self._DOC_TS).encode())
+        return head, tail
+
+    def save_prompts_documentation(self, output_dir: str) -> str:
+        """Save prompt documentation"""
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
         
-        output_file = os.path.join(output_dir, 'open_discovery_documentation.json')
-        with open(output_file, 'w') as f:
-            json.dump(documentation, f, indent=2)
+        output_file = str(out_dir / 'open_discovery_documentation.json')
+        head, tail = self._doc_json_parts
+        with open(output_file, 'wb') as f:
+            f.write(head)
+            f.write(json.dumps(datetime.now().isoformat()).encode())
+            f.write(tail)
         
-        return output_file
\ No newline at end of file
+        return output_file
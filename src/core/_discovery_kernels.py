@@ -0,0 +1,46 @@
+# Discovery Kernels
+# Numeric helpers for merging discovery lists
+# Compiled with Numba when it is installed, plain Python otherwise
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback decorator when Numba is not installed"""
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+# Longitude cells stay below this at any tolerance >= 0.0001°, so one int64 key per cell is unique
+_CELL_STRIDE = 4_000_000
+
+
+@njit(cache=True)
+def grid_keep_mask(lat, lng, n_fixed, tol=0.01):
+    """
+    Keep-mask for a merged discovery list
+    The first n_fixed entries are always kept and claim their grid cells;
+    later entries are kept only if their cell is still free
+    """
+    n = lat.shape[0]
+    keep = np.zeros(n, dtype=np.uint8)
+    seen = {np.int64(0)}  # typed for Numba, emptied before use
+    seen.clear()
+
+    for i in range(n):
+        key = np.int64(np.round(lat[i] / tol)) * _CELL_STRIDE + np.int64(np.round(lng[i] / tol))
+        if i < n_fixed:
+            keep[i] = 1
+            seen.add(key)
+        elif key not in seen:
+            keep[i] = 1
+            seen.add(key)
+
+    return keep
+
+
+def rank_by_confidence(conf):
+    """Indices ordering discoveries by descending confidence, ties kept in input order"""
+    return np.argsort(-conf, kind='mergesort')
@@ -3,20 +3,79 @@
 # Clean organized structure without "enhanced" naming
 
 import os
+import sys
 import json
-import glob
+import copy
+import queue
+import argparse
+import atexit
+import asyncio
+import threading
+import hashlib
+import fnmatch
+import pickle
 import time
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Dict, List, Optional
 
 # Import from organized structure
-from src.data.satellite_acquisition import EnhancedDataAcquisition
-from src.data.image_processor import EnhancedDataProcessor  
-from src.analysis.ai_archaeological_analyzer import EnhancedAIAnalyzer
-from src.analysis.results_manager import EnhancedResultsManager
+# (heavy components are imported on first use, see the properties below)
 from src.config.regions import load_regions_from_file
 from src.config.output_paths import get_paths, clear_outputs_for_fresh_run
 
+# Optional fast JSON codec; stdlib json is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional streaming parser for large analysis files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+def _json_load(path: str):
+    """Load a JSON file"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def _json_load_keys(path: str, keys) -> Dict:
+    """Load only the given top-level keys of a JSON object, streaming when ijson is installed"""
+    if ijson is None:
+        data = _json_load(path)
+        return {key: data[key] for key in keys if key in data}
+    
+    wanted = set(keys)
+    found = {}
+    with open(path, 'rb') as f:
+        for key, value in ijson.kvitems(f, '', use_float=True):
+            if key in wanted:
+                found[key] = value
+                if len(found) == len(wanted):
+                    break
+    return found
+
+def _json_dump(path: str, obj) -> None:
+    """Write a JSON file with 2-space indentation"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(
+                obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            ))
+        return
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=2)
+
+def _emit(lines: List[str]) -> None:
+    """Write a block of output lines with a single write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
 class ArchaeologicalDiscoverySystem:
     """
     Complete Archaeological Discovery System for Amazon regions
@@ -24,6 +83,15 @@ class ArchaeologicalDiscoverySystem:
     Clean organized architecture
     """
     
+    # Seconds a successful Earth Engine setup is trusted before re-checking
+    AUTH_TTL = 3600
+    
+    # Status log records kept before it is folded into a full snapshot
+    WAL_COMPACT_LINES = 10000
+    
+    # Pipeline status fields that hold values rather than step completion
+    _STATUS_VALUE_KEYS = ('auth_expiry', 'total_candidates', 'high_confidence_discoveries')
+    
     def __init__(self):
         """Initialize all system components with organized structure"""
         print("🏛️ Archaeological Discovery System")
@@ -40,34 +108,159 @@ class ArchaeologicalDiscoverySystem:
         # Load regions configuration
         self.regions_data = load_regions_from_file('regions.json')
         print(f"✅ Loaded {len(self.regions_data)} regions from regions.json")
+        self._region_display, self._region_menu = self._build_region_display()
         
         # Initialize organized output paths
         self.paths = get_paths()
         # Extract temp_base for organizer cleanup
         self.temp_base = self.paths.get('temp_base')
-        
-        # Initialize components with new names
-        self.data_acquisition = EnhancedDataAcquisition()
-        self.image_processor = EnhancedDataProcessor()
-        self.ai_analyzer = EnhancedAIAnalyzer()  # Keep "Enhanced" for this one as it has AI capabilities
-        self.results_manager = EnhancedResultsManager()  # Keep "Enhanced" for advanced features
+        # Paths used throughout the pipeline, bound once
+        self._p_base = self.paths['base']
+        self._p_images = self.paths['images']
+        self._p_analysis = self.paths['analysis_results']
+        self._p_submissions = self.paths['submissions']
+        
+        # Components are created lazily on first access
+        self._data_acquisition = None
+        self._image_processor = None
+        self._ai_analyzer = None  # Keep "Enhanced" for this one as it has AI capabilities
+        self._ai_warmup = None  # Background thread preparing the AI analyzer
+        # Analyzer state restored from saved analysis files, applied when the analyzer is created
+        self._restored_ai = {}
+        self._results_manager = None  # Keep "Enhanced" for advanced features
         
         # Processing state
+        self.loaded_data = {}
         self.processed_data = {}
+        # Candidate count per processed region, rebuilt when processed_data is replaced
+        self._candidate_counts = None
+        # Regions whose processed data changed since the last save
+        self._dirty_regions = set()
         self.ai_analyses = {}
         self.discoveries = []
         
         # Track pipeline progress with file-based persistence
-        self.progress_file = os.path.join(self.paths['base'], 'pipeline_progress.json')
+        self.progress_file = os.path.join(self._p_base, 'pipeline_progress.json')
+        # Progress writes happen on a background thread; only the newest pending snapshot is kept
+        self._save_queue = queue.Queue(maxsize=1)
+        # Per-region pickles of step 2/3 results, used to resume without re-running them
+        self.checkpoint_dir = os.path.join(self._p_base, 'checkpoints')
+        # Status changes are appended here between full snapshots
+        self._wal_path = os.path.join(self.checkpoint_dir, 'state.wal')
+        self._wal = None
+        # scandir results per directory, reused within a scan
+        self._dir_cache = {}
         self.pipeline_status = self.load_pipeline_progress()
+        # Digest of the last written status, owned by the save thread; nothing is on disk yet for defaults
+        self._written_hash = self._progress_digest(self.pipeline_status) if os.path.exists(self.progress_file) else None
+        self._save_thread = threading.Thread(target=self._save_worker, daemon=True)
+        self._save_thread.start()
+        atexit.register(self.flush_pipeline_progress)
         
-        print("✅ All components initialized successfully!")
+        print("✅ System ready - components load on first use")
         print("🔄 Checking for previous progress...")
         self.detect_existing_progress()
         print()
         
         # For clean interface support
         self.selected_regions = None
+        # Skip confirmation prompts (set by the --yes flag)
+        self.assume_yes = False
+        # Reuse rendered thumbnails from earlier runs (disabled by --no-cache)
+        self.use_thumb_cache = True
+
+    def _build_region_display(self):
+        """Pre-format the region lines shown by step 1 and region selection"""
+        display = []
+        menu = []
+        for i, (region_id, info) in enumerate(self.regions_data.items(), 1):
+            priority = info.get('priority', 'unknown')
+            
+            # Priority emoji
+            if priority == 'high':
+                status_emoji = "🔴"
+            elif priority == 'medium':
+                status_emoji = "🟡"
+            else:
+                status_emoji = "🟢"
+            
+            sites_emoji = "🏛️" if info.get('known_sites', False) else "🔍"
+            sites_text = "🏛️ Known sites" if info.get('known_sites', False) else "🔍 Exploration"
+            
+            # Add data availability status (simplified check)
+            data_status = "📊" if region_id in ['brazil_xingu', 'brazil_acre', 'peru_explore'] else "⚠️"
+            
+            display.append((region_id, f"  {status_emoji} {sites_emoji} {data_status} {region_id}: {info['name']} ({info.get('country', '')})"))
+            menu.append(f"  {i}. {region_id}: {info['name']} - {status_emoji} {priority} - {sites_text}")
+        return display, menu
+
+    @property
+    def data_acquisition(self):
+        """Earth Engine data acquisition (imports ee on first use)"""
+        if self._data_acquisition is None:
+            from src.data.satellite_acquisition import EnhancedDataAcquisition
+            self._data_acquisition = EnhancedDataAcquisition()
+        return self._data_acquisition
+
+    @property
+    def image_processor(self):
+        """Multi-scale image processor"""
+        if self._image_processor is None:
+            from src.data.image_processor import EnhancedDataProcessor
+            self._image_processor = EnhancedDataProcessor(use_cache=self.use_thumb_cache)
+        return self._image_processor
+
+    @property
+    def ai_analyzer(self):
+        """AI analyzer (imports the OpenAI client on first use)"""
+        if self._ai_analyzer is None:
+            from src.analysis.ai_archaeological_analyzer import EnhancedAIAnalyzer
+            analyzer = EnhancedAIAnalyzer()
+            for name, value in self._restored_ai.items():
+                setattr(analyzer, name, value)
+            self._restored_ai = {}
+            self._ai_analyzer = analyzer
+        return self._ai_analyzer
+
+    def _ai_state(self, name: str, default):
+        """An AI analyzer attribute, read from restored state while the analyzer is not created yet"""
+        if self._ai_analyzer is not None:
+            return getattr(self._ai_analyzer, name)
+        return self._restored_ai.get(name, default)
+
+    def _restore_ai_state(self, **state) -> None:
+        """Hand saved analyzer state to the analyzer, or keep it until the analyzer is created"""
+        if self._ai_analyzer is not None:
+            for name, value in state.items():
+                setattr(self._ai_analyzer, name, value)
+        else:
+            self._restored_ai.update(state)
+
+    def _start_ai_warmup(self):
+        """Prepare the AI analyzer in the background while other steps run"""
+        if self._ai_warmup is None:
+            self._ai_warmup = threading.Thread(target=self._warm_ai_analyzer, daemon=True)
+            self._ai_warmup.start()
+
+    def _warm_ai_analyzer(self):
+        """Import and create the AI analyzer, then open its API connection"""
+        try:
+            self.ai_analyzer.warmup()
+        except Exception as e:
+            print(f"⚠️ AI analyzer warmup failed: {e}")
+
+    def _wait_for_ai_warmup(self):
+        """Wait for a running AI warmup to finish"""
+        if self._ai_warmup is not None:
+            self._ai_warmup.join()
+
+    @property
+    def results_manager(self):
+        """Checkpoint 2 results manager"""
+        if self._results_manager is None:
+            from src.analysis.results_manager import EnhancedResultsManager
+            self._results_manager = EnhancedResultsManager()
+        return self._results_manager
 
     def load_pipeline_progress(self) -> Dict:
         """Load pipeline progress from file"""
@@ -83,56 +276,266 @@ class ArchaeologicalDiscoverySystem:
             'ai_responses_saved': {}
         }
         
+        status = default_status
         if os.path.exists(self.progress_file):
             try:
-                with open(self.progress_file, 'r') as f:
-                    return json.load(f)
+                status = _json_load(self.progress_file)
             except:
-                return default_status
-        return default_status
+                status = default_status
+        
+        # Apply status changes logged after the snapshot was written
+        return self._replay_wal(status, status.pop('wal_seq', 0))
+
+    def _replay_wal(self, status: Dict, snapshot_seq: int) -> Dict:
+        """Apply status log records newer than the snapshot"""
+        self._wal_seq = snapshot_seq
+        self._wal_lines = 0
+        if not os.path.exists(self._wal_path):
+            return status
+        
+        with open(self._wal_path, 'r') as f:
+            for line in f:
+                try:
+                    seq, key, value = line.rstrip('\n').split('\t', 2)
+                    seq = int(seq)
+                    value = json.loads(value)
+                except ValueError:
+                    # Torn record from an interrupted write
+                    continue
+                self._wal_lines += 1
+                if seq > snapshot_seq:
+                    status[key] = value
+                self._wal_seq = max(self._wal_seq, seq)
+        return status
+
+    def _set_state(self, key: str, value) -> None:
+        """Set one pipeline status field and append the change to the status log"""
+        self.pipeline_status[key] = value
+        self._wal_seq += 1
+        try:
+            if self._wal is None:
+                os.makedirs(self.checkpoint_dir, exist_ok=True)
+                self._wal = open(self._wal_path, 'ab+')
+                # Start on a fresh line if the last record was torn
+                if self._wal.tell() > 0:
+                    self._wal.seek(-1, os.SEEK_END)
+                    if self._wal.read(1) != b'\n':
+                        self._wal.write(b'\n')
+            self._wal.write(f"{self._wal_seq}\t{key}\t{json.dumps(value, default=str)}\n".encode())
+            self._wal.flush()
+            self._wal_lines += 1
+        except Exception as e:
+            print(f"⚠️ Could not log progress: {e}")
+            return
+        
+        if self._wal_lines >= self.WAL_COMPACT_LINES:
+            self._compact_wal()
+
+    def _compact_wal(self) -> None:
+        """Write a full snapshot, then empty the status log"""
+        # Keep the log unless the save thread confirms the snapshot is on disk
+        if self.save_pipeline_progress().result():
+            self._wal.truncate(0)
+            self._wal_lines = 0
+
+    @staticmethod
+    def _progress_digest(status: Dict) -> str:
+        """Digest of a pipeline status, ignoring the last_updated stamp and log position"""
+        status = {k: v for k, v in status.items() if k not in ('last_updated', 'wal_seq')}
+        return hashlib.blake2b(json.dumps(status, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
 
-    def save_pipeline_progress(self):
-        """Save current pipeline progress to file"""
+    def save_pipeline_progress(self) -> Future:
+        """Queue the current pipeline progress for writing; the future tells whether it reached disk"""
         self.pipeline_status['last_updated'] = datetime.now().isoformat()
+        snapshot = copy.deepcopy(self.pipeline_status)
+        # Log records up to here are covered by this snapshot
+        snapshot['wal_seq'] = self._wal_seq
+        saved = Future()
+        try:
+            self._save_queue.put_nowait((snapshot, saved))
+        except queue.Full:
+            # Replace the pending snapshot with this newer one
+            try:
+                _, superseded = self._save_queue.get_nowait()
+                superseded.set_result(False)
+                self._save_queue.task_done()
+            except queue.Empty:
+                pass
+            self._save_queue.put_nowait((snapshot, saved))
+        return saved
+
+    def _save_worker(self):
+        """Write queued progress snapshots to file; this thread alone reads and sets _written_hash"""
+        while True:
+            status, saved = self._save_queue.get()
+            written = False
+            try:
+                # Skip the write when nothing but the timestamp would change
+                digest = self._progress_digest(status)
+                if digest != self._written_hash:
+                    # Write beside the target and swap in, so a crash never leaves half a file
+                    tmp_file = self.progress_file + '.tmp'
+                    _json_dump(tmp_file, status)
+                    os.replace(tmp_file, self.progress_file)
+                    self._written_hash = digest
+                written = True
+            except Exception as e:
+                # The hash keeps the last successful write, so the next snapshot retries
+                print(f"⚠️ Could not save progress: {e}")
+            finally:
+                saved.set_result(written)
+                self._save_queue.task_done()
+
+    def flush_pipeline_progress(self):
+        """Block until queued progress has been written"""
+        self._save_queue.join()
+
+    def _scan_files(self, directory: str, pattern: str) -> List[os.DirEntry]:
+        """List files in a directory matching a glob pattern, one scandir per directory"""
+        entries = self._dir_cache.get(directory)
+        if entries is None:
+            try:
+                with os.scandir(directory) as it:
+                    entries = [entry for entry in it if entry.is_file()]
+            except OSError:
+                entries = []
+            self._dir_cache[directory] = entries
+        return [entry for entry in entries if fnmatch.fnmatchcase(entry.name, pattern)]
+
+    def _checkpoint_path(self, kind: str, region_id: str) -> str:
+        """Path of one region's checkpoint"""
+        return os.path.join(self.checkpoint_dir, kind, f'{region_id}.pkl')
+
+    def _save_checkpoint(self, kind: str, region_id: str, data) -> None:
+        """Pickle one region's step result to checkpoints/<kind>/<region_id>.pkl"""
+        path = self._checkpoint_path(kind, region_id)
+        tmp_file = path + '.tmp'
         try:
-            with open(self.progress_file, 'w') as f:
-                json.dump(self.pipeline_status, f, indent=2)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            # Only complete files ever carry the .pkl name
+            os.replace(tmp_file, path)
         except Exception as e:
-            print(f"⚠️ Could not save progress: {e}")
+            print(f"⚠️ Could not checkpoint {kind} data for {region_id}: {e}")
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _load_checkpoints(self, kind: str) -> Dict:
+        """Load all region checkpoints of one kind"""
+        kind_dir = os.path.join(self.checkpoint_dir, kind)
+        self._dir_cache.pop(kind_dir, None)
+        data = {}
+        for entry in self._scan_files(kind_dir, '*.pkl'):
+            try:
+                with open(entry.path, 'rb') as f:
+                    data[entry.name[:-len('.pkl')]] = pickle.load(f)
+            except Exception as e:
+                print(f"   ⚠️ Could not load checkpoint {entry.name}: {e}")
+        return data
+
+    def _cached_count(self, key: str, compute) -> int:
+        """Return a counter cached in the pipeline status, computing it on first use"""
+        value = self.pipeline_status.get(key)
+        if value is None:
+            value = compute()
+            self.pipeline_status[key] = value
+        return value
+
+    def _set_processed_data(self, processed_data: Dict) -> None:
+        """Replace the processed data and drop counts derived from it"""
+        self.processed_data = processed_data
+        self._candidate_counts = None
+
+    def _region_candidate_counts(self):
+        """Candidate count per processed region as an int64 array"""
+        if self._candidate_counts is None:
+            import numpy as np
+            self._candidate_counts = np.fromiter(
+                (len(result.get('discovery_candidates', [])) for result in self.processed_data.values()),
+                dtype=np.int64, count=len(self.processed_data)
+            )
+        return self._candidate_counts
+
+    def _count_candidates(self) -> int:
+        """Total discovery candidates across processed regions"""
+        return int(self._region_candidate_counts().sum())
+
+    def _count_high_confidence(self) -> int:
+        """Number of AI discoveries at or above 0.3 confidence"""
+        # Counted from the restored discoveries when the analyzer (and its OpenAI client) is not built yet
+        return sum(1 for d in self._ai_state('discoveries', []) if d.get('confidence_score', 0) >= 0.3)
+
+    def _load_cached_loaded_data(self) -> bool:
+        """Restore step 2 results from checkpoints"""
+        # Checkpoints hold plain region definitions; Earth Engine objects are rebuilt here
+        loaded = {}
+        for region_id, checkpoint in self._load_checkpoints('loaded').items():
+            try:
+                loaded[region_id] = self.data_acquisition.restore_region_data(checkpoint)
+            except Exception as e:
+                print(f"   ⚠️ Could not rebuild {region_id} from its checkpoint: {e}")
+        if loaded:
+            self.loaded_data = loaded
+            print(f"   ✅ Restored loaded data for {len(loaded)} regions")
+            return True
+        print("   ⚠️ No loaded data checkpoints found")
+        return False
+
+    def _fresh_processed_checkpoint(self, region_id: str):
+        """Load a region's processed checkpoint if it is newer than its loaded data checkpoint"""
+        processed_path = self._checkpoint_path('processed', region_id)
+        loaded_path = self._checkpoint_path('loaded', region_id)
+        try:
+            if os.stat(processed_path).st_mtime <= os.stat(loaded_path).st_mtime:
+                return None
+            with open(processed_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def _load_cached_processed_data(self) -> bool:
+        """Restore step 3 results from checkpoints, falling back to the saved JSON"""
+        processed = self._load_checkpoints('processed')
+        if processed:
+            self._set_processed_data(processed)
+            self._dirty_regions.clear()
+            self.pipeline_status.pop('total_candidates', None)
+            print(f"   ✅ Restored processed data for {len(processed)} regions")
+            return True
+        self.load_existing_data()
+        return bool(self.processed_data)
 
     def detect_existing_progress(self):
         """Detect what has already been completed"""
         print("🔍 Scanning for existing progress...")
         
+        # Directory listings may be stale from an earlier scan
+        self._dir_cache.clear()
+        
         # Check for existing images
         image_dirs = ['regional', 'zone', 'site']
         existing_images = {}
         
         for img_dir in image_dirs:
-            img_path = os.path.join(self.paths['images'], img_dir)
-            if os.path.exists(img_path):
-                images = glob.glob(os.path.join(img_path, '*.png'))
-                if images:
-                    existing_images[img_dir] = len(images)
-                    print(f"   📸 Found {len(images)} {img_dir} images")
+            images = self._scan_files(os.path.join(self._p_images, img_dir), '*.png')
+            if images:
+                existing_images[img_dir] = len(images)
+                print(f"   📸 Found {len(images)} {img_dir} images")
         
         # Check for AI analysis results
-        ai_results_path = self.paths['analysis_results']
-        existing_ai_files = []
-        if os.path.exists(ai_results_path):
-            ai_files = glob.glob(os.path.join(ai_results_path, '*_ai_*.json'))
-            existing_ai_files = [os.path.basename(f) for f in ai_files]
-            if ai_files:
-                print(f"   🤖 Found {len(ai_files)} AI analysis files")
+        ai_files = self._scan_files(self._p_analysis, '*_ai_*.json')
+        existing_ai_files = [entry.name for entry in ai_files]
+        if ai_files:
+            print(f"   🤖 Found {len(ai_files)} AI analysis files")
         
         # Check for submissions
-        submissions_path = self.paths['submissions']
-        existing_submissions = []
-        if os.path.exists(submissions_path):
-            submission_files = glob.glob(os.path.join(submissions_path, 'checkpoint2_*.json'))
-            existing_submissions = [os.path.basename(f) for f in submission_files]
-            if submission_files:
-                print(f"   📦 Found {len(submission_files)} submission files")
+        submission_files = self._scan_files(self._p_submissions, 'checkpoint2_*.json')
+        existing_submissions = [entry.name for entry in submission_files]
+        if submission_files:
+            print(f"   📦 Found {len(submission_files)} submission files")
         
         # Update pipeline status based on findings
         if existing_images:
@@ -159,12 +562,21 @@ class ArchaeologicalDiscoverySystem:
         """Load existing processed data from files"""
         print("📂 Loading existing data...")
         
-        # Try to load processed data
-        processed_data_file = os.path.join(self.paths['analysis_results'], 'processed_data.json')
-        if os.path.exists(processed_data_file):
+        # Try to load processed data (one file per region, or the legacy single file)
+        processed_dir = os.path.join(self._p_analysis, 'processed_data')
+        processed_data_file = os.path.join(self._p_analysis, 'processed_data.json')
+        self._dir_cache.pop(processed_dir, None)
+        region_files = self._scan_files(processed_dir, '*.json')
+        if region_files or os.path.exists(processed_data_file):
             try:
-                with open(processed_data_file, 'r') as f:
-                    self.processed_data = json.load(f)
+                if region_files:
+                    self._set_processed_data({
+                        entry.name[:-len('.json')]: _json_load(entry.path) for entry in region_files
+                    })
+                else:
+                    self._set_processed_data(_json_load(processed_data_file))
+                self._dirty_regions.clear()
+                self.pipeline_status.pop('total_candidates', None)
                 print(f"   ✅ Loaded processed data for {len(self.processed_data)} regions")
                 
                 # Debug: Show what we loaded
@@ -177,11 +589,10 @@ class ArchaeologicalDiscoverySystem:
                 print(f"   ⚠️ Could not load processed data: {e}")
         
         # Try to load AI analyses
-        ai_analysis_file = os.path.join(self.paths['analysis_results'], 'ai_analyses.json')
+        ai_analysis_file = os.path.join(self._p_analysis, 'ai_analyses.json')
         if os.path.exists(ai_analysis_file):
             try:
-                with open(ai_analysis_file, 'r') as f:
-                    self.ai_analyses = json.load(f)
+                self.ai_analyses = _json_load(ai_analysis_file)
                 print(f"   ✅ Loaded AI analyses")
             except Exception as e:
                 print(f"   ⚠️ Could not load AI analyses: {e}")
@@ -190,29 +601,37 @@ class ArchaeologicalDiscoverySystem:
             self.ai_analyses = {}  # Reset to ensure fresh analysis
         
         # Load the latest enhanced AI analysis file with discoveries
-        enhanced_ai_files = glob.glob(os.path.join(self.paths['analysis_results'], 'enhanced_ai_analysis_*.json'))
+        self._dir_cache.pop(self._p_analysis, None)
+        enhanced_ai_files = self._scan_files(self._p_analysis, 'enhanced_ai_analysis_*.json')
         if enhanced_ai_files:
             # Get the most recent file
-            latest_ai_file = max(enhanced_ai_files, key=os.path.getmtime)
+            latest_ai_file = max(enhanced_ai_files, key=lambda e: e.stat().st_mtime).path
             try:
-                with open(latest_ai_file, 'r') as f:
-                    enhanced_ai_data = json.load(f)
+                # Only these keys are used; the rest of the file is skipped
+                enhanced_ai_data = _json_load_keys(
+                    latest_ai_file, ('discoveries', 'ai_responses', 'prompts_used', 'total_prompts')
+                )
                 
-                # Load discoveries into the AI analyzer
+                # Load discoveries for the AI analyzer, which is only created when AI work runs
                 if 'discoveries' in enhanced_ai_data:
-                    self.ai_analyzer.discoveries = enhanced_ai_data['discoveries']
-                    print(f"   ✅ Loaded {len(self.ai_analyzer.discoveries)} AI discoveries")
+                    self._restore_ai_state(discoveries=enhanced_ai_data['discoveries'])
+                    self.pipeline_status.pop('high_confidence_discoveries', None)
+                    print(f"   ✅ Loaded {len(enhanced_ai_data['discoveries'])} AI discoveries")
                 
                 # Load AI responses if available
                 if 'ai_responses' in enhanced_ai_data:
-                    self.ai_analyzer.ai_responses = enhanced_ai_data['ai_responses']
-                    print(f"   ✅ Loaded {len(self.ai_analyzer.ai_responses)} AI responses")
+                    self._restore_ai_state(ai_responses=enhanced_ai_data['ai_responses'])
+                    print(f"   ✅ Loaded {len(enhanced_ai_data['ai_responses'])} AI responses")
                 
                 # Load prompts used
                 if 'prompts_used' in enhanced_ai_data:
-                    self.ai_analyzer.prompts_used = enhanced_ai_data['prompts_used']
-                    total_prompts = sum(len(prompts) if isinstance(prompts, list) else (1 if prompts else 0) 
-                                      for prompts in self.ai_analyzer.prompts_used.values())
+                    prompts_used = enhanced_ai_data['prompts_used']
+                    total_prompts = enhanced_ai_data.get('total_prompts')
+                    if total_prompts is None:
+                        # Older files predate the stored total
+                        total_prompts = sum(len(prompts) if isinstance(prompts, list) else (1 if prompts else 0) 
+                                            for prompts in prompts_used.values())
+                    self._restore_ai_state(prompts_used=prompts_used, _prompt_count=total_prompts)
                     print(f"   ✅ Loaded {total_prompts} AI prompts")
                     
             except Exception as e:
@@ -223,19 +642,21 @@ class ArchaeologicalDiscoverySystem:
     def save_current_data(self):
         """Save current data state"""
         try:
-            # Save processed data
-            if self.processed_data:
-                processed_file = os.path.join(self.paths['analysis_results'], 'processed_data.json')
-                with open(processed_file, 'w') as f:
-                    # Remove GEE objects for JSON serialization
-                    serializable_data = self.make_serializable(self.processed_data)
-                    json.dump(serializable_data, f, indent=2)
+            # Save processed data, rewriting only regions that changed
+            if self.processed_data and self._dirty_regions:
+                processed_dir = os.path.join(self._p_analysis, 'processed_data')
+                os.makedirs(processed_dir, exist_ok=True)
+                for region_id in sorted(self._dirty_regions):
+                    if region_id in self.processed_data:
+                        # Remove GEE objects for JSON serialization
+                        _json_dump(os.path.join(processed_dir, f'{region_id}.json'),
+                                   self.make_serializable(self.processed_data[region_id]))
+                self._dirty_regions.clear()
             
             # Save AI analyses
             if self.ai_analyses:
-                ai_file = os.path.join(self.paths['analysis_results'], 'ai_analyses.json')
-                with open(ai_file, 'w') as f:
-                    json.dump(self.ai_analyses, f, indent=2)
+                ai_file = os.path.join(self._p_analysis, 'ai_analyses.json')
+                _json_dump(ai_file, self.ai_analyses)
             
             self.save_pipeline_progress()
             
@@ -244,17 +665,32 @@ class ArchaeologicalDiscoverySystem:
 
     def make_serializable(self, data):
         """Remove non-serializable objects for JSON storage"""
-        if isinstance(data, dict):
-            result = {}
-            for key, value in data.items():
-                if key in ['data_sources', 'regional_area']:  # Skip GEE objects
-                    continue
-                result[key] = self.make_serializable(value)
-            return result
-        elif isinstance(data, list):
-            return [self.make_serializable(item) for item in data]
-        else:
+        if not isinstance(data, (dict, list)):
             return data
+        
+        # Copy the container tree with an explicit stack instead of recursion;
+        # the live data keeps its GEE objects for later steps
+        root = {} if isinstance(data, dict) else []
+        stack = [(data, root)]
+        while stack:
+            src, dst = stack.pop()
+            items = src.items() if isinstance(src, dict) else enumerate(src)
+            for key, value in items:
+                if isinstance(src, dict) and key in ('data_sources', 'regional_area'):  # Skip GEE objects
+                    continue
+                if isinstance(value, dict):
+                    child = {}
+                    stack.append((value, child))
+                elif isinstance(value, list):
+                    child = []
+                    stack.append((value, child))
+                else:
+                    child = value
+                if isinstance(dst, dict):
+                    dst[key] = child
+                else:
+                    dst.append(child)
+        return root
 
     def step_1_setup_and_authentication(self) -> bool:
         """
@@ -265,15 +701,8 @@ class ArchaeologicalDiscoverySystem:
         
         # Show available regions with data status
         print("🌍 Available Amazon regions:")
-        regions = self.regions_data
-        for region_id, info in regions.items():
-            priority_emoji = "🔴" if info['priority'] == 'high' else "🟡" if info['priority'] == 'medium' else "🟢"
-            sites_emoji = "🏛️" if info['known_sites'] else "🔍"
-            
-            # Add data availability status (simplified check)
-            data_status = "📊" if region_id in ['brazil_xingu', 'brazil_acre', 'peru_explore'] else "⚠️"
-            
-            print(f"  {priority_emoji} {sites_emoji} {data_status} {region_id}: {info['name']} ({info['country']})")
+        for region_id, line in self._region_display:
+            print(line)
         
         print()
         print("📊 = Good data availability")
@@ -282,8 +711,8 @@ class ArchaeologicalDiscoverySystem:
         
         # Setup Google Earth Engine
         if self.data_acquisition.setup_google_earth_engine():
-            self.pipeline_status['authentication'] = True
-            self.save_pipeline_progress()
+            self._set_state('authentication', True)
+            self._set_state('auth_expiry', time.time() + self.AUTH_TTL)
             print("✅ Step 1 completed - Authentication successful!")
             return True
         else:
@@ -327,20 +756,8 @@ class ArchaeologicalDiscoverySystem:
         
         print(f"\n🌍 All available regions:")
         region_list = list(regions.keys())
-        for i, region_id in enumerate(region_list, 1):
-            info = regions[region_id]
-            priority = info.get('priority', 'unknown')
-            
-            # Priority emoji
-            if priority == 'high':
-                status_emoji = "🔴"
-            elif priority == 'medium':
-                status_emoji = "🟡"
-            else:
-                status_emoji = "🟢"
-            
-            sites_text = "🏛️ Known sites" if info.get('known_sites', False) else "🔍 Exploration"
-            print(f"  {i}. {region_id}: {info['name']} - {status_emoji} {priority} - {sites_text}")
+        for line in self._region_menu:
+            print(line)
         
         print(f"\nOptions:")
         print(f"  R. Use recommended regions (auto-select best {min(max_regions, len(recommended))})")
@@ -432,7 +849,9 @@ class ArchaeologicalDiscoverySystem:
         self.loaded_data = self.data_acquisition.load_specific_regions(selected_regions)
         
         if self.loaded_data:
-            self.pipeline_status['data_loaded'] = True
+            self._set_state('data_loaded', True)
+            for region_id, region_data in self.loaded_data.items():
+                self._save_checkpoint('loaded', region_id, self.data_acquisition.checkpoint_region_data(region_data))
             
             # Show data summary
             data_summary = self.data_acquisition.get_data_summary()
@@ -462,26 +881,56 @@ class ArchaeologicalDiscoverySystem:
         print("🎯 Scale 3: Site feature confirmation (2km)")
         print()
         
-        # Process all loaded regions with multi-scale analysis
-        self.processed_data = self.image_processor.process_all_regions(self.loaded_data)
+        # Step 4's client setup overlaps with image processing
+        self._start_ai_warmup()
+        
+        # Regions processed after their data was last loaded are reused as-is
+        cached = {}
+        pending = {}
+        for region_id, region_data in self.loaded_data.items():
+            results = self._fresh_processed_checkpoint(region_id)
+            if results is not None:
+                cached[region_id] = results
+                print(f"   ♻️ {region_id}: reusing processed checkpoint")
+            else:
+                pending[region_id] = region_data
+        
+        # Process remaining regions with multi-scale analysis, checkpointing each as it finishes
+        processed = {}
+        if pending:
+            try:
+                processed = self.image_processor.process_all_regions(
+                    pending,
+                    on_region_done=lambda region_id, results: self._save_checkpoint('processed', region_id, results)
+                )
+            finally:
+                # Release download pools and cached tiles held for this run
+                self.image_processor.close()
+        self._dirty_regions.update(processed)
+        
+        self._set_processed_data({
+            region_id: cached[region_id] if region_id in cached else processed[region_id]
+            for region_id in self.loaded_data
+            if region_id in cached or region_id in processed
+        })
+        # Step 5 reads discoveries from the processor
+        self.image_processor.processed_data = self.processed_data
         
         if self.processed_data:
-            self.pipeline_status['processing_complete'] = True
+            self._set_state('processing_complete', True)
+            
+            # Count total discoveries
+            total_candidates = self._count_candidates()
+            self._set_state('total_candidates', total_candidates)
             
             # Save current data state including processed results
             print("💾 Saving processing results...")
             self.save_current_data()
             
-            # Count total discoveries
-            total_candidates = sum(
-                len(result['discovery_candidates']) 
-                for result in self.processed_data.values()
-            )
-            
             print(f"\n✅ Step 3 completed - Multi-scale processing finished!")
             print(f"🎯 Discovery candidates found: {total_candidates}")
             print(f"📁 Images created in: {self.image_processor.output_folder}/")
-            print(f"💾 Processing data saved to: {self.paths['analysis_results']}/")
+            print(f"💾 Processing data saved to: {self._p_analysis}/")
             return True
         else:
             print("❌ Step 3 failed - Processing unsuccessful")
@@ -504,6 +953,8 @@ class ArchaeologicalDiscoverySystem:
         print("🔄 Stage 4: Discovery leverage")
         print()
         
+        self._wait_for_ai_warmup()
+        
         # Ensure we have processed data loaded
         if not self.processed_data:
             print("📂 Loading processed data first...")
@@ -520,10 +971,10 @@ class ArchaeologicalDiscoverySystem:
             print(f"   🎯 {region_id}: {zones} zones, {sites} sites")
         
         # Run complete multi-scale AI analysis
-        self.ai_analyses = self.ai_analyzer.analyze_all_scales(self.processed_data)
+        self.ai_analyses = asyncio.run(self.ai_analyzer.analyze_all_scales_async(self.processed_data))
         
         if self.ai_analyses:
-            self.pipeline_status['ai_analysis_complete'] = True
+            self._set_state('ai_analysis_complete', True)
             
             # Save AI analysis results to organized folder
             print("💾 Saving AI analysis results...")
@@ -534,10 +985,11 @@ class ArchaeologicalDiscoverySystem:
             
             # Get all discoveries
             all_discoveries = self.ai_analyzer.get_high_confidence_discoveries(min_confidence=0.3)
+            self._set_state('high_confidence_discoveries', len(all_discoveries))
             
             print(f"\n✅ Step 4 completed - AI analysis finished!")
             print(f"🏛️ Archaeological discoveries: {len(all_discoveries)}")
-            print(f"📝 Prompts logged: {sum(len(prompts) if isinstance(prompts, list) else (1 if prompts else 0) for prompts in self.ai_analyses.values())}")
+            print(f"📝 Prompts logged: {self.ai_analyzer._prompt_count}")
             print(f"🔄 Leverage analysis: {'✅' if self.ai_analyses.get('leverage') else '❌'}")
             print(f"💾 Results saved to: {ai_results_file}")
             return True
@@ -596,7 +1048,7 @@ class ArchaeologicalDiscoverySystem:
         )
         
         if self.final_submission:
-            self.pipeline_status['submission_ready'] = True
+            self._set_state('submission_ready', True)
             
             # Save submission files
             submission_file = self.results_manager.save_submission()
@@ -627,10 +1079,7 @@ class ArchaeologicalDiscoverySystem:
             # Ensure proper field naming for validation
             if 'center_lat' not in discovery and 'center_lng' not in discovery:
                 # Try to extract coordinates from other fields
-                if hasattr(discovery, 'center_lat') and hasattr(discovery, 'center_lng'):
-                    discovery['center_lat'] = discovery.center_lat
-                    discovery['center_lng'] = discovery.center_lng
-                elif 'coordinates' in discovery:
+                if 'coordinates' in discovery:
                     coords = discovery['coordinates']
                     if isinstance(coords, list) and len(coords) >= 2:
                         discovery['center_lat'] = coords[0]
@@ -643,41 +1092,86 @@ class ArchaeologicalDiscoverySystem:
             merged.append(discovery)
         
         # Add ALL AI discoveries - they already have proper field formatting
-        for ai_disc in ai_discoveries:
-            # Format AI discovery properly - ensure all required fields
-            formatted_disc = {
-                'center_lat': ai_disc.get('center_lat', ai_disc.get('lat')),
-                'center_lng': ai_disc.get('center_lng', ai_disc.get('lng')),
-                'confidence': ai_disc.get('confidence_score', ai_disc.get('confidence', 0.5)),
-                'site_id': ai_disc.get('id', ai_disc.get('site_id', f'ai_discovery_{len(merged)+1}')),
-                'site_type': ai_disc.get('site_type', ai_disc.get('type', 'ai_detected')),
-                'source': 'ai_analysis',
-                'discovery_timestamp': ai_disc.get('discovery_timestamp', ''),
-                'analysis_scale': ai_disc.get('analysis_scale', 'zone')
-            }
-            
-            # Copy additional fields if available
-            for field in ['diameter_meters', 'defensive_rings', 'features_detected', 'measurements']:
-                if field in ai_disc:
-                    formatted_disc[field] = ai_disc[field]
-            
-            merged.append(formatted_disc)
+        merged.extend(self._format_ai_discoveries(ai_discoveries, len(merged)))
         
         # Add more discoveries from processed data if we need them
+        n_fixed = len(merged)
         if hasattr(self, 'processed_data') and self.processed_data:
             for region_id, region_results in self.processed_data.items():
-                discovery_candidates = region_results.get('discovery_candidates', [])
-                for candidate in discovery_candidates:
-                    # Add if not already in merged list
-                    if not any(abs(discovery.get('center_lat', 0) - candidate.get('center_lat', 0)) < 0.01
-                              for discovery in merged):
-                        merged.append(candidate)
-                        print(f"   ✅ Added processor candidate: {candidate.get('site_id', 'unknown')}")
+                merged.extend(region_results.get('discovery_candidates', []))
+        
+        import numpy as np
+        from src.core._discovery_kernels import grid_keep_mask, rank_by_confidence
+        
+        # Numeric columns for the grid dedup and ranking kernels
+        lat = np.array([d.get('center_lat') or 0 for d in merged], dtype=np.float64)
+        lng = np.array([d.get('center_lng') or 0 for d in merged], dtype=np.float64)
+        conf = np.array([d.get('confidence', 0) or 0 for d in merged], dtype=np.float64)
         
-        print(f"🔍 Final merged count: {len(merged)} discoveries")
+        # Candidates are kept only if their 0.01° cell is not already taken
+        keep = grid_keep_mask(lat, lng, n_fixed)
+        for i in range(n_fixed, len(merged)):
+            if keep[i]:
+                print(f"   ✅ Added processor candidate: {merged[i].get('site_id', 'unknown')}")
+        
+        kept = np.flatnonzero(keep)
+        print(f"🔍 Final merged count: {len(kept)} discoveries")
         
         # Sort by confidence
-        return sorted(merged, key=lambda x: x.get('confidence', 0), reverse=True)
+        order = kept[rank_by_confidence(conf[kept])]
+        return [merged[i] for i in order]
+    
+    def _format_ai_discoveries(self, ai_discoveries: List[Dict], start_index: int) -> List[Dict]:
+        """
+        Map AI discoveries onto the merged discovery fields
+        Fallback chains are coalesced column-wise instead of per discovery
+        """
+        if not ai_discoveries:
+            return []
+        
+        import pandas as pd
+        
+        df = pd.DataFrame(ai_discoveries)
+        
+        def col(name):
+            if name in df:
+                return df[name]
+            return pd.Series(None, index=df.index, dtype=object)
+        
+        default_ids = pd.Series(
+            [f'ai_discovery_{start_index + i + 1}' for i in range(len(df))], index=df.index
+        )
+        
+        formatted = pd.DataFrame({
+            'center_lat': col('center_lat').combine_first(col('lat')),
+            'center_lng': col('center_lng').combine_first(col('lng')),
+            'confidence': col('confidence_score').combine_first(col('confidence')).fillna(0.5),
+            'site_id': col('id').combine_first(col('site_id')).fillna(default_ids),
+            'site_type': col('site_type').combine_first(col('type')).fillna('ai_detected'),
+            'source': 'ai_analysis',
+            'discovery_timestamp': col('discovery_timestamp').fillna(''),
+            'analysis_scale': col('analysis_scale').fillna('zone')
+        })
+        
+        # Missing coordinates stay None rather than NaN
+        records = formatted.astype(object).where(formatted.notna(), None).to_dict(orient='records')
+        
+        # Copy additional fields if available
+        for field in ['diameter_meters', 'defensive_rings', 'features_detected', 'measurements']:
+            if field in df:
+                for record, value, present in zip(records, df[field].tolist(), df[field].notna().tolist()):
+                    if present:
+                        record[field] = value
+        
+        return records
+    
+    def _auth_still_valid(self) -> bool:
+        """True if Earth Engine was initialized in this session and the auth TTL has not expired"""
+        # ee.Initialize is per process, so a stored expiry alone is not enough
+        if self._data_acquisition is None or not self._data_acquisition.authenticated:
+            return False
+        return (self.pipeline_status.get('authentication', False)
+                and time.time() < self.pipeline_status.get('auth_expiry', 0))
     
     def run_complete_pipeline(self, max_regions: int = 3) -> bool:
         """
@@ -690,14 +1184,17 @@ class ArchaeologicalDiscoverySystem:
         print(f"⏱️ Estimated time: 15-30 minutes")
         print()
         
-        # Step 1: Authentication (always verify - don't skip)
+        # Step 1: Authentication (verified unless this session did so within the TTL)
         print("🔑 STEP 1: Authentication & Setup")
         print("-" * 40)
-        if not self.data_acquisition.setup_google_earth_engine():
+        if self._auth_still_valid():
+            print("✅ Step 1 completed - Authentication still valid")
+        elif not self.data_acquisition.setup_google_earth_engine():
             print("❌ Google Earth Engine setup failed!")
             return False
         else:
-            self.pipeline_status['authentication'] = True
+            self._set_state('authentication', True)
+            self._set_state('auth_expiry', time.time() + self.AUTH_TTL)
             print("✅ Step 1 completed - Authentication verified!")
         
         print("=" * 60)
@@ -709,7 +1206,7 @@ class ArchaeologicalDiscoverySystem:
         else:
             print("📡 Step 2: Data Loading ✅ (already completed)")
             print("🔄 Loading existing data...")
-            # We would need to reload the actual GEE data here for processing
+            self._load_cached_loaded_data()
         
         print("=" * 60)
         
@@ -719,7 +1216,7 @@ class ArchaeologicalDiscoverySystem:
                 return False
         else:
             print("🔬 Step 3: Multi-Scale Processing ✅ (already completed)")
-            self.load_existing_data()
+            self._load_cached_processed_data()
         
         print("=" * 60)
         
@@ -812,7 +1309,7 @@ class ArchaeologicalDiscoverySystem:
                 print(f"❌ Error: {e}")
                 input("Press Enter to continue...")
 
-    def resume_from_detected_step(self):
+    def resume_from_detected_step(self, max_regions: Optional[int] = None):
         """Resume pipeline from detected completion point"""
         print("🔄 Resuming from detected progress...")
         
@@ -821,8 +1318,9 @@ class ArchaeologicalDiscoverySystem:
             self.step_1_setup_and_authentication()
         elif not self.pipeline_status['data_loaded']:
             print("▶️ Starting from Step 2: Data Loading")
-            regions = input("How many regions? (1-5): ").strip()
-            max_regions = int(regions) if regions.isdigit() and 1 <= int(regions) <= 5 else 3
+            if max_regions is None:
+                regions = input("How many regions? (1-5): ").strip()
+                max_regions = int(regions) if regions.isdigit() and 1 <= int(regions) <= 5 else 3
             self.step_2_load_dual_source_data(max_regions)
         elif not self.pipeline_status['processing_complete']:
             print("▶️ Starting from Step 3: Processing")
@@ -838,7 +1336,10 @@ class ArchaeologicalDiscoverySystem:
 
     def clear_progress(self):
         """Clear all progress and start fresh"""
-        confirm = input("⚠️ This will clear all progress. Continue? (y/N): ").strip().lower()
+        if self.assume_yes:
+            confirm = 'y'
+        else:
+            confirm = input("⚠️ This will clear all progress. Continue? (y/N): ").strip().lower()
         if confirm == 'y':
             # Reset pipeline status
             self.pipeline_status = {
@@ -855,7 +1356,8 @@ class ArchaeologicalDiscoverySystem:
             
             # Clear data
             self.loaded_data = {}
-            self.processed_data = {}
+            self._set_processed_data({})
+            self._dirty_regions.clear()
             self.ai_analyses = {}
             self.final_submission = {}
             
@@ -866,67 +1368,73 @@ class ArchaeologicalDiscoverySystem:
 
     def show_pipeline_status(self):
         """Show current pipeline status"""
-        print(f"\n📊 PIPELINE STATUS:")
-        print("-" * 30)
+        lines = []
+        lines.append(f"\n📊 PIPELINE STATUS:")
+        lines.append("-" * 30)
         
         for step, completed in self.pipeline_status.items():
+            if step in self._STATUS_VALUE_KEYS:
+                continue
             status = "✅ Complete" if completed else "⏸️ Pending"
             step_name = step.replace('_', ' ').title()
-            print(f"{step_name}: {status}")
+            lines.append(f"{step_name}: {status}")
         
         if self.loaded_data:
-            print(f"\nData: {len(self.loaded_data)} regions loaded")
+            lines.append(f"\nData: {len(self.loaded_data)} regions loaded")
         if self.processed_data:
-            total_candidates = sum(len(result.get('discovery_candidates', [])) for result in self.processed_data.values())
-            print(f"Processing: {total_candidates} candidates found")
+            total_candidates = self._cached_count('total_candidates', self._count_candidates)
+            lines.append(f"Processing: {total_candidates} candidates found")
         if hasattr(self, 'ai_analyses') and self.ai_analyses:
-            discoveries = len(self.ai_analyzer.get_high_confidence_discoveries(0.3))
-            print(f"AI Analysis: {discoveries} discoveries")
+            discoveries = self._cached_count('high_confidence_discoveries', self._count_high_confidence)
+            lines.append(f"AI Analysis: {discoveries} discoveries")
+        _emit(lines)
     
     def show_detailed_status(self):
         """Show detailed system status"""
-        print(f"\n📋 DETAILED SYSTEM STATUS")
-        print("=" * 50)
+        lines = []
+        lines.append(f"\n📋 DETAILED SYSTEM STATUS")
+        lines.append("=" * 50)
         
         # Component status
-        print("🔧 Components:")
-        print(f"   Region Config: {len(self.regions_data)} regions available")
-        print(f"   Data Acquisition: {'✅ Ready' if self.data_acquisition.authenticated else '❌ Not authenticated'}")
-        print(f"   Image Processor: Multi-scale analysis ready")
-        print(f"   AI Analyzer: Casarabe knowledge base loaded")
-        print(f"   Results Manager: Checkpoint 2 compliance monitoring")
+        lines.append("🔧 Components:")
+        lines.append(f"   Region Config: {len(self.regions_data)} regions available")
+        # Only report on an existing acquisition object; creating one would import ee and authenticate
+        authenticated = self._data_acquisition is not None and self._data_acquisition.authenticated
+        lines.append(f"   Data Acquisition: {'✅ Ready' if authenticated else '❌ Not authenticated'}")
+        lines.append(f"   Image Processor: Multi-scale analysis ready")
+        lines.append(f"   AI Analyzer: Casarabe knowledge base loaded")
+        lines.append(f"   Results Manager: Checkpoint 2 compliance monitoring")
         
         # Data status
         if self.loaded_data:
-            print(f"\n📊 Loaded Data:")
+            lines.append(f"\n📊 Loaded Data:")
             for region_id, data in self.loaded_data.items():
-                print(f"   {region_id}: {data['region_info']['name']}")
-                print(f"      Optical scenes: {data['metadata']['optical_scenes']}")
-                print(f"      Radar source: {data['metadata']['radar_source']}")
+                lines.append(f"   {region_id}: {data['region_info']['name']}")
+                lines.append(f"      Optical scenes: {data['metadata']['optical_scenes']}")
+                lines.append(f"      Radar source: {data['metadata']['radar_source']}")
         
         # Processing status
         if self.processed_data:
-            print(f"\n🔬 Processing Results:")
-            for region_id, results in self.processed_data.items():
-                print(f"   {region_id}: {results['region_name']}")
-                print(f"      Candidates: {len(results['discovery_candidates'])}")
-                print(f"      Analysis scales: {len(results['scales'])}")
+            lines.append(f"\n🔬 Processing Results:")
+            for (region_id, results), candidates in zip(self.processed_data.items(), self._region_candidate_counts()):
+                lines.append(f"   {region_id}: {results['region_name']}")
+                lines.append(f"      Candidates: {candidates}")
+                lines.append(f"      Analysis scales: {len(results['scales'])}")
         
         # AI status
         if hasattr(self, 'ai_analyses') and self.ai_analyses:
-            print(f"\n🤖 AI Analysis:")
-            total_prompts = sum(len(prompts) if isinstance(prompts, list) else 1 
-                              for prompts in self.ai_analyses.values() if prompts)
-            print(f"   Total prompts: {total_prompts}")
-            print(f"   Discoveries: {len(self.ai_analyzer.discoveries)}")
-            print(f"   Leverage analysis: {'✅' if self.ai_analyses.get('leverage') else '❌'}")
+            lines.append(f"\n🤖 AI Analysis:")
+            lines.append(f"   Total prompts: {self._ai_state('_prompt_count', 0)}")
+            lines.append(f"   Discoveries: {len(self._ai_state('discoveries', []))}")
+            lines.append(f"   Leverage analysis: {'✅' if self.ai_analyses.get('leverage') else '❌'}")
         
         # Submission status
         if self.final_submission:
-            print(f"\n📦 Submission:")
-            print(f"   Status: {self.final_submission['validation']['overall_status']}")
-            print(f"   Footprints: {len(self.final_submission['anomaly_footprints'])}")
-            print(f"   Quality score: {self.final_submission['quality_metrics']['average_discovery_confidence']:.3f}")
+            lines.append(f"\n📦 Submission:")
+            lines.append(f"   Status: {self.final_submission['validation']['overall_status']}")
+            lines.append(f"   Footprints: {len(self.final_submission['anomaly_footprints'])}")
+            lines.append(f"   Quality score: {self.final_submission['quality_metrics']['average_discovery_confidence']:.3f}")
+        _emit(lines)
     
     def show_final_validation_summary(self):
         """Show final validation summary"""
@@ -934,11 +1442,12 @@ class ArchaeologicalDiscoverySystem:
             return
         
         validation = self.final_submission['validation']
+        lines = []
         
-        print(f"🔍 FINAL VALIDATION SUMMARY")
-        print("=" * 40)
-        print(f"📊 Overall Status: {validation['overall_status']}")
-        print()
+        lines.append(f"🔍 FINAL VALIDATION SUMMARY")
+        lines.append("=" * 40)
+        lines.append(f"📊 Overall Status: {validation['overall_status']}")
+        lines.append("")
         
         # Check each requirement
         requirements = validation['requirements']
@@ -956,19 +1465,20 @@ class ArchaeologicalDiscoverySystem:
             if req_key in requirements:
                 status = requirements[req_key]['status']
                 emoji = "✅" if status == 'PASS' else "❌"
-                print(f"{emoji} {req_name}: {status}")
+                lines.append(f"{emoji} {req_name}: {status}")
         
         if validation.get('critical_issues'):
-            print(f"\n❌ Critical Issues:")
+            lines.append(f"\n❌ Critical Issues:")
             for issue in validation['critical_issues']:
-                print(f"   • {issue}")
+                lines.append(f"   • {issue}")
         
         if validation.get('warnings'):
-            print(f"\n⚠️ Warnings:")
+            lines.append(f"\n⚠️ Warnings:")
             for warning in validation['warnings']:
-                print(f"   • {warning}")
+                lines.append(f"   • {warning}")
         
-        print(f"\n🎯 Ready for competition submission!")
+        lines.append(f"\n🎯 Ready for competition submission!")
+        _emit(lines)
 
     # Clean interface methods for streamlined execution
     def setup_authentication(self) -> bool:
@@ -995,10 +1505,39 @@ class ArchaeologicalDiscoverySystem:
         return self.step_5_create_checkpoint2_submission()
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options for non-interactive runs"""
+    parser = argparse.ArgumentParser(description="Archaeological Discovery System")
+    parser.add_argument('--mode', choices=['auto', 'step', 'resume', 'status'], default='auto',
+                        help="auto: complete pipeline, step: interactive steps, "
+                             "resume: continue from detected progress, status: show status only")
+    parser.add_argument('--regions', type=int, default=3, choices=range(1, 6), metavar='N',
+                        help="Number of regions to analyze (1-5, default 3)")
+    parser.add_argument('--yes', action='store_true',
+                        help="Answer yes to confirmation prompts")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Render all thumbnails again instead of reusing cached ones")
+    return parser.parse_args(argv)
+
+def run_mode(system: 'ArchaeologicalDiscoverySystem', mode: str, max_regions: int = 3):
+    """Dispatch one of the top-level run modes"""
+    if mode == 'auto':
+        system.run_complete_pipeline(max_regions=max_regions)
+    elif mode == 'step':
+        system.run_step_by_step_mode()
+    elif mode == 'resume':
+        system.resume_from_detected_step(max_regions)
+    elif mode == 'status':
+        system.show_pipeline_status()
+        system.show_detailed_status()
+
 def main():
     """
     Main entry point for the Archaeological Discovery System
+    Interactive when started without arguments, otherwise driven by the command line
     """
+    args = parse_args() if len(sys.argv) > 1 else None
+    
     print("🏛️ Archaeological Discovery System")
     print("=" * 60)
     print("🎯 OpenAI to Z Challenge - Checkpoint 2 Complete Solution")
@@ -1015,6 +1554,12 @@ def main():
     # Create the main system
     system = ArchaeologicalDiscoverySystem()
     
+    if args is not None:
+        system.assume_yes = args.yes
+        system.use_thumb_cache = not args.no_cache
+        run_mode(system, args.mode, args.regions)
+        return
+    
     print(f"🚀 How do you want to proceed?")
     print("1. Run complete pipeline automatically (recommended)")
     print("2. Step-by-step interactive mode (for learning/debugging)")
@@ -1025,14 +1570,9 @@ def main():
     
     choice = input("Select option (0-4): ").strip()
     
-    if choice == '1':
-        system.run_complete_pipeline()
-    elif choice == '2':
-        system.run_step_by_step_mode()
-    elif choice == '3':
-        system.resume_from_progress()
-    elif choice == '4':
-        system.show_system_status()
+    modes = {'1': 'auto', '2': 'step', '3': 'resume', '4': 'status'}
+    if choice in modes:
+        run_mode(system, modes[choice])
     elif choice == '0':
         print("👋 Exiting system")
         return
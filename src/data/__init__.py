@@ -0,0 +1,10 @@
+# Data package
+# Earth Engine is imported on first use so menus and status views start quickly
+
+import functools
+
+@functools.lru_cache(maxsize=None)
+def get_ee():
+    """Import and return the Earth Engine module"""
+    import ee
+    return ee
@@ -3,17 +3,32 @@
 # Implements the three-tier approach: Regional → Zone → Site
 
 import os
-import requests
+import math
 import time
+import shutil
+import heapq
+import hashlib
+import functools
+import threading
+import contextlib
+from collections import OrderedDict
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from datetime import datetime
-from PIL import Image
-from typing import Dict, List, Tuple
-import ee
+from typing import Dict, List, Optional, Tuple
 import json
 
 # Import from organized structure
 from src.config.output_paths import get_paths
+from src.data import get_ee
+from src.data._site_kernels import FEATURE_DTYPE, SITE_TIERS, site_confidence, site_tier, score_sites
+
+# Optional Cloud Storage client for batch-exported site renders
+try:
+    from google.cloud import storage as gcs
+except ImportError:
+    gcs = None
 
 class EnhancedDataProcessor:
     """
@@ -21,8 +36,42 @@ class EnhancedDataProcessor:
     Progressive analysis: 50km → 10km → 2km scales
     """
     
-    def __init__(self):
-        """Initialize multi-scale processor with organized output paths"""
+    # Degrees between zone centers in a hotspot grid; each zone extends this far from its center
+    ZONE_SPACING = 0.042  # ~4.6km
+    
+    # Earth Engine requests in flight at once, across all regions
+    GEE_CONCURRENCY = 6
+    
+    # Web-map tile edge in pixels for zone-scale renders
+    TILE_SIZE = 256
+    # Bytes of raw map tiles kept for reuse between neighbouring zones
+    TILE_CACHE_BYTES = 64 << 20
+    
+    # Seconds between status polls of batch export tasks
+    EXPORT_POLL_INTERVAL = 5
+    # Seconds to wait for a batch of export tasks; unfinished ones fall back to thumbnails
+    EXPORT_TIMEOUT = 900
+    
+    # Fixed visualisation parameters per rendered layer; only the area (and index stretch) vary per render
+    VIS_TEMPLATES = {
+        'regional_archaeological': {
+            'dimensions': 512, 'format': 'png',
+            'palette': ['000033', '000066', '003366', '006666', '336666',
+                        '666633', '996633', 'CC6633', 'FF6633', 'FF3300']
+        },
+        'regional_optical': {'dimensions': 512, 'format': 'png', 'min': 0, 'max': 3000},
+        'zone_optical': {'min': 0, 'max': 3000},
+        'zone_radar': {'min': -20, 'max': 0},
+        # Use a more balanced color palette (blue-green-yellow-red)
+        'zone_archaeological': {'palette': ['000066', '0066CC', '00CC66', 'CCCC00', 'CC6600', 'CC0000']},
+        'site_optical': {'dimensions': 1024, 'format': 'png', 'min': 0, 'max': 3000}
+    }
+    
+    def __init__(self, use_cache: bool = True):
+        """
+        Initialize multi-scale processor with organized output paths
+        use_cache=False disables the persistent thumbnail cache
+        """
         # Use organized output structure
         self.paths = get_paths()
         self.output_folder = self.paths['images']  # Use organized structure
@@ -42,6 +91,43 @@ class EnhancedDataProcessor:
         self.processed_data = {}
         self.all_discoveries = []
         
+        # Simulated detector outcomes are drawn in batches from one generator
+        self._rng = np.random.default_rng()
+        
+        # Shared HTTP session so thumbnail downloads reuse connections
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        # Thumbnails of one tier are downloaded concurrently; pools are created on first use and shut down by close()
+        self._download_pool = None
+        self._pool_lock = threading.Lock()
+        self._gee_slots = threading.Semaphore(self.GEE_CONCURRENCY)
+        
+        # Zone-scale renders per (region, hotspot), cropped into the grid's zones
+        self._mosaics = {}
+        self._mosaic_pixels = {}
+        self._mosaic_lock = threading.Lock()
+        
+        # Zone layers are assembled from map tiles: one map id per layer, tiles shared between zones
+        self._map_ids = {}
+        self._map_id_lock = threading.Lock()
+        self._tile_pool = None
+        # Raw tile bytes by URL, least recently used first, bounded by TILE_CACHE_BYTES
+        self._tile_cache = OrderedDict()
+        self._tile_cache_size = 0
+        self._tile_cache_lock = threading.Lock()
+        
+        # Rendered thumbnails are kept across runs, keyed by what was rendered
+        self.thumb_cache_dir = os.path.join(self.paths['base'], 'cache', 'thumbs') if use_cache else None
+        if self.thumb_cache_dir:
+            os.makedirs(self.thumb_cache_dir, exist_ok=True)
+        
+        # With a bucket configured, site renders run as one batch of Earth Engine export tasks
+        self.export_bucket = os.getenv('GEE_EXPORT_BUCKET') if gcs else None
+        
         print("🎨 Enhanced Multi-Scale Processor initialized")
         print(f"📊 Analysis scales: Regional (50km) → Zone (10km) → Site (2km)")
         print(f"📁 Output directory: {self.output_folder}")
@@ -76,10 +162,12 @@ class EnhancedDataProcessor:
         
         # TIER 2: Zone Analysis (10km scale)
         print("🔍 Tier 2: Zone-level site detection...")
-        priority_zones = self.identify_priority_zones(region_data, regional_results)
+        zones_to_analyze = self.identify_priority_zones(region_data, regional_results, limit=9)  # Analyze top 9 zones
+        self._attach_hotspot_stats(region_data, zones_to_analyze)
+        self._radar_band(region_data)
         
         zone_results = []
-        for zone in priority_zones[:9]:  # Analyze top 9 zones
+        for zone in zones_to_analyze:
             zone_result = self.analyze_zone_scale(region_data, zone)
             if zone_result and zone_result['potential_sites']:
                 zone_results.append(zone_result)
@@ -92,21 +180,42 @@ class EnhancedDataProcessor:
         for zone in zone_results:
             all_candidates.extend(zone['potential_sites'])
         
-        # Sort by archaeological probability and analyze top candidates
-        top_candidates = sorted(
-            all_candidates, 
-            key=lambda x: x.get('confidence', 0), 
-            reverse=True
-        )[:15]  # Analyze top 15 candidates
+        # Rank by archaeological probability and analyze top candidates
+        top_candidates = heapq.nlargest(
+            15,  # Analyze top 15 candidates
+            all_candidates,
+            key=lambda x: x.get('confidence', 0)
+        )
+        
+        # Extract features for every candidate, then score them in one pass
+        features_arr = self.extract_features_batch(region_data, top_candidates)
+        confidences, tiers = score_sites(features_arr)
+        
+        # Only confirmed candidates get a bounding box and site renders, requested together
+        confirmed = np.flatnonzero(confidences > 0.7)
+        centers = np.array([c['center'] for c in top_candidates], dtype=np.float64).reshape(-1, 2)
+        bboxes = dict(zip(confirmed.tolist(), self._bulk_bboxes(
+            centers[confirmed], features_arr['estimated_radius_m'][confirmed]
+        )))
+        site_images = dict(zip(confirmed.tolist(), self.create_site_images_batch(
+            region_data, [top_candidates[i] for i in confirmed]
+        )))
         
         site_results = []
-        for candidate in top_candidates:
-            site_result = self.analyze_site_scale(region_data, candidate)
+        for i, candidate in enumerate(top_candidates):
+            site_result = self.analyze_site_scale(
+                region_data, candidate,
+                features=self.feature_dict(features_arr[i]),
+                scored=(float(confidences[i]), SITE_TIERS[tiers[i]]),
+                bbox_wkt=bboxes.get(i),
+                site_images=site_images.get(i, {})
+            )
             if site_result and site_result.get('confirmed', False):
                 site_results.append(site_result)
         
         results['scales']['sites'] = site_results
         results['discovery_candidates'] = site_results
+        self._release_mosaic_pixels(region_id)
         
         print(f"\n📊 Multi-scale analysis complete:")
         print(f"   🌍 Regional hotspots: {len(regional_results.get('hotspots', []))}")
@@ -158,12 +267,7 @@ class EnhancedDataProcessor:
         zone_images = self.create_zone_images(region_data, zone)
         
         # Detect archaeological features at zone scale
-        detections = {
-            'concentric_rings': self.detect_concentric_features(region_data, zone),
-            'raised_platforms': self.detect_elevated_areas(region_data, zone),
-            'geometric_patterns': self.detect_geometric_shapes(region_data, zone),
-            'vegetation_anomalies': self.detect_vegetation_patterns(region_data, zone)
-        }
+        detections = self._scan_zone(region_data, zone)
         
         # Integrate multiple detection methods
         potential_sites = self.integrate_zone_detections(detections, zone)
@@ -181,29 +285,41 @@ class EnhancedDataProcessor:
         print(f"     ✅ Zone {zone_id}: {len(potential_sites)} potential sites")
         return results if potential_sites else None
     
-    def analyze_site_scale(self, region_data: Dict, candidate: Dict) -> Dict:
+    def analyze_site_scale(self, region_data: Dict, candidate: Dict, features: Optional[Dict] = None,
+                           scored: Optional[Tuple[float, str]] = None, bbox_wkt: Optional[str] = None,
+                           site_images: Optional[Dict] = None) -> Dict:
         """
         Tier 3: Detailed site confirmation and mapping
         2km scale at 1024x1024 resolution (1.95m per pixel)
+        features, scored (confidence, tier), bbox_wkt and site_images may be precomputed for a batch of candidates
         """
         site_center = candidate['center']
         
         print(f"   🎯 Confirming site at {site_center}")
         
-        # Create high-resolution site images
-        site_images = self.create_site_images(region_data, candidate)
-        
         # Extract detailed archaeological features
-        features = self.extract_site_features(region_data, candidate)
+        if features is None:
+            features = self.extract_site_features(region_data, candidate)
         
-        # Calculate confidence based on multiple factors
-        confidence = self.calculate_site_confidence(features)
+        if scored is not None:
+            confidence, site_tier = scored
+        else:
+            # Calculate confidence based on multiple factors
+            confidence = self.calculate_site_confidence(features)
+            
+            # Classify site tier (Primary/Secondary/Tertiary)
+            site_tier = self.classify_site_tier(features)
+        
+        # Images and bounding box are only worth producing for confirmed sites
+        confirmed = confidence > 0.7
         
-        # Classify site tier (Primary/Secondary/Tertiary)
-        site_tier = self.classify_site_tier(features)
+        # Create high-resolution site images
+        if site_images is None:
+            site_images = self.create_site_images(region_data, candidate) if confirmed else {}
         
         # Create precise bounding box
-        bbox_wkt = self.create_precise_bbox(features, site_center)
+        if bbox_wkt is None and confirmed:
+            bbox_wkt = self.create_precise_bbox(features, site_center)
         
         results = {
             'site_id': f"site_{candidate.get('zone_id', 'unknown')}_{candidate.get('id', '001')}",
@@ -216,11 +332,11 @@ class EnhancedDataProcessor:
             'site_tier': site_tier,
             'bbox_wkt': bbox_wkt,
             'radius_m': features.get('estimated_radius_m', 100),
-            'confirmed': confidence > 0.7,
+            'confirmed': confirmed,
             'analysis_resolution_m': 1.95
         }
         
-        if confidence > 0.7:
+        if confirmed:
             print(f"     ✅ Site confirmed: {site_tier} (confidence: {confidence:.2f})")
         else:
             print(f"     ⚠️ Site uncertain: confidence {confidence:.2f}")
@@ -229,201 +345,414 @@ class EnhancedDataProcessor:
     
     def create_regional_images(self, region_data: Dict) -> Dict:
         """Create regional overview images for network detection"""
+        ee = get_ee()
         region_id = region_data['region_id']
         regional_area = region_data['regional_area']
         
-        images_created = {}
-        
         # Archaeological probability heatmap with dynamic range
         arch_index = region_data['data_sources']['archaeological_index']
-        
-        # Calculate proper min/max values for archaeological index
-        try:
-            stats = arch_index.reduceRegion(
-                reducer=ee.Reducer.minMax(),
-                geometry=regional_area,
-                scale=100,  # Coarser scale for regional
-                maxPixels=1e9
-            ).getInfo()
-            
-            arch_min = stats.get('archaeological_index_min', 0)
-            arch_max = stats.get('archaeological_index_max', 1)
-            
-            # Handle invalid ranges
-            if arch_min is None or arch_max is None or arch_min == arch_max:
-                arch_min, arch_max = 0, 0.5
-            
-            # Use 95th percentile if values are extreme
-            if arch_max > 3:
-                arch_max = arch_max * 0.8  # Reduce max for better contrast
+        arch_vis = self.VIS_TEMPLATES['regional_archaeological']
+        
+        def arch_url():
+            # Calculate proper min/max values for archaeological index
+            try:
+                stats = arch_index.reduceRegion(
+                    reducer=ee.Reducer.minMax(),
+                    geometry=regional_area,
+                    scale=100,  # Coarser scale for regional
+                    maxPixels=1e9
+                ).getInfo()
                 
-        except Exception as e:
-            print(f"   ⚠️ Using default archaeological index range: {e}")
-            arch_min, arch_max = 0, 0.3
-        
-        arch_url = arch_index.getThumbURL({
-            'region': regional_area,
-            'dimensions': 512,
-            'format': 'png',
-            'min': arch_min,
-            'max': arch_max,
-            'palette': ['000033', '000066', '003366', '006666', '336666', 
-                       '666633', '996633', 'CC6633', 'FF6633', 'FF3300']
-        })
-        
-        arch_file = self.download_image(
-            arch_url, 
-            f"{self.output_folder}/regional/{region_id}_archaeological_heatmap.png"
-        )
-        images_created['archaeological_heatmap'] = arch_file
-        
-        print(f"   📊 Regional archaeological range: {arch_min:.3f} to {arch_max:.3f}")
+                arch_min = stats.get('archaeological_index_min', 0)
+                arch_max = stats.get('archaeological_index_max', 1)
+                
+                # Handle invalid ranges
+                if arch_min is None or arch_max is None or arch_min == arch_max:
+                    arch_min, arch_max = 0, 0.5
+                
+                # Use 95th percentile if values are extreme
+                if arch_max > 3:
+                    arch_max = arch_max * 0.8  # Reduce max for better contrast
+                    
+            except Exception as e:
+                print(f"   ⚠️ Using default archaeological index range: {e}")
+                arch_min, arch_max = 0, 0.3
+            
+            print(f"   📊 Regional archaeological range: {arch_min:.3f} to {arch_max:.3f}")
+            return arch_index.getThumbURL({'region': regional_area, 'min': arch_min, 'max': arch_max, **arch_vis})
         
         # Multi-source composite
         optical = region_data['data_sources']['optical']
-        composite_url = optical.select(['B4', 'B3', 'B2']).getThumbURL({
-            'region': regional_area,
-            'dimensions': 512,
-            'format': 'png',
-            'min': 0,
-            'max': 3000
+        composite_vis = self.VIS_TEMPLATES['regional_optical']
+        
+        def composite_url():
+            return optical.select(['B4', 'B3', 'B2']).getThumbURL({'region': regional_area, **composite_vis})
+        
+        return self.download_images({
+            'archaeological_heatmap': (
+                arch_url,
+                f"{self.output_folder}/regional/{region_id}_archaeological_heatmap.png",
+                self._thumb_key(region_id, 'regional_archaeological', regional_area, 'stats100')
+            ),
+            'optical_composite': (
+                composite_url,
+                f"{self.output_folder}/regional/{region_id}_optical_composite.png",
+                self._thumb_key(region_id, 'regional_optical', regional_area)
+            )
         })
-        
-        composite_file = self.download_image(
-            composite_url,
-            f"{self.output_folder}/regional/{region_id}_optical_composite.png"
-        )
-        images_created['optical_composite'] = composite_file
-        
-        return images_created
     
     def create_zone_images(self, region_data: Dict, zone: Dict) -> Dict:
-        """Create zone-level images for site detection"""
-        region_id = region_data['region_id']
-        zone_id = zone['id']
-        zone_geometry = zone['geometry']
+        """
+        Create zone-level images for site detection
+        Zones on a hotspot grid are cut from the hotspot mosaic; others are rendered directly
+        """
+        if 'grid_index' in zone:
+            mosaic = self._hotspot_mosaic(region_data, zone)
+            if all(mosaic.values()):
+                return self._crop_zone_images(region_data, zone, mosaic)
         
-        images_created = {}
+        region_id = region_data['region_id']
+        lat, lng = zone['center']
+        step = self.ZONE_SPACING
+        return self.download_images(self._zone_render_jobs(
+            region_data, zone['geometry'], (lng - step, lat - step, lng + step, lat + step),
+            1024, f"{self.output_folder}/zone/{region_id}_{zone['id']}"
+        ), fetch=self.fetch_tiled)
+    
+    def _zone_render_jobs(self, region_data: Dict, geometry, bounds: Tuple[float, float, float, float],
+                          dimensions: int, file_prefix: str, stats: Optional[Dict] = None,
+                          pixels: Optional[Dict] = None) -> Dict:
+        """
+        Tile jobs for the optical, radar and archaeological zone-scale renders of an area
+        bounds is (west, south, east, north) of geometry in degrees
+        stats holds precomputed archaeological index min/max; fetched per area when omitted
+        pixels, if given, receives the assembled arrays keyed by filepath
+        """
+        ee = get_ee()
+        region_id = region_data['region_id']
         
         # High-resolution optical
         optical = region_data['data_sources']['optical']
-        optical_url = optical.select(['B4', 'B3', 'B2']).getThumbURL({
-            'region': zone_geometry,
-            'dimensions': 1024,
-            'format': 'png',
-            'min': 0,
-            'max': 3000
-        })
+        optical_vis = self.VIS_TEMPLATES['zone_optical']
         
-        optical_file = self.download_image(
-            optical_url,
-            f"{self.output_folder}/zone/{region_id}_{zone_id}_optical.png"
-        )
-        images_created['optical'] = optical_file
+        def optical_map():
+            return self._map_id((region_id, 'optical'),
+                                lambda: optical.select(['B4', 'B3', 'B2']).getMapId(optical_vis))
         
         # Radar image
         radar = region_data['data_sources']['radar']
-        if radar.bandNames().contains('HH').getInfo():
-            radar_band = 'HH'
-        else:
-            radar_band = 'VV'
-            
-        radar_url = radar.select(radar_band).getThumbURL({
-            'region': zone_geometry,
-            'dimensions': 1024,
-            'format': 'png',
-            'min': -20,
-            'max': 0
-        })
+        radar_vis = self.VIS_TEMPLATES['zone_radar']
         
-        radar_file = self.download_image(
-            radar_url,
-            f"{self.output_folder}/zone/{region_id}_{zone_id}_radar.png"
-        )
-        images_created['radar'] = radar_file
+        def radar_map():
+            return self._map_id((region_id, 'radar'),
+                                lambda: radar.select(self._radar_band(region_data)).getMapId(radar_vis))
         
         # Archaeological index with corrected visualization
         arch_index = region_data['data_sources']['archaeological_index']
         
-        # Calculate proper min/max values for better visualization
-        try:
-            # Get actual statistics of the archaeological index
-            stats = arch_index.reduceRegion(
-                reducer=ee.Reducer.minMax(),
-                geometry=zone_geometry,
-                scale=30,
-                maxPixels=1e9
-            ).getInfo()
-            
-            # Use actual data range or fallback to defaults
-            arch_min = stats.get('archaeological_index_min', 0)
-            arch_max = stats.get('archaeological_index_max', 1)
+        def arch_map():
+            # Calculate proper min/max values for better visualization
+            try:
+                # Get actual statistics of the archaeological index
+                area_stats = stats
+                if area_stats is None:
+                    area_stats = arch_index.reduceRegion(
+                        reducer=ee.Reducer.minMax(),
+                        geometry=geometry,
+                        scale=30,
+                        maxPixels=1e9
+                    ).getInfo()
+                
+                # Use actual data range or fallback to defaults
+                arch_min = area_stats.get('archaeological_index_min', 0)
+                arch_max = area_stats.get('archaeological_index_max', 1)
+                
+                # Ensure valid range
+                if arch_min is None or arch_max is None or arch_min == arch_max:
+                    arch_min, arch_max = 0, 1
+                
+                # Normalize the range for better visualization
+                if arch_max > 2:  # If values are too high, normalize
+                    arch_max = np.percentile([arch_min, arch_max], 95)  # Use 95th percentile
             
-            # Ensure valid range
-            if arch_min is None or arch_max is None or arch_min == arch_max:
-                arch_min, arch_max = 0, 1
+            except Exception as e:
+                print(f"   ⚠️ Failed to get archaeological index stats: {e}")
+                arch_min, arch_max = 0, 0.5  # Conservative fallback
             
-            # Normalize the range for better visualization
-            if arch_max > 2:  # If values are too high, normalize
-                arch_max = np.percentile([arch_min, arch_max], 95)  # Use 95th percentile
+            print(f"   📊 Archaeological index range: {arch_min:.3f} to {arch_max:.3f}")
+            arch_vis = {'min': float(arch_min), 'max': float(arch_max), **self.VIS_TEMPLATES['zone_archaeological']}
+            # Areas with the same stretch share one map id and its tiles
+            return self._map_id((region_id, 'archaeological', arch_vis['min'], arch_vis['max']),
+                                lambda: arch_index.getMapId(arch_vis))
+        
+        # All three layers are assembled together
+        variant = f"{dimensions}px_tiles"
+        return {
+            'optical': (
+                (optical_map, bounds, dimensions),
+                f"{file_prefix}_optical.png",
+                self._thumb_key(region_id, 'zone_optical', geometry, variant),
+                pixels
+            ),
+            'radar': (
+                (radar_map, bounds, dimensions),
+                f"{file_prefix}_radar.png",
+                self._thumb_key(region_id, 'zone_radar', geometry, variant),
+                pixels
+            ),
+            'archaeological': (
+                (arch_map, bounds, dimensions),
+                f"{file_prefix}_archaeological.png",
+                self._thumb_key(region_id, 'zone_archaeological', geometry, f"{variant}_stats30"),
+                pixels
+            )
+        }
+    
+    def _hotspot_mosaic(self, region_data: Dict, zone: Dict) -> Dict:
+        """
+        Zone-resolution renders covering a hotspot's whole 3x3 zone grid
+        Rendered once per hotspot at twice the zone size, since the grid spans two zone widths
+        """
+        region_id = region_data['region_id']
+        hotspot_id = zone['parent_hotspot']
+        key = (region_id, hotspot_id)
+        
+        # Only the thread processing this region uses its keys, so the lock just guards the dict
+        with self._mosaic_lock:
+            mosaic = self._mosaics.get(key)
+        if mosaic is None:
+            geometry = self._hotspot_geometry(region_data, zone['hotspot_center'])
+            lat, lng = zone['hotspot_center']
+            span = 2 * self.ZONE_SPACING
+            mosaic_dir = os.path.join(self.output_folder, 'zone', 'mosaic')
+            os.makedirs(mosaic_dir, exist_ok=True)
+            print(f"   🧩 Rendering zone mosaic for {hotspot_id}")
+            pixels = {}
+            mosaic = self.download_images(self._zone_render_jobs(
+                region_data, geometry, (lng - span, lat - span, lng + span, lat + span),
+                2048, os.path.join(mosaic_dir, f"{region_id}_{hotspot_id}"),
+                stats=zone.get('hotspot_stats'), pixels=pixels
+            ), fetch=self.fetch_tiled)
+            with self._mosaic_lock:
+                self._mosaics[key] = mosaic
+                # Zones are cut from these arrays; cached renders are decoded once on first use
+                self._mosaic_pixels[key] = {
+                    layer: pixels.get(path) for layer, path in mosaic.items() if path
+                }
+        return mosaic
+    
+    def _release_mosaic_pixels(self, region_id: str) -> None:
+        """Drop a region's in-memory mosaic arrays once its zones are cut"""
+        with self._mosaic_lock:
+            for key in [k for k in self._mosaic_pixels if k[0] == region_id]:
+                del self._mosaic_pixels[key]
+    
+    def _radar_band(self, region_data: Dict) -> str:
+        """Radar polarisation to render ('HH' when available, else 'VV'), looked up once per region"""
+        if 'radar_band' not in region_data:
+            bands = region_data['data_sources']['radar'].bandNames().getInfo()
+            region_data['radar_band'] = 'HH' if 'HH' in bands else 'VV'
+        return region_data['radar_band']
+    
+    def _hotspot_geometry(self, region_data: Dict, hotspot_center: List[float]):
+        """Rectangle covering a hotspot's whole 3x3 zone grid"""
+        lat, lng = hotspot_center
+        span = 2 * self.ZONE_SPACING
+        return get_ee().Geometry.Rectangle([
+            lng - span, lat - span,
+            lng + span, lat + span
+        ])
+    
+    def _attach_hotspot_stats(self, region_data: Dict, zones: List[Dict]) -> None:
+        """
+        Fetch archaeological index min/max for every hotspot grid in one request
+        Each zone gets its hotspot's stats as 'hotspot_stats'; on failure stats are fetched per mosaic
+        """
+        ee = get_ee()
+        hotspots = {}
+        for zone in zones:
+            if 'grid_index' in zone:
+                hotspots.setdefault(zone['parent_hotspot'], zone['hotspot_center'])
+        if not hotspots:
+            return
         
+        try:
+            collection = ee.FeatureCollection([
+                ee.Feature(self._hotspot_geometry(region_data, center), {'hotspot_id': hotspot_id})
+                for hotspot_id, center in hotspots.items()
+            ])
+            reduced = region_data['data_sources']['archaeological_index'].reduceRegions(
+                collection=collection,
+                reducer=ee.Reducer.minMax(),
+                scale=30
+            ).getInfo()
         except Exception as e:
-            print(f"   ⚠️ Failed to get archaeological index stats: {e}")
-            arch_min, arch_max = 0, 0.5  # Conservative fallback
-        
-        # Use a more balanced color palette (blue-green-yellow-red)
-        arch_url = arch_index.getThumbURL({
-            'region': zone_geometry,
-            'dimensions': 1024,
-            'format': 'png',
-            'min': arch_min,
-            'max': arch_max,
-            'palette': ['000066', '0066CC', '00CC66', 'CCCC00', 'CC6600', 'CC0000']
-        })
-        
-        arch_file = self.download_image(
-            arch_url,
-            f"{self.output_folder}/zone/{region_id}_{zone_id}_archaeological.png"
-        )
-        images_created['archaeological'] = arch_file
+            print(f"   ⚠️ Batched archaeological index stats failed: {e}")
+            return
+        
+        stats = {}
+        for feature in reduced.get('features', []):
+            props = feature.get('properties', {})
+            # Single-band reductions name outputs without the band prefix
+            stats[props.get('hotspot_id')] = {
+                'archaeological_index_min': props.get('archaeological_index_min', props.get('min')),
+                'archaeological_index_max': props.get('archaeological_index_max', props.get('max'))
+            }
+        for zone in zones:
+            if zone.get('parent_hotspot') in stats:
+                zone['hotspot_stats'] = stats[zone['parent_hotspot']]
+    
+    def _crop_zone_images(self, region_data: Dict, zone: Dict, mosaic: Dict) -> Dict:
+        """Cut a zone's images out of its hotspot mosaic"""
+        from PIL import Image
         
-        print(f"   📊 Archaeological index range: {arch_min:.3f} to {arch_max:.3f}")
+        region_id = region_data['region_id']
+        i, j = zone['grid_index']
+        key = (region_id, zone['parent_hotspot'])
+        with self._mosaic_lock:
+            arrays = self._mosaic_pixels.setdefault(key, {})
         
+        images_created = {}
+        for layer, mosaic_file in mosaic.items():
+            pixels = arrays.get(layer)
+            if pixels is None:
+                with Image.open(mosaic_file) as img:
+                    pixels = arrays[layer] = self._as_pixels(img)
+            height, width = pixels.shape[:2]
+            # The mosaic spans four grid steps; each zone covers two of them
+            top, bottom = round((2 - i) * height / 4), round((4 - i) * height / 4)
+            left, right = round(j * width / 4), round((j + 2) * width / 4)
+            filepath = f"{self.output_folder}/zone/{region_id}_{zone['id']}_{layer}.png"
+            with self._replacing(filepath) as tmp:
+                Image.fromarray(pixels[top:bottom, left:right]).save(tmp)
+            images_created[layer] = filepath
         return images_created
     
     def create_site_images(self, region_data: Dict, candidate: Dict) -> Dict:
         """Create high-resolution site images for detailed analysis"""
+        return self.create_site_images_batch(region_data, [candidate])[0]
+    
+    def create_site_images_batch(self, region_data: Dict, candidates: List[Dict]) -> List[Dict]:
+        """Create site images for several candidates, rendering and downloading them concurrently"""
         region_id = region_data['region_id']
-        site_center = candidate['center']
-        
-        # Create 2km x 2km area around site center
-        lat, lng = site_center
-        site_buffer = 0.009  # ~1km radius
-        site_geometry = region_data['regional_area'].__class__.Rectangle([
-            lng - site_buffer, lat - site_buffer,
-            lng + site_buffer, lat + site_buffer
-        ])
-        
-        images_created = {}
         
         # Ultra high-resolution optical
-        optical = region_data['data_sources']['optical']
-        optical_url = optical.select(['B4', 'B3', 'B2']).getThumbURL({
-            'region': site_geometry,
-            'dimensions': 1024,
-            'format': 'png',
-            'min': 0,
-            'max': 3000
+        optical = region_data['data_sources']['optical'].select(['B4', 'B3', 'B2'])
+        optical_vis = self.VIS_TEMPLATES['site_optical']
+        
+        jobs = {}
+        for index, candidate in enumerate(candidates):
+            # Create 2km x 2km area around site center
+            lat, lng = candidate['center']
+            site_buffer = 0.009  # ~1km radius
+            site_geometry = get_ee().Geometry.Rectangle([
+                lng - site_buffer, lat - site_buffer,
+                lng + site_buffer, lat + site_buffer
+            ])
+            
+            # Candidate ids restart in every zone, so the zone keeps file names unique within a region
+            site_id = f"{candidate.get('zone_id', 'unknown')}_{candidate.get('id', 'unknown')}"
+            jobs[index] = (
+                lambda geometry=site_geometry: optical.getThumbURL({'region': geometry, **optical_vis}),
+                f"{self.output_folder}/site/{region_id}_site_{site_id}_optical.png",
+                self._thumb_key(region_id, 'site_optical', site_geometry),
+                site_geometry
+            )
+        
+        exported = {}
+        if self.export_bucket:
+            pending = {index: job for index, job in jobs.items() if not self._cached(job[2])}
+            exported = self._export_renders(
+                optical.visualize(min=optical_vis['min'], max=optical_vis['max']), pending, optical_vis['dimensions']
+            )
+        
+        # Cache hits, and anything the export did not deliver, go through thumbnails
+        downloaded = self.download_images({
+            index: job[:3] for index, job in jobs.items() if not exported.get(index)
         })
+        downloaded.update(exported)
+        return [{'optical': downloaded[index]} for index in range(len(candidates))]
+    
+    def _export_renders(self, image, jobs: Dict, dimensions: int) -> Dict:
+        """
+        Render several areas of an 8-bit visualised image as Earth Engine export tasks
+        jobs maps key -> (url, filepath, cache_key, geometry); returns key -> filepath for finished renders
+        All tasks are started before any is awaited, so Earth Engine runs them side by side
+        """
+        if not jobs:
+            return {}
+        ee = get_ee()
+        from PIL import Image
         
-        site_id = candidate.get('id', 'unknown')
-        optical_file = self.download_image(
-            optical_url,
-            f"{self.output_folder}/site/{region_id}_site_{site_id}_optical.png"
-        )
-        images_created['optical'] = optical_file
+        # Without a working Cloud Storage client no export can be fetched, so every job uses thumbnails
+        try:
+            bucket = gcs.Client().bucket(self.export_bucket)
+        except Exception as e:
+            print(f"   ⚠️ Cloud Storage unavailable, rendering sites as thumbnails: {e}")
+            return {}
         
-        return images_created
+        tasks = {}
+        for key, (_, filepath, cache_key, geometry) in jobs.items():
+            name = os.path.splitext(os.path.basename(filepath))[0]
+            task = ee.batch.Export.image.toCloudStorage(
+                image=image,
+                description=name[:100],
+                bucket=self.export_bucket,
+                fileNamePrefix=f"site_renders/{name}",
+                region=geometry,
+                dimensions=dimensions,
+                fileFormat='GeoTIFF'
+            )
+            task.start()
+            tasks[key] = task
+        print(f"   📤 Started {len(tasks)} site export tasks")
+        
+        # Wait for every task to reach a final state, keeping each task's last status
+        statuses = {}
+        running = dict(tasks)
+        deadline = time.monotonic() + self.EXPORT_TIMEOUT
+        while running and time.monotonic() < deadline:
+            time.sleep(self.EXPORT_POLL_INTERVAL)
+            for key, task in list(running.items()):
+                statuses[key] = task.status()
+                if statuses[key].get('state') in ('COMPLETED', 'FAILED', 'CANCELLED'):
+                    del running[key]
+        
+        # Tasks still queued or running past the deadline are cancelled; their jobs use thumbnails
+        if running:
+            print(f"   ⚠️ {len(running)} site export tasks timed out after {self.EXPORT_TIMEOUT}s, cancelling")
+            for key, task in running.items():
+                try:
+                    task.cancel()
+                except Exception as e:
+                    print(f"   ⚠️ Could not cancel export {os.path.basename(jobs[key][1])}: {e}")
+                statuses[key] = {'state': 'TIMED_OUT'}
+        
+        results = {}
+        for key in tasks:
+            _, filepath, cache_key, _ = jobs[key]
+            status = statuses[key]
+            if status.get('state') != 'COMPLETED':
+                print(f"   ⚠️ Export of {os.path.basename(filepath)} failed: {status.get('error_message', status.get('state'))}")
+                continue
+            try:
+                tif_path = os.path.splitext(filepath)[0] + '.tif'
+                name = os.path.splitext(os.path.basename(filepath))[0]
+                bucket.blob(f"site_renders/{name}.tif").download_to_filename(tif_path)
+                with Image.open(tif_path) as img, self._replacing(filepath) as tmp:
+                    img.convert('RGB').save(tmp)
+                os.remove(tif_path)
+            except Exception as e:
+                print(f"   ⚠️ Failed to fetch export {os.path.basename(filepath)}: {e}")
+                continue
+            self._fetch_cached(lambda path: path, filepath, cache_key)
+            results[key] = filepath
+        return results
+    
+    def _cached(self, cache_key: Optional[str]) -> bool:
+        """Whether a render is already in the thumbnail cache"""
+        return bool(self.thumb_cache_dir and cache_key
+                    and os.path.exists(os.path.join(self.thumb_cache_dir, f"{cache_key}.png")))
     
     def detect_settlement_hotspots(self, region_data: Dict) -> List[Dict]:
         """Detect settlement clusters at regional scale"""
@@ -435,16 +764,16 @@ class EnhancedDataProcessor:
         center_lat, center_lng = region_data['region_info']['center']
         
         # Generate potential hotspot locations
-        import random
-        for i in range(3):  # Find up to 3 hotspots per region
-            hotspot_lat = center_lat + random.uniform(-0.15, 0.15)
-            hotspot_lng = center_lng + random.uniform(-0.15, 0.15)
+        draws = self._rng.random((3, 4))
+        for i, u in enumerate(draws.tolist()):  # Find up to 3 hotspots per region
+            hotspot_lat = center_lat - 0.15 + u[0] * 0.3
+            hotspot_lng = center_lng - 0.15 + u[1] * 0.3
             
             hotspots.append({
                 'id': f'hotspot_{i+1}',
                 'center': [hotspot_lat, hotspot_lng],
-                'confidence': random.uniform(0.6, 0.9),
-                'estimated_sites': random.randint(2, 5)
+                'confidence': 0.6 + u[2] * 0.3,
+                'estimated_sites': 2 + int(u[3] * 4)
             })
         
         return hotspots
@@ -461,8 +790,12 @@ class EnhancedDataProcessor:
             }
         ]
     
-    def identify_priority_zones(self, region_data: Dict, regional_results: Dict) -> List[Dict]:
-        """Identify high-priority zones for detailed analysis"""
+    def identify_priority_zones(self, region_data: Dict, regional_results: Dict,
+                                limit: Optional[int] = None) -> List[Dict]:
+        """
+        Identify high-priority zones for detailed analysis
+        limit keeps only that many of the highest-priority zones
+        """
         priority_zones = []
         
         # Create zones around detected hotspots
@@ -470,84 +803,118 @@ class EnhancedDataProcessor:
             lat, lng = hotspot['center']
             
             # Create 3x3 grid around each hotspot
+            step = self.ZONE_SPACING
             for i in range(3):
                 for j in range(3):
-                    zone_lat = lat + (i - 1) * 0.042  # ~4.6km spacing
-                    zone_lng = lng + (j - 1) * 0.042
+                    zone_lat = lat + (i - 1) * step
+                    zone_lng = lng + (j - 1) * step
                     
                     zone = {
                         'id': f"{hotspot['id']}_zone_{i}_{j}",
                         'center': [zone_lat, zone_lng],
-                        'geometry': region_data['regional_area'].__class__.Rectangle([
-                            zone_lng - 0.042, zone_lat - 0.042,
-                            zone_lng + 0.042, zone_lat + 0.042
+                        'geometry': get_ee().Geometry.Rectangle([
+                            zone_lng - step, zone_lat - step,
+                            zone_lng + step, zone_lat + step
                         ]),
                         'priority': hotspot['confidence'],
-                        'parent_hotspot': hotspot['id']
+                        'parent_hotspot': hotspot['id'],
+                        # Position in the hotspot grid, used to cut the zone from the hotspot mosaic
+                        'hotspot_center': [lat, lng],
+                        'grid_index': (i, j)
                     }
                     priority_zones.append(zone)
         
-        # Sort by priority
-        return sorted(priority_zones, key=lambda x: x['priority'], reverse=True)
+        # Overlapping hotspot grids: keep the highest-priority zone per snapped grid cell
+        unique_zones = {}
+        for zone in priority_zones:
+            zone_lat, zone_lng = zone['center']
+            key = (round(zone_lat / self.ZONE_SPACING), round(zone_lng / self.ZONE_SPACING))
+            kept = unique_zones.get(key)
+            if kept is None or zone['priority'] > kept['priority']:
+                unique_zones[key] = zone
+        
+        # Order by priority, selecting only the top zones when a limit is given
+        priority = lambda x: x['priority']
+        if limit is not None:
+            return heapq.nlargest(limit, unique_zones.values(), key=priority)
+        return sorted(unique_zones.values(), key=priority, reverse=True)
     
-    def detect_concentric_features(self, region_data: Dict, zone: Dict) -> List[Dict]:
+    def _scan_zone(self, region_data: Dict, zone: Dict) -> Dict[str, List[Dict]]:
+        """
+        Run all zone-scale detectors in one pass over the zone's shared input
+        The simulated detectors share one draw: a row of uniforms for each detector
+        """
+        draws = self._rng.random((4, 5))
+        return {
+            'concentric_rings': self.detect_concentric_features(region_data, zone, draws[0]),
+            'raised_platforms': self.detect_elevated_areas(region_data, zone, draws[1]),
+            'geometric_patterns': self.detect_geometric_shapes(region_data, zone, draws[2]),
+            'vegetation_anomalies': self.detect_vegetation_patterns(region_data, zone, draws[3])
+        }
+    
+    def detect_concentric_features(self, region_data: Dict, zone: Dict,
+                                   draws: Optional[np.ndarray] = None) -> List[Dict]:
         """Detect concentric rings characteristic of defensive earthworks"""
         # Simplified implementation - would use circular Hough transforms
-        import random
+        u = self._rng.random(4) if draws is None else draws
         
         detections = []
-        if random.random() > 0.7:  # 30% chance of detection
+        if u[0] > 0.7:  # 30% chance of detection
             detections.append({
                 'center': zone['center'],
-                'radius_m': random.randint(80, 200),
-                'confidence': random.uniform(0.6, 0.9),
-                'ring_count': random.randint(1, 3)
+                'radius_m': 80 + int(u[1] * 121),
+                'confidence': 0.6 + float(u[2]) * 0.3,
+                'ring_count': 1 + int(u[3] * 3)
             })
         
         return detections
     
-    def detect_elevated_areas(self, region_data: Dict, zone: Dict) -> List[Dict]:
+    def detect_elevated_areas(self, region_data: Dict, zone: Dict,
+                              draws: Optional[np.ndarray] = None) -> List[Dict]:
         """Detect raised platforms and mounds"""
         # Simplified implementation
-        import random
+        u = self._rng.random(3) if draws is None else draws
         
         detections = []
-        if random.random() > 0.6:  # 40% chance
+        if u[0] > 0.6:  # 40% chance
             detections.append({
                 'center': zone['center'],
-                'area_ha': random.randint(5, 50),
-                'confidence': random.uniform(0.5, 0.8)
+                'area_ha': 5 + int(u[1] * 46),
+                'confidence': 0.5 + float(u[2]) * 0.3
             })
         
         return detections
     
-    def detect_geometric_shapes(self, region_data: Dict, zone: Dict) -> List[Dict]:
+    def detect_geometric_shapes(self, region_data: Dict, zone: Dict,
+                                draws: Optional[np.ndarray] = None) -> List[Dict]:
         """Detect geometric patterns too regular to be natural"""
         # Simplified implementation
-        import random
+        u = self._rng.random(4) if draws is None else draws
+        shapes = ['circular', 'rectangular', 'polygonal']
         
         detections = []
-        if random.random() > 0.8:  # 20% chance
+        if u[0] > 0.8:  # 20% chance
             detections.append({
-                'shape': random.choice(['circular', 'rectangular', 'polygonal']),
+                'shape': shapes[int(u[1] * len(shapes))],
                 'center': zone['center'],
-                'size_m': random.randint(50, 150),
-                'confidence': random.uniform(0.4, 0.7)
+                'size_m': 50 + int(u[2] * 101),
+                'confidence': 0.4 + float(u[3]) * 0.3
             })
         
         return detections
     
-    def detect_vegetation_patterns(self, region_data: Dict, zone: Dict) -> List[Dict]:
+    def detect_vegetation_patterns(self, region_data: Dict, zone: Dict,
+                                   draws: Optional[np.ndarray] = None) -> List[Dict]:
         """Detect vegetation anomalies indicating buried structures"""
         # Simplified implementation
-        import random
+        u = self._rng.random(2) if draws is None else draws
         
         detections = []
-        if random.random() > 0.5:  # 50% chance
+        if u[0] > 0.5:  # 50% chance
             detections.append({
                 'pattern': 'vegetation_stress',
                 'center': zone['center'],
-                'confidence': random.uniform(0.3, 0.6)
+                'confidence': 0.3 + float(u[1]) * 0.3
             })
         
         return detections
@@ -576,100 +943,79 @@ class EnhancedDataProcessor:
         
         return candidates
     
-    def extract_site_features(self, region_data: Dict, candidate: Dict) -> Dict:
-        """Extract detailed features from high-resolution site analysis"""
+    def extract_features_batch(self, region_data: Dict, candidates: List[Dict]) -> np.ndarray:
+        """Extract site features for several candidates into one FEATURE_DTYPE array"""
         # Simplified feature extraction
-        import random
-        
-        features = {
-            'defensive_rings': random.randint(0, 3),
-            'central_platform': random.choice([True, False]),
-            'estimated_radius_m': random.randint(50, 200),
-            'area_hectares': random.randint(5, 150),
-            'geometric_regularity': random.uniform(0.4, 0.9),
-            'elevation_prominence': random.uniform(0.2, 0.8),
-            'vegetation_anomaly': random.uniform(0.3, 0.7),
-            'radar_signature': random.uniform(0.4, 0.8)
-        }
+        u = self._rng.random((len(candidates), 8))
+        
+        features = np.empty(len(candidates), dtype=FEATURE_DTYPE)
+        features['defensive_rings'] = u[:, 0] * 4
+        features['central_platform'] = u[:, 1] < 0.5
+        features['estimated_radius_m'] = 50 + u[:, 2] * 151
+        features['area_hectares'] = 5 + u[:, 3] * 146
+        features['geometric_regularity'] = 0.4 + u[:, 4] * 0.5
+        features['elevation_prominence'] = 0.2 + u[:, 5] * 0.6
+        features['vegetation_anomaly'] = 0.3 + u[:, 6] * 0.4
+        features['radar_signature'] = 0.4 + u[:, 7] * 0.4
         
         return features
     
+    def extract_site_features(self, region_data: Dict, candidate: Dict) -> Dict:
+        """Extract detailed features from high-resolution site analysis"""
+        return self.feature_dict(self.extract_features_batch(region_data, [candidate])[0])
+    
+    def feature_dict(self, record) -> Dict:
+        """Plain-Python dict of one FEATURE_DTYPE record"""
+        return {name: record[name].item() for name in FEATURE_DTYPE.names}
+    
+    def features_array(self, features_list: List[Dict]) -> np.ndarray:
+        """Pack site feature dicts into a FEATURE_DTYPE array"""
+        arr = np.empty(len(features_list), dtype=FEATURE_DTYPE)
+        for i, features in enumerate(features_list):
+            arr[i] = tuple(features[name] for name in FEATURE_DTYPE.names)
+        return arr
+    
     def calculate_site_confidence(self, features: Dict) -> float:
         """Calculate multi-factor confidence score"""
-        confidence_factors = []
-        
-        # Geometric regularity (higher = more likely human-made)
-        if features['geometric_regularity'] > 0.7:
-            confidence_factors.append(0.25)
-        elif features['geometric_regularity'] > 0.5:
-            confidence_factors.append(0.15)
-        
-        # Defensive features
-        rings = features['defensive_rings']
-        if rings >= 2:
-            confidence_factors.append(0.25)
-        elif rings == 1:
-            confidence_factors.append(0.15)
-        
-        # Size in known range
-        area = features['area_hectares']
-        if 20 <= area <= 400:  # Known Casarabe range
-            confidence_factors.append(0.2)
-        elif 5 <= area <= 20:
-            confidence_factors.append(0.1)
-        
-        # Multi-source visibility
-        if features['radar_signature'] > 0.6:
-            confidence_factors.append(0.15)
-        
-        # Elevation prominence
-        if features['elevation_prominence'] > 0.6:
-            confidence_factors.append(0.15)
-        
-        return min(sum(confidence_factors), 1.0)
+        return float(site_confidence(self.features_array([features])[0]))
     
     def classify_site_tier(self, features: Dict) -> str:
         """Classify site as Primary, Secondary, or Tertiary"""
-        area = features['area_hectares']
-        rings = features['defensive_rings']
-        
-        if area >= 100 and rings >= 2:
-            return "Primary"
-        elif area >= 20 and rings >= 1:
-            return "Secondary"
-        else:
-            return "Tertiary"
+        return SITE_TIERS[site_tier(self.features_array([features])[0])]
     
     def create_precise_bbox(self, features: Dict, site_center: List[float]) -> str:
         """Create precise WKT bounding box for the site"""
-        lat, lng = site_center
-        radius_m = features['estimated_radius_m']
+        return self._bulk_bboxes(np.array([site_center], dtype=np.float64),
+                                 np.array([features['estimated_radius_m']]))[0]
+    
+    def _bulk_bboxes(self, centers: np.ndarray, radii_m: np.ndarray) -> List[str]:
+        """WKT bounding boxes for (n, 2) lat/lng centers and n radii in meters"""
+        lat, lng = centers[:, 0], centers[:, 1]
         
         # Convert meters to degrees (approximate)
-        lat_deg_per_m = 1 / 111000
-        lng_deg_per_m = 1 / (111000 * abs(lat))
-        
-        radius_lat = radius_m * lat_deg_per_m
-        radius_lng = radius_m * lng_deg_per_m
-        
-        # Create bounding box
-        south = lat - radius_lat
-        north = lat + radius_lat
-        west = lng - radius_lng
-        east = lng + radius_lng
+        radius_lat = radii_m * (1 / 111000)
+        radius_lng = radii_m / (111000 * np.abs(lat))
         
-        bbox_wkt = f"POLYGON(({west} {south}, {east} {south}, {east} {north}, {west} {north}, {west} {south}))"
+        # Create bounding boxes
+        south = (lat - radius_lat).tolist()
+        north = (lat + radius_lat).tolist()
+        west = (lng - radius_lng).tolist()
+        east = (lng + radius_lng).tolist()
         
-        return bbox_wkt
+        return [
+            f"POLYGON(({w} {s}, {e} {s}, {e} {n}, {w} {n}, {w} {s}))"
+            for s, n, w, e in zip(south, north, west, east)
+        ]
     
     def download_image(self, url: str, filepath: str) -> str:
         """Download image from URL with error handling"""
         try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                f.write(response.content)
+            # Stream straight to disk rather than buffering the whole PNG
+            with self._session.get(url, timeout=60, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with self._replacing(filepath) as tmp, open(tmp, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, 1 << 16)
             
             return filepath
             
@@ -677,8 +1023,232 @@ class EnhancedDataProcessor:
             print(f"   ⚠️ Failed to download {os.path.basename(filepath)}: {e}")
             return None
     
-    def process_all_regions(self, loaded_data: Dict) -> Dict:
-        """Process all loaded regions with multi-scale analysis"""
+    def download_images(self, jobs: Dict[str, Tuple], fetch=None) -> Dict[str, str]:
+        """
+        Fetch several thumbnails concurrently
+        jobs maps key -> (url, filepath) or (url, filepath, cache_key)
+        fetch defaults to fetch_thumbnail; pass fetch_tiled for tile jobs
+        """
+        fetch = fetch or self.fetch_thumbnail
+        futures = {
+            key: self._executor('_download_pool', 16).submit(fetch, *job)
+            for key, job in jobs.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+    
+    def fetch_thumbnail(self, url, filepath: str, cache_key: Optional[str] = None) -> Optional[str]:
+        """
+        Place a thumbnail at filepath, from the cache when possible
+        url may be a callable so the render is only requested on a cache miss
+        """
+        def render(path):
+            # Rendering happens on Earth Engine, so limit how many run at once
+            with self._gee_slots:
+                return self.download_image(url() if callable(url) else url, path)
+        
+        return self._fetch_cached(render, filepath, cache_key)
+    
+    def fetch_tiled(self, source: Tuple, filepath: str, cache_key: Optional[str] = None,
+                    pixels: Optional[Dict] = None) -> Optional[str]:
+        """
+        Place a tile-assembled image at filepath, from the cache when possible
+        source is (map_id_factory, (west, south, east, north), dimensions)
+        pixels, if given, receives the freshly assembled array under filepath
+        """
+        map_id_factory, bounds, dimensions = source
+        
+        def render(path):
+            try:
+                return self._render_tiles(map_id_factory(), bounds, dimensions, path, pixels)
+            except Exception as e:
+                print(f"   ⚠️ Failed to assemble {os.path.basename(path)}: {e}")
+                return None
+        
+        return self._fetch_cached(render, filepath, cache_key)
+    
+    def _fetch_cached(self, render, filepath: str, cache_key: Optional[str]) -> Optional[str]:
+        """Copy a cached render to filepath, or call render(filepath) and cache the result"""
+        cache_path = os.path.join(self.thumb_cache_dir, f"{cache_key}.png") if self.thumb_cache_dir and cache_key else None
+        if cache_path and os.path.exists(cache_path):
+            self._link_or_copy(cache_path, filepath)
+            return filepath
+        
+        result = render(filepath)
+        if result and cache_path:
+            try:
+                self._link_or_copy(filepath, cache_path)
+            except OSError as e:
+                print(f"   ⚠️ Could not cache {os.path.basename(filepath)}: {e}")
+        return result
+    
+    def _map_id(self, key: Tuple, make) -> Dict:
+        """Map id for a visualised layer, requested from Earth Engine once per key"""
+        with self._map_id_lock:
+            map_id = self._map_ids.get(key)
+        if map_id is None:
+            with self._gee_slots:
+                map_id = make()
+            with self._map_id_lock:
+                map_id = self._map_ids.setdefault(key, map_id)
+        return map_id
+    
+    def _download_tile(self, url: str) -> bytes:
+        """Raw bytes of one map tile"""
+        response = self._session.get(url, timeout=60)
+        response.raise_for_status()
+        return response.content
+    
+    def _tile_bytes(self, url: str) -> bytes:
+        """Raw bytes of one map tile, from the byte-bounded LRU cache so shared tiles are fetched once"""
+        with self._tile_cache_lock:
+            data = self._tile_cache.get(url)
+            if data is not None:
+                self._tile_cache.move_to_end(url)
+                return data
+        
+        data = self._download_tile(url)
+        with self._tile_cache_lock:
+            if url not in self._tile_cache:
+                self._tile_cache[url] = data
+                self._tile_cache_size += len(data)
+                while self._tile_cache_size > self.TILE_CACHE_BYTES and len(self._tile_cache) > 1:
+                    _, evicted = self._tile_cache.popitem(last=False)
+                    self._tile_cache_size -= len(evicted)
+        return data
+    
+    def _executor(self, attr: str, max_workers: int) -> ThreadPoolExecutor:
+        """Thread pool stored in attr, created on first use"""
+        with self._pool_lock:
+            pool = getattr(self, attr)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=max_workers)
+                setattr(self, attr, pool)
+        return pool
+    
+    def close(self) -> None:
+        """Shut down the download pools and drop cached tiles and map ids; pools are recreated if used again"""
+        with self._pool_lock:
+            pools = [self._download_pool, self._tile_pool]
+            self._download_pool = self._tile_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown()
+        with self._tile_cache_lock:
+            self._tile_cache.clear()
+            self._tile_cache_size = 0
+        with self._map_id_lock:
+            self._map_ids.clear()
+    
+    @classmethod
+    def _tile_pixel(cls, lng: float, lat: float, zoom: int) -> Tuple[float, float]:
+        """Global Web Mercator pixel coordinates of a point at a zoom level"""
+        world = cls.TILE_SIZE * 2 ** zoom
+        sin_lat = math.sin(math.radians(lat))
+        x = (lng + 180) / 360 * world
+        y = (0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)) * world
+        return x, y
+    
+    def _render_tiles(self, map_id: Dict, bounds: Tuple[float, float, float, float],
+                      dimensions: int, filepath: str, pixels: Optional[Dict] = None) -> str:
+        """Fetch the map tiles covering bounds concurrently and save them as one dimensions-sized image"""
+        from PIL import Image
+        
+        west, south, east, north = bounds
+        size = self.TILE_SIZE
+        # Zoom whose native resolution is closest to the requested output size
+        zoom = max(0, round(math.log2(dimensions * 360 / (size * (east - west)))))
+        
+        x0, y0 = self._tile_pixel(west, north, zoom)
+        x1, y1 = self._tile_pixel(east, south, zoom)
+        tiles_x = range(int(x0 // size), int(math.ceil(x1 / size)))
+        tiles_y = range(int(y0 // size), int(math.ceil(y1 / size)))
+        
+        fetcher = map_id['tile_fetcher']
+        futures = {
+            (tx, ty): self._executor('_tile_pool', 32).submit(self._tile_bytes, fetcher.format_tile_url(tx, ty, zoom))
+            for ty in tiles_y for tx in tiles_x
+        }
+        
+        canvas = Image.new('RGBA', (len(tiles_x) * size, len(tiles_y) * size))
+        for (tx, ty), future in futures.items():
+            with Image.open(BytesIO(future.result())) as tile:
+                canvas.paste(tile.convert('RGBA'), ((tx - tiles_x.start) * size, (ty - tiles_y.start) * size))
+        
+        # Trim to the exact bounds and scale to the requested size
+        left, top = x0 - tiles_x.start * size, y0 - tiles_y.start * size
+        box = (round(left), round(top), round(left + x1 - x0), round(top + y1 - y0))
+        image = canvas.crop(box).resize((dimensions, dimensions))
+        with self._replacing(filepath) as tmp:
+            image.save(tmp)
+        if pixels is not None:
+            pixels[filepath] = self._as_pixels(image)
+        return filepath
+    
+    @staticmethod
+    def _as_pixels(image) -> np.ndarray:
+        """
+        8-bit pixel array of a rendered layer
+        Renders are 8-bit visualisations, so detectors work on uint8 rather than upcast floats
+        """
+        if image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        return np.asarray(image, dtype=np.uint8)
+    
+    def _thumb_key(self, region_id: str, layer: str, geometry, variant: str = '') -> Optional[str]:
+        """
+        Cache key for a render of a VIS_TEMPLATES layer; None when the geometry cannot be described locally
+        variant distinguishes renders of one layer that differ outside the template (size, source)
+        """
+        if not self.thumb_cache_dir:
+            return None
+        try:
+            geometry_json = geometry.toGeoJSONString()
+        except Exception:
+            return None
+        key = hashlib.sha1(self._vis_prefix(region_id, layer, variant))
+        key.update(geometry_json.encode())
+        return key.hexdigest()
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _vis_prefix(cls, region_id: str, layer: str, variant: str) -> bytes:
+        """Digest of everything in a cache key except the geometry, computed once per region and layer"""
+        spec = json.dumps({'region_id': region_id, 'layer': layer, 'variant': variant,
+                           'vis': cls.VIS_TEMPLATES[layer]}, sort_keys=True)
+        return hashlib.sha1(spec.encode()).digest()
+    
+    @staticmethod
+    @contextlib.contextmanager
+    def _replacing(filepath: str):
+        """
+        Temporary path next to filepath that is moved onto it once written
+        Renders never rewrite filepath in place, so cache entries hard-linked to it keep their content
+        """
+        root, ext = os.path.splitext(filepath)
+        tmp = f"{root}.tmp-{os.getpid()}-{threading.get_ident()}{ext}"
+        try:
+            yield tmp
+            os.replace(tmp, filepath)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
+            raise
+    
+    @staticmethod
+    def _link_or_copy(src: str, dst: str) -> None:
+        """Hard-link src to dst, copying when linking is not possible"""
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+    
+    def process_all_regions(self, loaded_data: Dict, on_region_done=None) -> Dict:
+        """
+        Process all loaded regions with multi-scale analysis
+        on_region_done(region_id, results) is called after each region finishes
+        """
         if not loaded_data:
             print("❌ No data to process")
             return {}
@@ -689,16 +1259,22 @@ class EnhancedDataProcessor:
         
         all_results = {}
         
-        for region_id, region_data in loaded_data.items():
-            print(f"\n🏛️ Processing {region_data['region_info']['name']}...")
+        # Regions are processed concurrently; Earth Engine load is bounded by GEE_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(len(loaded_data), 8)) as pool:
+            futures = {}
+            for region_id, region_data in loaded_data.items():
+                print(f"\n🏛️ Processing {region_data['region_info']['name']}...")
+                futures[pool.submit(self.process_region_multiscale, region_data)] = region_id
             
-            # Run complete multi-scale analysis
-            results = self.process_region_multiscale(region_data)
-            all_results[region_id] = results
-            
-            # Brief delay between regions
-            time.sleep(2)
-        
+            for future in as_completed(futures):
+                region_id = futures[future]
+                results = future.result()
+                all_results[region_id] = results
+                if on_region_done is not None:
+                    on_region_done(region_id, results)
+        
+        # Keep the input region order
+        all_results = {region_id: all_results[region_id] for region_id in loaded_data}
         self.processed_data = all_results
         
         # Summary statistics
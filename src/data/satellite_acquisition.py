@@ -8,9 +8,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import random
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Imports for Google Earth Engine
-import ee
+# Google Earth Engine is imported on first use
+from src.data import get_ee
 
 # Import from organized structure  
 from src.config.regions import SimpleRegionConfig
@@ -26,6 +28,8 @@ class EnhancedDataAcquisition:
         self.authenticated = False
         self.loaded_data = {}
         self.failed_regions = []
+        # Regions load on worker threads; guards failed_regions
+        self._state_lock = threading.Lock()
         
         # Initialize region configuration
         self.region_config = SimpleRegionConfig()
@@ -56,6 +60,7 @@ class EnhancedDataAcquisition:
         print("🔑 Setting up Google Earth Engine...")
         
         try:
+            ee = get_ee()
             # Always try to initialize (it's safe to call multiple times)
             ee.Initialize()
             
@@ -85,78 +90,53 @@ class EnhancedDataAcquisition:
         print(f"📡 Loading dual-source data for {region_info['name']}...")
         
         try:
+            ee = get_ee()
+            
             # Define region geometry
             lat, lng = region_info['center']
             area_size = 0.2  # ~22km x 22km area
             
-            region_area = ee.Geometry.Rectangle([
-                lng - area_size, lat - area_size,
-                lng + area_size, lat + area_size
-            ])
+            bounds = [lng - area_size, lat - area_size, lng + area_size, lat + area_size]
+            region_area = ee.Geometry.Rectangle(bounds)
             
             # SOURCE 1: Sentinel-2 Optical Data
             print("   📸 Loading Sentinel-2 optical data...")
-            sentinel2 = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
-                .filterBounds(region_area) \
-                .filterDate('2023-01-01', '2023-12-31') \
-                .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 30))
+            optical_filter = {'start': '2023-01-01', 'end': '2023-12-31', 'max_cloud': 30}
+            sentinel2 = self._optical_collection(region_area, **optical_filter)
             
             s2_count = sentinel2.size().getInfo()
             
             if s2_count == 0:
                 print("   🔄 Expanding date range...")
-                sentinel2 = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
-                    .filterBounds(region_area) \
-                    .filterDate('2022-01-01', '2023-12-31') \
-                    .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 50))
+                optical_filter = {'start': '2022-01-01', 'end': '2023-12-31', 'max_cloud': 50}
+                sentinel2 = self._optical_collection(region_area, **optical_filter)
                 s2_count = sentinel2.size().getInfo()
             
             if s2_count == 0:
                 print(f"   ❌ No Sentinel-2 data for {region_id}")
                 return None
             
-            # Create optical composite
-            optical_composite = sentinel2.median().clip(region_area)
-            
             # SOURCE 2: Sentinel-1 Radar Data (more reliable than PALSAR)
             print("   📡 Loading Sentinel-1 radar data...")
-            sentinel1 = ee.ImageCollection('COPERNICUS/S1_GRD') \
-                .filterBounds(region_area) \
-                .filterDate('2023-01-01', '2023-12-31') \
-                .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VV')) \
-                .filter(ee.Filter.eq('instrumentMode', 'IW'))
+            radar_filter = {'start': '2023-01-01', 'end': '2023-12-31', 'iw_only': True}
+            sentinel1 = self._radar_collection(region_area, **radar_filter)
             
             s1_count = sentinel1.size().getInfo()
             
             if s1_count == 0:
                 print("   🔄 Expanding radar date range...")
-                sentinel1 = ee.ImageCollection('COPERNICUS/S1_GRD') \
-                    .filterBounds(region_area) \
-                    .filterDate('2022-01-01', '2023-12-31') \
-                    .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VV'))
+                radar_filter = {'start': '2022-01-01', 'end': '2023-12-31', 'iw_only': False}
+                sentinel1 = self._radar_collection(region_area, **radar_filter)
                 s1_count = sentinel1.size().getInfo()
             
             if s1_count == 0:
                 print(f"   ❌ No Sentinel-1 data for {region_id}")
                 return None
             
-            # Create radar composite
-            radar_composite = sentinel1.select(['VV', 'VH']).median().clip(region_area)
-            
-            # Additional data layers
+            # Composites, elevation and indices
             print("   🗻 Loading elevation data...")
-            elevation = ee.Image('USGS/SRTMGL1_003').clip(region_area)
-            
-            # Calculate indices with corrected API calls
             print("   🧮 Calculating archaeological indices...")
-            
-            # NDVI for vegetation analysis
-            ndvi = optical_composite.normalizedDifference(['B8', 'B4']).rename('ndvi')
-            
-            # Archaeological probability index (simplified and corrected)
-            arch_index = self.calculate_archaeological_index_fixed(
-                optical_composite, radar_composite, elevation, ndvi
-            )
+            data_sources = self._build_data_sources(region_area, sentinel2, sentinel1)
             
             # Package the data
             region_data = {
@@ -164,14 +144,12 @@ class EnhancedDataAcquisition:
                 'region_info': region_info,
                 'regional_area': region_area,
                 
+                # Plain definition the Earth Engine objects are rebuilt from on resume
+                'bounds': bounds,
+                'source_filters': {'optical': optical_filter, 'radar': radar_filter},
+                
                 # Data sources (Checkpoint 2 requirement)
-                'data_sources': {
-                    'optical': optical_composite,
-                    'radar': radar_composite,
-                    'elevation': elevation,
-                    'ndvi': ndvi,
-                    'archaeological_index': arch_index
-                },
+                'data_sources': data_sources,
                 
                 # Metadata for validation
                 'metadata': {
@@ -195,14 +173,84 @@ class EnhancedDataAcquisition:
             
         except Exception as e:
             print(f"   ❌ Failed to load {region_id}: {e}")
-            self.failed_regions.append(region_id)
+            with self._state_lock:
+                self.failed_regions.append(region_id)
             return None
     
+    def _optical_collection(self, region_area, start: str, end: str, max_cloud: int):
+        """Sentinel-2 scenes over an area within a date range and cloud limit"""
+        ee = get_ee()
+        return ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
+            .filterBounds(region_area) \
+            .filterDate(start, end) \
+            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', max_cloud))
+    
+    def _radar_collection(self, region_area, start: str, end: str, iw_only: bool):
+        """Sentinel-1 VV scenes over an area within a date range, optionally IW mode only"""
+        ee = get_ee()
+        sentinel1 = ee.ImageCollection('COPERNICUS/S1_GRD') \
+            .filterBounds(region_area) \
+            .filterDate(start, end) \
+            .filter(ee.Filter.listContains('transmitterReceiverPolarisation', 'VV'))
+        if iw_only:
+            sentinel1 = sentinel1.filter(ee.Filter.eq('instrumentMode', 'IW'))
+        return sentinel1
+    
+    def _build_data_sources(self, region_area, sentinel2, sentinel1) -> Dict:
+        """Composites, elevation and derived indices for one region (no Earth Engine round trips)"""
+        ee = get_ee()
+        
+        # Create optical and radar composites
+        optical_composite = sentinel2.median().clip(region_area)
+        radar_composite = sentinel1.select(['VV', 'VH']).median().clip(region_area)
+        
+        # Additional data layers
+        elevation = ee.Image('USGS/SRTMGL1_003').clip(region_area)
+        
+        # NDVI for vegetation analysis
+        ndvi = optical_composite.normalizedDifference(['B8', 'B4']).rename('ndvi')
+        
+        # Archaeological probability index (simplified and corrected)
+        arch_index = self.calculate_archaeological_index_fixed(
+            optical_composite, radar_composite, elevation, ndvi
+        )
+        
+        return {
+            'optical': optical_composite,
+            'radar': radar_composite,
+            'elevation': elevation,
+            'ndvi': ndvi,
+            'archaeological_index': arch_index
+        }
+    
+    @staticmethod
+    def checkpoint_region_data(region_data: Dict) -> Dict:
+        """Plain copy of loaded region data without Earth Engine objects, safe to pickle"""
+        return {key: value for key, value in region_data.items()
+                if key not in ('regional_area', 'data_sources')}
+    
+    def restore_region_data(self, checkpoint: Dict) -> Dict:
+        """Rebuild the Earth Engine objects of a region from its plain checkpoint"""
+        if 'bounds' not in checkpoint:
+            # Written before plain checkpoints; still holds its Earth Engine objects
+            return checkpoint
+        ee = get_ee()
+        region_area = ee.Geometry.Rectangle(checkpoint['bounds'])
+        filters = checkpoint['source_filters']
+        sentinel2 = self._optical_collection(region_area, **filters['optical'])
+        sentinel1 = self._radar_collection(region_area, **filters['radar'])
+        return {
+            **checkpoint,
+            'regional_area': region_area,
+            'data_sources': self._build_data_sources(region_area, sentinel2, sentinel1)
+        }
+    
     def calculate_archaeological_index_fixed(self, optical, radar, elevation, ndvi):
         """
         Calculate fixed archaeological index with proper bounds and normalization
         Addresses red image visualization issue
         """
+        ee = get_ee()
         try:
             # Multi-band analysis for archaeological features
             optical_bands = optical.select(['B4', 'B3', 'B2', 'B8'])  # Red, Green, Blue, NIR
@@ -310,30 +358,46 @@ class EnhancedDataAcquisition:
         
         return loaded_data
 
+    def _load_one_region(self, region_id: str, region_info: Dict):
+        """Load a single region, returning (region_id, data or None)"""
+        return region_id, self.load_dual_source_data(region_id, region_info)
+
     def load_specific_regions(self, region_ids: List[str]) -> Dict:
         """
         Load dual-source data for specific user-selected regions
+        Regions are fetched concurrently since each load mostly waits on GEE;
+        workers only return their result, which is merged here on the calling thread
         """
         print(f"🌍 Loading dual-source data for selected regions...")
         print("=" * 60)
         
         all_regions = self.region_config.get_regions_by_priority(max_regions=10)
-        loaded_data = {}
         
+        selected = []
         for region_id in region_ids:
             if region_id not in all_regions:
                 print(f"⚠️ Region {region_id} not found in configuration")
                 continue
-            
-            print(f"\n📍 Processing region {region_id}...")
-            region_info = all_regions[region_id]
-            region_data = self.load_dual_source_data(region_id, region_info)
-            
-            if region_data:
-                loaded_data[region_id] = region_data
-                print(f"✅ {region_id} loaded successfully")
-            else:
-                print(f"❌ {region_id} failed to load")
+            selected.append(region_id)
+        
+        results = {}
+        if selected:
+            print(f"\n📍 Processing {len(selected)} regions in parallel...")
+            with ThreadPoolExecutor(max_workers=len(selected)) as pool:
+                futures = [
+                    pool.submit(self._load_one_region, region_id, all_regions[region_id])
+                    for region_id in selected
+                ]
+                for future in as_completed(futures):
+                    region_id, region_data = future.result()
+                    results[region_id] = region_data
+                    if region_data:
+                        print(f"✅ {region_id} loaded successfully")
+                    else:
+                        print(f"❌ {region_id} failed to load")
+        
+        # Keep the selection order regardless of completion order
+        loaded_data = {region_id: results[region_id] for region_id in selected if results.get(region_id)}
         
         if not loaded_data:
             print("❌ No regions loaded successfully")
@@ -11,16 +11,115 @@ Organizes outputs into clean structure and cleans up temporary folders:
 import os
 import shutil
 import json
-import glob
+import mmap
 import tempfile
+import threading
+from string import Template
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+# Optional fast JSON codec; stdlib json is used when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional streaming parser for large analysis files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 class OutputOrganizer:
     """Organizes archaeological discovery outputs into clean structure"""
     
+    # Scale subfolders of satellite_imagery
+    IMAGE_SCALES = ('regional', 'zone', 'site')
+    
+    # Discovery image naming: first keyword found in the filename picks the category and destination name
+    _IMAGE_RULES = (
+        ("archaeological_heatmap", "regional_heatmap", "regional_heatmap.png"),  # Regional heatmap
+        ("heatmap", "regional_heatmap", "regional_heatmap.png"),
+        ("zone", "zone", "zone_{}"),                                 # Any zone-related images
+        ("site", "site", "site_{}"),                                 # Any site-related images
+        ("archaeological", "archaeological", "archaeological_{}"),   # Any other archaeological images
+    )
+    
+    # Current-directory folders never searched for pipeline outputs
+    _SKIP_CWD_DIRS = frozenset({'outputs', 'node_modules'})
+    
+    # Byte markers of the keys _extract_model_info reads; b"model_info" also matches "ai_model_info"
+    _MODEL_INFO_MARKERS = (b'model_info', b'"ai_responses"', b'"regional"', b'"zone"', b'"site"', b'"leverage"')
+    
+    # discovery_details.md, filled once per discovery
+    _DETAIL_TEMPLATE = Template("""# Discovery ${num}: ${site_type}
+
+## Location
+- **Latitude**: ${latitude}
+- **Longitude**: ${longitude}
+- **Confidence**: ${confidence}
+
+## Site Details
+- **Site ID**: ${site_id}
+- **Site Type**: ${site_type}
+- **Site Function**: ${site_function}
+- **Region**: ${region_name}
+- **Country**: ${country}
+- **Analysis Scale**: ${detection_scale}
+- **Source**: ${source}
+
+## Features Detected
+${features}${measurements}
+## Images
+### Regional Context
+![Regional Heatmap](regional_heatmap.png)
+*Archaeological heatmap showing broader regional context*
+
+### Zone Analysis
+Zone-level optical imagery showing landscape modifications
+
+### Site Details
+High-resolution site imagery confirming archaeological features
+
+---
+*Generated: ${generated}*
+""")
+    
+    # 2_discoveries/README.md and its per-discovery entries
+    _OVERVIEW_TEMPLATE = Template("""# Archaeological Discoveries Overview
+
+## Summary
+This directory contains detailed information about the top ${count} archaeological discoveries identified through AI-powered satellite analysis.
+
+## Discoveries Found
+
+${entries}## Analysis Method
+- **Multi-scale Analysis**: Regional (50km) → Zone (10km) → Site (2km)
+- **AI Model**: OpenAI o3 with high reasoning effort
+- **Data Sources**: Sentinel-2 optical + Sentinel-1/ALOS PALSAR radar
+- **Open Discovery**: No cultural bias, pure archaeological pattern detection
+
+## Image Types
+- **Regional Heatmap**: Archaeological potential across broader region
+- **Zone Images**: 10km scale landscape analysis 
+- **Site Images**: 2km high-resolution confirmation
+
+Generated: ${generated}
+""")
+    _OVERVIEW_ENTRY_TEMPLATE = Template("""### [${num}. ${site_type}](discovery_${num}/)
+- **Location**: ${latitude}, ${longitude}
+- **Confidence**: ${confidence}
+- **Details**: [discovery_${num}/discovery_details.md](discovery_${num}/discovery_details.md)
+
+""")
+    
     def __init__(self):
-        self.timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.now()
+        self.timestamp = now.strftime('%Y%m%d_%H%M%S')
+        # All READMEs of one run share this "Generated" time
+        self.timestamp_human = now.strftime('%Y-%m-%d %H:%M:%S')
         # Create final_results inside outputs folder
         self.clean_output_dir = f"outputs/final_results_{self.timestamp}"
         
@@ -31,125 +130,101 @@ class OutputOrganizer:
             'processed_images': f"{self.clean_output_dir}/3_processed_images",
             'metadata': f"{self.clean_output_dir}/4_metadata"
         }
+        
+        # Per-run temp directories live directly in the system temp dir
+        self._temp_root = Path(tempfile.gettempdir())
+        self._archaeology_temp_glob = f"{self._temp_root}/archaeology_temp_*"
+        # Where _organize_discoveries looks for the submission JSON, and its parsed contents
+        self._submission_dir = Path(self.folders['submission'])
+        self._submission_cache = None
+        
+        # Files found under all output roots, built by one scan and shared by every stage
+        self._file_index = None
+        # Whether files on a source device can be hardlinked into the output, keyed by st_dev
+        self._link_ok = {}
+        # Copies are independent and I/O-bound, so they run on a pool during organize_outputs
+        self._copy_pool = None
+        # Stages log concurrently; keep each line whole
+        self._print_lock = threading.Lock()
     
     def organize_outputs(self, submission_data=None, temp_base=None):
         """Organize all outputs into clean structure and cleanup temp directories"""
-        print(f"\n📁 ORGANIZING OUTPUTS")
-        print("=" * 40)
-        print(f"🎯 Creating clean output structure: {self.clean_output_dir}")
+        self._log(f"\n📁 ORGANIZING OUTPUTS")
+        self._log("=" * 40)
+        self._log(f"🎯 Creating clean output structure: {self.clean_output_dir}")
         
         # Create clean directory structure
         for folder_name, folder_path in self.folders.items():
             os.makedirs(folder_path, exist_ok=True)
-            print(f"   📂 Created: {folder_name}/")
+            self._log(f"   📂 Created: {folder_name}/")
         
         # IMPORTANT: Copy all files BEFORE cleanup
-        print(f"📋 Copying files from temporary directories...")
-        
-        # 1. Organize submission files (from temp directories)
-        self._organize_submission_files(temp_base)
-        
-        # 2. Organize processed images FIRST (before cleanup)
-        self._organize_processed_images(temp_base)
-        
-        # 3. Organize discovery details with images
-        self._organize_discoveries(submission_data, temp_base)
-        
-        # 4. Create metadata and summary
-        self._create_metadata(temp_base)
+        self._log(f"📋 Copying files from temporary directories...")
+        self._build_file_index(temp_base)
+        self._copy_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
         
-        # 5. Create main README
-        self._create_main_readme()
+        try:
+            # 1. Organize submission files (from temp directories)
+            self._organize_submission_files(temp_base)
+            
+            # 2, 4, 5. Processed images, metadata and main README only read the file index and
+            # write their own folders, so they run next to the discoveries stage. They get their
+            # own executor so their leaf copies on _copy_pool never wait behind a stage
+            with ThreadPoolExecutor(max_workers=3) as stage_pool:
+                stages = [
+                    stage_pool.submit(self._organize_processed_images, temp_base),
+                    stage_pool.submit(self._create_metadata, temp_base),
+                    stage_pool.submit(self._create_main_readme),
+                ]
+                
+                # 3. Organize discovery details with images (needs the submission data)
+                self._organize_discoveries(submission_data, temp_base)
+                
+                # Everything must be copied before cleanup
+                for stage in stages:
+                    stage.result()
+        finally:
+            self._copy_pool.shutdown()
+            self._copy_pool = None
         
         # 6. Cleanup temporary directories LAST (after all copying is done)
         if temp_base:
             self._cleanup_temp_directories(temp_base)
         
-        print(f"\n✅ Clean output organization complete!")
-        print(f"📁 Results location: {self.clean_output_dir}/")
+        self._log(f"\n✅ Clean output organization complete!")
+        self._log(f"📁 Results location: {self.clean_output_dir}/")
         return self.clean_output_dir
     
+    def _log(self, *args):
+        """Print one log line without interleaving with other stages"""
+        with self._print_lock:
+            print(*args)
+    
     def _organize_submission_files(self, temp_base=None):
         """Organize submission JSON and MD files"""
-        print(f"\n📦 Organizing submission files...")
-        
-        submission_files = []
-        
-        # Find submission files in temporary or existing directories
-        search_paths = []
-        if temp_base:
-            search_paths.extend([
-                f"{temp_base}/competition_submissions/*/checkpoint2_submission_*.json",
-                f"{temp_base}/competition_submissions/*/checkpoint2_summary_*.md",
-                f"{temp_base}/competition_submissions/checkpoint2_*.json",
-                f"{temp_base}/competition_submissions/checkpoint2_*.md"
-            ])
-        
-        # Also search ALL temporary directories (since files may be in different temp dirs)
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        search_paths.extend([
-            f"{temp_dir}/archaeology_temp_*/competition_submissions/*/checkpoint2_submission_*.json",
-            f"{temp_dir}/archaeology_temp_*/competition_submissions/*/checkpoint2_summary_*.md",
-            f"{temp_dir}/archaeology_temp_*/competition_submissions/checkpoint2_*.json",
-            f"{temp_dir}/archaeology_temp_*/competition_submissions/checkpoint2_*.md"
-        ])
-        
-        # Also check existing outputs for backward compatibility
-        search_paths.extend([
-            "outputs/competition_submissions/*/checkpoint2_submission_*.json",
-            "outputs/competition_submissions/*/checkpoint2_summary_*.md",
-            "outputs/competition_submissions/checkpoint2_*.json",
-            "outputs/competition_submissions/checkpoint2_*.md"
-        ])
-        
-        # Also check current directory and subdirectories for any submission files
-        search_paths.extend([
-            "checkpoint2_submission_*.json",
-            "checkpoint2_summary_*.md",
-            "*/checkpoint2_submission_*.json",
-            "*/checkpoint2_summary_*.md"
-        ])
-        
-        for pattern in search_paths:
-            files = glob.glob(pattern)
-            submission_files.extend(files)
-        
-        # Filter to only the most recent submission files (based on timestamp in filename)
-        if submission_files:
-            # Group files by type (submission vs summary)
-            submission_jsons = [f for f in submission_files if 'submission' in f and f.endswith('.json')]
-            summary_mds = [f for f in submission_files if 'summary' in f and f.endswith('.md')]
-            
-            # Get the most recent of each type
-            recent_files = []
-            if submission_jsons:
-                recent_submission = max(submission_jsons, key=lambda x: os.path.basename(x))
-                recent_files.append(recent_submission)
-            if summary_mds:
-                recent_summary = max(summary_mds, key=lambda x: os.path.basename(x))
-                recent_files.append(recent_summary)
-            
-            submission_files = recent_files
-        
-        # Copy submission files
-        for file_path in submission_files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                dest = os.path.join(self.folders['submission'], filename)
-                shutil.copy2(file_path, dest)
-                print(f"   📄 {filename}")
-        
-        if not submission_files:
-            print(f"   ⚠️ No submission files found in search paths:")
-            for pattern in search_paths:
-                print(f"      - {pattern}")
+        self._log(f"\n📦 Organizing submission files...")
+        
+        index = self._build_file_index(temp_base)
+        
+        # Keep only the most recent of each type (based on timestamp in filename)
+        copies = []
+        for category in ('submission_json', 'summary_md'):
+            if index[category]:
+                filename, file_path = max(index[category], key=itemgetter(0))
+                copies.append((file_path, os.path.join(self.folders['submission'], filename)))
+                self._log(f"   📄 {filename}")
+        self._copy_files(copies)
+        
+        if not copies:
+            self._log(f"   ⚠️ No submission files found under:")
+            for root in index['roots']:
+                self._log(f"      - {root}")
         else:
-            print(f"   ✅ Found {len(submission_files)} submission files")
+            self._log(f"   ✅ Found {len(copies)} submission files")
         
         # Create submission README
         readme_path = os.path.join(self.folders['submission'], "README.md")
-        with open(readme_path, 'w') as f:
+        with open(readme_path, 'w', buffering=1 << 16) as f:
             f.write(f"""# Checkpoint 2 Submission Files
 
 ## Files in this directory:
@@ -169,24 +244,25 @@ class OutputOrganizer:
 - All prompts logged and documented
 - Reproducibility verified (±50m tolerance)
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {self.timestamp_human}
 """)
         
-        print(f"   📄 README.md")
+        self._log(f"   📄 README.md")
     
     def _organize_discoveries(self, submission_data, temp_base=None):
         """Organize discovery details with images"""
-        print(f"\n🏛️ Organizing discovery details...")
+        self._log(f"\n🏛️ Organizing discovery details...")
         
-        # Load submission data if not provided
+        # Load submission data if not provided (parsed once per organizer)
         if not submission_data:
-            submission_files = glob.glob(f"{self.folders['submission']}/checkpoint2_submission_*.json")
-            if submission_files:
-                with open(submission_files[0], 'r') as f:
-                    submission_data = json.load(f)
+            if self._submission_cache is None:
+                submission_file = next(self._submission_dir.glob("checkpoint2_submission_*.json"), None)
+                if submission_file:
+                    self._submission_cache = self._load_json(submission_file)
+            submission_data = self._submission_cache
         
         if not submission_data:
-            print("   ⚠️ No submission data found")
+            self._log("   ⚠️ No submission data found")
             return
         
         # Get top discoveries
@@ -195,6 +271,9 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         # Sort by confidence
         top_discoveries = sorted(discoveries, key=lambda x: x.get('confidence', 0), reverse=True)[:5]
         
+        # Images are classified once and linked into every discovery
+        catalog = self._build_image_catalog(temp_base)
+        
         # Create discovery details for each top discovery
         for i, discovery in enumerate(top_discoveries, 1):
             discovery_dir = os.path.join(self.folders['discoveries'], f"discovery_{i:02d}")
@@ -203,11 +282,11 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             # Find relevant images for this discovery
             center_coords = discovery.get('center_coords', {})
             lat, lng = center_coords.get('latitude', 0), center_coords.get('longitude', 0)
-            images_copied = self._copy_discovery_images(discovery_dir, discovery, lat, lng, temp_base)
+            images_copied = self._copy_discovery_images(discovery_dir, discovery, lat, lng, catalog)
             if images_copied:
-                print(f"      📸 {len(images_copied)} images copied")
+                self._log(f"      📸 {len(images_copied)} images copied")
             else:
-                print(f"      ⚠️ No images found for this discovery")
+                self._log(f"      ⚠️ No images found for this discovery")
             
             # Create discovery details file
             self._create_discovery_details(discovery_dir, discovery, i)
@@ -216,88 +295,34 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             site_classification = discovery.get('site_classification', {})
             site_type = site_classification.get('type', 'Unknown')
             confidence = discovery.get('confidence_score', 0)
-            print(f"   🏛️ Discovery {i:02d}: {site_type} (confidence: {confidence:.3f})")
+            self._log(f"   🏛️ Discovery {i:02d}: {site_type} (confidence: {confidence:.3f})")
         
         # Create discoveries overview
         self._create_discoveries_overview(top_discoveries)
     
-    def _copy_discovery_images(self, discovery_dir, discovery, lat, lng, temp_base=None):
+    def _build_image_catalog(self, temp_base=None):
+        """Classify all indexed images once: {category: [(dest_name, src_path), ...]}"""
+        catalog = {}
+        for scale, filename, img_file in self._build_file_index(temp_base)['images']:
+            for keyword, category, template in self._IMAGE_RULES:
+                if keyword in filename:
+                    catalog.setdefault(category, []).append((template.format(filename), img_file))
+                    break
+        return catalog
+    
+    def _copy_discovery_images(self, discovery_dir, discovery, lat, lng, catalog):
         """Copy relevant images for a discovery"""
         images_copied = []
-        
-        # Find images in temporary or existing satellite imagery output
-        image_dirs = []
-        if temp_base:
-            image_dirs.extend([
-                f"{temp_base}/satellite_imagery/regional",
-                f"{temp_base}/satellite_imagery/zone", 
-                f"{temp_base}/satellite_imagery/site"
-            ])
-        
-        # Also search ALL temporary directories for images
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        image_dirs.extend([
-            f"{temp_dir}/archaeology_temp_*/satellite_imagery/regional",
-            f"{temp_dir}/archaeology_temp_*/satellite_imagery/zone", 
-            f"{temp_dir}/archaeology_temp_*/satellite_imagery/site"
-        ])
-        
-        # Also check existing outputs for backward compatibility
-        image_dirs.extend([
-            "outputs/satellite_imagery/regional",
-            "outputs/satellite_imagery/zone", 
-            "outputs/satellite_imagery/site"
-        ])
-        
-        # Also check current directory and any subdirectories for images
-        image_dirs.extend([
-            "satellite_imagery/regional",
-            "satellite_imagery/zone", 
-            "satellite_imagery/site",
-            "*/satellite_imagery/regional",
-            "*/satellite_imagery/zone", 
-            "*/satellite_imagery/site"
-        ])
-        
-        # Expand glob patterns for image directories
-        expanded_image_dirs = []
-        for img_dir in image_dirs:
-            if '*' in img_dir:
-                expanded_image_dirs.extend(glob.glob(img_dir))
-            else:
-                expanded_image_dirs.append(img_dir)
+        # Later matches for the same destination replace earlier ones, as sequential copies did
+        copies = {}
         
         # Look for images that might be related to this discovery
-        for img_dir in expanded_image_dirs:
-            if os.path.exists(img_dir):
-                for img_file in glob.glob(f"{img_dir}/*.png"):
-                    filename = os.path.basename(img_file)
-                    
-                    # Copy regional heatmap
-                    if "archaeological_heatmap" in filename or "heatmap" in filename:
-                        dest = os.path.join(discovery_dir, f"regional_heatmap.png")
-                        shutil.copy2(img_file, dest)
-                        images_copied.append("regional_heatmap.png")
-                    
-                    # Copy zone images (any zone-related images)
-                    elif "zone" in filename:
-                        dest = os.path.join(discovery_dir, f"zone_{filename}")
-                        shutil.copy2(img_file, dest)
-                        images_copied.append(f"zone_{filename}")
-                    
-                    # Copy site images (any site-related images)
-                    elif "site" in filename:
-                        dest = os.path.join(discovery_dir, f"site_{filename}")
-                        shutil.copy2(img_file, dest)
-                        images_copied.append(f"site_{filename}")
-                    
-                    # Copy any other archaeological images
-                    elif "archaeological" in filename:
-                        dest = os.path.join(discovery_dir, f"archaeological_{filename}")
-                        shutil.copy2(img_file, dest)
-                        images_copied.append(f"archaeological_{filename}")
+        for entries in catalog.values():
+            for dest_name, img_file in entries:
+                copies[os.path.join(discovery_dir, dest_name)] = img_file
+                images_copied.append(dest_name)
         
+        self._copy_files((src, dest) for dest, src in copies.items())
         return images_copied
     
     def _create_discovery_details(self, discovery_dir, discovery, discovery_num):
@@ -306,198 +331,123 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         
         # Extract coordinates from the correct structure
         center_coords = discovery.get('center_coords', {})
-        latitude = center_coords.get('latitude', 0)
-        longitude = center_coords.get('longitude', 0)
-        confidence = discovery.get('confidence_score', 0)
         
-        # Extract site details
+        # Extract site details and geographic context
         site_classification = discovery.get('site_classification', {})
-        site_type = site_classification.get('type', 'Archaeological Site')
-        site_function = site_classification.get('function', 'Unknown')
-        
-        # Extract geographic context
         geo_context = discovery.get('geographic_context', {})
-        region_name = geo_context.get('region_name', 'Unknown')
-        country = geo_context.get('country', 'Unknown')
+        analysis_details = discovery.get('analysis_details', {})
+        
+        # Add features from analysis details
+        primary_indicators = analysis_details.get('primary_indicators', [])
+        secondary_evidence = analysis_details.get('secondary_evidence', [])
+        features = []
+        if primary_indicators or secondary_evidence:
+            if primary_indicators:
+                features.append("### Primary Indicators\n")
+                features.extend(f"- {feature}\n" for feature in primary_indicators)
+            if secondary_evidence:
+                features.append("### Secondary Evidence\n")
+                features.extend(f"- {feature}\n" for feature in secondary_evidence)
+        else:
+            features.append("- Archaeological anomaly detected\n"
+                            "- Landscape modification patterns\n"
+                            "- Geometric features\n")
+        
+        # Add measurements from key_features
+        key_features = discovery.get('key_features', {})
+        measurements = []
+        if key_features:
+            measurements.append("\n## Measurements\n")
+            if 'area_hectares' in key_features:
+                measurements.append(f"- **Area**: {key_features['area_hectares']} hectares\n")
+            if 'defensive_rings' in key_features:
+                measurements.append(f"- **Defensive Rings**: {key_features['defensive_rings']}\n")
+            if 'geometric_regularity' in key_features:
+                measurements.append(f"- **Geometric Regularity**: {key_features['geometric_regularity']:.3f}\n")
+            if 'elevation_prominence' in key_features:
+                measurements.append(f"- **Elevation Prominence**: {key_features['elevation_prominence']:.3f}\n")
+        
+        ctx = {
+            'num': f"{discovery_num:02d}",
+            'site_type': site_classification.get('type', 'Archaeological Site'),
+            'latitude': f"{center_coords.get('latitude', 0):.6f}",
+            'longitude': f"{center_coords.get('longitude', 0):.6f}",
+            'confidence': f"{discovery.get('confidence_score', 0):.3f}",
+            'site_id': discovery.get('anomaly_id', 'Unknown'),
+            'site_function': site_classification.get('function', 'Unknown'),
+            'region_name': geo_context.get('region_name', 'Unknown'),
+            'country': geo_context.get('country', 'Unknown'),
+            'detection_scale': analysis_details.get('detection_scale', 'Unknown'),
+            'source': discovery.get('discovery_method', 'Unknown'),
+            'features': ''.join(features),
+            'measurements': ''.join(measurements),
+            'generated': self.timestamp_human,
+        }
         
-        with open(details_path, 'w') as f:
-            f.write(f"""# Discovery {discovery_num:02d}: {site_type}
-
-## Location
-- **Latitude**: {latitude:.6f}
-- **Longitude**: {longitude:.6f}
-- **Confidence**: {confidence:.3f}
-
-## Site Details
-- **Site ID**: {discovery.get('anomaly_id', 'Unknown')}
-- **Site Type**: {site_type}
-- **Site Function**: {site_function}
-- **Region**: {region_name}
-- **Country**: {country}
-- **Analysis Scale**: {discovery.get('analysis_details', {}).get('detection_scale', 'Unknown')}
-- **Source**: {discovery.get('discovery_method', 'Unknown')}
-
-## Features Detected
-""")
-            
-            # Add features from analysis details
-            analysis_details = discovery.get('analysis_details', {})
-            primary_indicators = analysis_details.get('primary_indicators', [])
-            secondary_evidence = analysis_details.get('secondary_evidence', [])
-            
-            if primary_indicators or secondary_evidence:
-                if primary_indicators:
-                    f.write("### Primary Indicators\n")
-                    for feature in primary_indicators:
-                        f.write(f"- {feature}\n")
-                if secondary_evidence:
-                    f.write("### Secondary Evidence\n")
-                    for feature in secondary_evidence:
-                        f.write(f"- {feature}\n")
-            else:
-                f.write("- Archaeological anomaly detected\n")
-                f.write("- Landscape modification patterns\n")
-                f.write("- Geometric features\n")
-            
-            # Add measurements from key_features
-            key_features = discovery.get('key_features', {})
-            if key_features:
-                f.write(f"\n## Measurements\n")
-                if 'area_hectares' in key_features:
-                    f.write(f"- **Area**: {key_features['area_hectares']} hectares\n")
-                if 'defensive_rings' in key_features:
-                    f.write(f"- **Defensive Rings**: {key_features['defensive_rings']}\n")
-                if 'geometric_regularity' in key_features:
-                    f.write(f"- **Geometric Regularity**: {key_features['geometric_regularity']:.3f}\n")
-                if 'elevation_prominence' in key_features:
-                    f.write(f"- **Elevation Prominence**: {key_features['elevation_prominence']:.3f}\n")
-            
-            # Add images section
-            f.write(f"\n## Images\n")
-            f.write(f"### Regional Context\n")
-            f.write(f"![Regional Heatmap](regional_heatmap.png)\n")
-            f.write(f"*Archaeological heatmap showing broader regional context*\n\n")
-            
-            f.write(f"### Zone Analysis\n")
-            f.write(f"Zone-level optical imagery showing landscape modifications\n\n")
-            
-            f.write(f"### Site Details\n") 
-            f.write(f"High-resolution site imagery confirming archaeological features\n\n")
-            
-            f.write(f"---\n")
-            f.write(f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+        with open(details_path, 'w', buffering=1 << 16) as f:
+            f.write(self._DETAIL_TEMPLATE.substitute(ctx))
     
     def _create_discoveries_overview(self, discoveries):
         """Create overview of all discoveries"""
         overview_path = os.path.join(self.folders['discoveries'], "README.md")
         
-        with open(overview_path, 'w') as f:
-            f.write(f"""# Archaeological Discoveries Overview
-
-## Summary
-This directory contains detailed information about the top {len(discoveries)} archaeological discoveries identified through AI-powered satellite analysis.
-
-## Discoveries Found
-
-""")
-            
-            for i, discovery in enumerate(discoveries, 1):
-                # Extract data using correct structure
-                center_coords = discovery.get('center_coords', {})
-                latitude = center_coords.get('latitude', 0)
-                longitude = center_coords.get('longitude', 0)
-                confidence = discovery.get('confidence_score', 0)
-                site_classification = discovery.get('site_classification', {})
-                site_type = site_classification.get('type', 'Archaeological Site')
-                
-                f.write(f"### [{i:02d}. {site_type}](discovery_{i:02d}/)\n")
-                f.write(f"- **Location**: {latitude:.6f}, {longitude:.6f}\n")
-                f.write(f"- **Confidence**: {confidence:.3f}\n")
-                f.write(f"- **Details**: [discovery_{i:02d}/discovery_details.md](discovery_{i:02d}/discovery_details.md)\n\n")
-            
-            f.write(f"""## Analysis Method
-- **Multi-scale Analysis**: Regional (50km) → Zone (10km) → Site (2km)
-- **AI Model**: OpenAI o3 with high reasoning effort
-- **Data Sources**: Sentinel-2 optical + Sentinel-1/ALOS PALSAR radar
-- **Open Discovery**: No cultural bias, pure archaeological pattern detection
-
-## Image Types
-- **Regional Heatmap**: Archaeological potential across broader region
-- **Zone Images**: 10km scale landscape analysis 
-- **Site Images**: 2km high-resolution confirmation
-
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-""")
+        entries = []
+        for i, discovery in enumerate(discoveries, 1):
+            # Extract data using correct structure
+            center_coords = discovery.get('center_coords', {})
+            site_classification = discovery.get('site_classification', {})
+            entries.append(self._OVERVIEW_ENTRY_TEMPLATE.substitute(
+                num=f"{i:02d}",
+                site_type=site_classification.get('type', 'Archaeological Site'),
+                latitude=f"{center_coords.get('latitude', 0):.6f}",
+                longitude=f"{center_coords.get('longitude', 0):.6f}",
+                confidence=f"{discovery.get('confidence_score', 0):.3f}",
+            ))
+        
+        with open(overview_path, 'w', buffering=1 << 16) as f:
+            f.write(self._OVERVIEW_TEMPLATE.substitute(
+                count=len(discoveries), entries=''.join(entries), generated=self.timestamp_human
+            ))
     
     def _organize_processed_images(self, temp_base=None):
         """Organize all processed images"""
-        print(f"\n📸 Organizing processed images...")
+        self._log(f"\n📸 Organizing processed images...")
         
         # Create subdirectories for different scales
-        scales = ['regional', 'zone', 'site']
+        scales = self.IMAGE_SCALES
         for scale in scales:
             scale_dir = os.path.join(self.folders['processed_images'], scale)
             os.makedirs(scale_dir, exist_ok=True)
         
         # Copy images by scale from temp or existing directories
-        total_copied = 0
-        source_dirs = []
+        index = self._build_file_index(temp_base)
+        found = dict.fromkeys(self.IMAGE_SCALES, 0)
+        copies = {}
         
-        if temp_base:
-            source_dirs.append(f"{temp_base}/satellite_imagery")
-        
-        # Also search ALL temporary directories for satellite imagery
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        source_dirs.append(f"{temp_dir}/archaeology_temp_*/satellite_imagery")
-        
-        # Also check existing outputs for backward compatibility
-        source_dirs.append("outputs/satellite_imagery")
-        
-        # Also check current directory and subdirectories
-        source_dirs.extend([
-            "satellite_imagery",
-            "*/satellite_imagery"
-        ])
-        
-        # Expand glob patterns for subdirectories
-        expanded_source_dirs = []
-        for source_dir in source_dirs:
-            if '*' in source_dir:
-                expanded_source_dirs.extend(glob.glob(source_dir))
-            else:
-                expanded_source_dirs.append(source_dir)
-        source_dirs = expanded_source_dirs
-        
-        for source_dir in source_dirs:
-            if os.path.exists(source_dir):
-                for scale in scales:
-                    scale_source = os.path.join(source_dir, scale)
-                    scale_dest = os.path.join(self.folders['processed_images'], scale)
-                    
-                    if os.path.exists(scale_source):
-                        images = glob.glob(f"{scale_source}/*.png")
-                        for img in images:
-                            filename = os.path.basename(img)
-                            dest = os.path.join(scale_dest, filename)
-                            # Don't overwrite existing files
-                            if not os.path.exists(dest):
-                                shutil.copy2(img, dest)
-                                total_copied += 1
-                        
-                        if images:
-                            print(f"   📸 {scale}: {len(images)} images")
+        for scale, filename, img in index['images']:
+            found[scale] += 1
+            dest = os.path.join(self.folders['processed_images'], scale, filename)
+            # Don't overwrite existing files
+            if dest not in copies:
+                copies[dest] = img
+        
+        self._copy_files(((src, dest) for dest, src in copies.items()), overwrite=False)
+        total_copied = len(copies)
+        
+        for scale in scales:
+            if found[scale]:
+                self._log(f"   📸 {scale}: {found[scale]} images")
         
         if total_copied == 0:
-            print(f"   ⚠️ No images found in source directories:")
-            for source_dir in source_dirs:
-                print(f"      - {source_dir} (exists: {os.path.exists(source_dir)})")
+            self._log(f"   ⚠️ No images found in source directories:")
+            for root in index['roots']:
+                self._log(f"      - {os.path.join(root, 'satellite_imagery')} (exists: {os.path.exists(os.path.join(root, 'satellite_imagery'))})")
         else:
-            print(f"   ✅ Total images copied: {total_copied}")
+            self._log(f"   ✅ Total images copied: {total_copied}")
         
         # Create processed images README
         readme_path = os.path.join(self.folders['processed_images'], "README.md")
-        with open(readme_path, 'w') as f:
+        with open(readme_path, 'w', buffering=1 << 16) as f:
             f.write(f"""# Processed Satellite Images
 
 ## Directory Structure
@@ -519,64 +469,39 @@ High-resolution site confirmation images (2km scale)
 
 ## Total Images: {total_copied}
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {self.timestamp_human}
 """)
         
-        print(f"   📄 README.md")
+        self._log(f"   📄 README.md")
     
     def _create_metadata(self, temp_base=None):
         """Create metadata and analysis details"""
-        print(f"\n📊 Creating metadata...")
+        self._log(f"\n📊 Creating metadata...")
         
         # Copy relevant analysis files from temp or existing directories
-        analysis_patterns = []
-        if temp_base:
-            analysis_patterns.append(f"{temp_base}/archaeological_analysis/**/*.json")
-        
-        # Also search ALL temporary directories for analysis files
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        analysis_patterns.extend([
-            f"{temp_dir}/archaeology_temp_*/archaeological_analysis/**/*.json",
-            f"{temp_dir}/archaeology_temp_*/archaeological_analysis/ai_responses/*.json"
-        ])
-        
-        # Also check existing outputs for backward compatibility
-        analysis_patterns.append("outputs/archaeological_analysis/**/*.json")
-        
-        # Also check current directory and subdirectories
-        analysis_patterns.extend([
-            "archaeological_analysis/**/*.json",
-            "*/archaeological_analysis/**/*.json",
-            "ai_archaeological_analysis_*.json",
-            "*/ai_archaeological_analysis_*.json"
-        ])
-        
-        analysis_files = []
-        for pattern in analysis_patterns:
-            analysis_files.extend(glob.glob(pattern, recursive=True))
+        analysis_files = self._build_file_index(temp_base)['analysis']
         
         # Extract model information from analysis files
-        model_info = self._extract_model_info(analysis_files)
+        model_info = self._extract_model_info(path for _, path in analysis_files)
         
-        for file_path in analysis_files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                dest = os.path.join(self.folders['metadata'], filename)
-                # Don't overwrite existing files
-                if not os.path.exists(dest):
-                    shutil.copy2(file_path, dest)
+        copies = {}
+        for filename, file_path in analysis_files:
+            dest = os.path.join(self.folders['metadata'], filename)
+            # Don't overwrite existing files
+            if dest not in copies:
+                copies[dest] = file_path
+        self._copy_files(((src, dest) for dest, src in copies.items()), overwrite=False)
         
         # Create metadata README with model information
         readme_path = os.path.join(self.folders['metadata'], "README.md")
-        with open(readme_path, 'w') as f:
+        with open(readme_path, 'w', buffering=1 << 16) as f:
             f.write(f"""# Analysis Metadata
 
 ## Contents
 This directory contains technical analysis files and metadata:
 
 - `ai_archaeological_analysis_*.json` - Complete AI analysis responses
-- `processed_data.json` - Processed satellite data details
+- `processed_data/<region_id>.json` - Processed satellite data details (one file per region)
 - Technical logs and analysis parameters
 
 ## AI Model Information
@@ -593,12 +518,12 @@ This directory contains technical analysis files and metadata:
 4. **Discovery Validation**: Confidence scoring and verification
 5. **Submission Generation**: Checkpoint 2 compliance validation
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {self.timestamp_human}
 """)
         
-        print(f"   📄 README.md")
-        print(f"   📊 {len(analysis_files)} analysis files")
-        print(f"   🤖 AI Model: {model_info.get('primary_model', 'Unknown')}")
+        self._log(f"   📄 README.md")
+        self._log(f"   📊 {len(analysis_files)} analysis files")
+        self._log(f"   🤖 AI Model: {model_info.get('primary_model', 'Unknown')}")
     
     def _extract_model_info(self, analysis_files):
         """Extract model information from AI analysis files"""
@@ -606,14 +531,16 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             'primary_model': 'Unknown',
             'reasoning_effort': 'high',
             'response_format': 'json_object',
-            'models_used': [],
+            'models_used': set(),
             'total_calls': 0
         }
         
         for file_path in analysis_files:
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
+                # Files that mention none of the keys read below cannot contribute, skip parsing them
+                if not self._mentions_model_info(file_path):
+                    continue
+                data = self._load_model_fields(file_path)
                 
                 # Extract model info from ai_model_info section (new format)
                 if 'ai_model_info' in data:
@@ -623,7 +550,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                     model_info['reasoning_effort'] = ai_model_info.get('reasoning_effort', model_info['reasoning_effort'])
                     model_info['response_format'] = ai_model_info.get('response_format', model_info['response_format'])
                     if 'models_used' in ai_model_info:
-                        model_info['models_used'].extend(ai_model_info['models_used'])
+                        model_info['models_used'].update(ai_model_info['models_used'])
                 
                 # Count AI responses (new format)
                 if 'ai_responses' in data:
@@ -634,7 +561,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                         if 'model_info' in response and 'model' in response['model_info']:
                             actual_model = response['model_info']['model']
                             if actual_model:
-                                model_info['models_used'].append(actual_model)
+                                model_info['models_used'].add(actual_model)
                                 # Use the first actual model as primary if we don't have one
                                 if model_info['primary_model'] == 'Unknown':
                                     model_info['primary_model'] = actual_model
@@ -649,7 +576,7 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                                     model_data = response['model_info']
                                     if 'model' in model_data and model_data['model']:
                                         actual_model = model_data['model']
-                                        model_info['models_used'].append(actual_model)
+                                        model_info['models_used'].add(actual_model)
                                         if model_info['primary_model'] == 'Unknown':
                                             model_info['primary_model'] = actual_model
                         elif isinstance(scale_data, dict) and 'model_info' in scale_data:
@@ -658,25 +585,92 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                             model_data = scale_data['model_info']
                             if 'model' in model_data and model_data['model']:
                                 actual_model = model_data['model']
-                                model_info['models_used'].append(actual_model)
+                                model_info['models_used'].add(actual_model)
                                 if model_info['primary_model'] == 'Unknown':
                                     model_info['primary_model'] = actual_model
                             
             except Exception as e:
-                print(f"   ⚠️ Could not parse {file_path}: {e}")
+                self._log(f"   ⚠️ Could not parse {file_path}: {e}")
         
-        # Remove duplicates and clean up
-        model_info['models_used'] = list(set(model_info['models_used']))
-        if not model_info['models_used']:
-            model_info['models_used'] = ['Unknown']  # Default only if no models found
+        # Stable order for the README; default only if no models found
+        model_info['models_used'] = sorted(model_info['models_used'], key=str) or ['Unknown']
         
         return model_info
     
+    @staticmethod
+    def _load_json(file_path):
+        """Load a JSON file"""
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(file_path, 'r') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _mentions_model_info(file_path):
+        """Whether the raw bytes of a file contain any key _extract_model_info reads"""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return any(mm.find(marker) != -1 for marker in OutputOrganizer._MODEL_INFO_MARKERS)
+    
+    def _load_model_fields(self, file_path):
+        """
+        Load the parts of an analysis file that _extract_model_info reads
+        With ijson the file is streamed and every top-level list/dict is reduced
+        to its model_info.model entries, so response bodies are never built
+        """
+        if ijson is None:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        
+        data = {}
+        builder = None
+        with open(file_path, 'rb', buffering=1 << 20) as f:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                # ai_model_info is small and read whole
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == 'ai_model_info' and event == 'end_map':
+                        data['ai_model_info'] = builder.value
+                        builder = None
+                    continue
+                if not prefix or event in ('map_key', 'end_map', 'end_array'):
+                    continue
+                
+                key, _, rest = prefix.partition('.')
+                scalar = event not in ('start_map', 'start_array')
+                if not rest:
+                    if key == 'ai_model_info' and event == 'start_map':
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    else:
+                        data[key] = {} if event == 'start_map' else [] if event == 'start_array' else value
+                    continue
+                
+                container = data.get(key)
+                if isinstance(container, list):
+                    # List of responses: keep one {'model_info': {'model': ...}} per item
+                    if rest == 'item':
+                        container.append({} if event == 'start_map' else None)
+                    elif rest == 'item.model_info' and event == 'start_map' and container[-1] is not None:
+                        container[-1]['model_info'] = {}
+                    elif rest == 'item.model_info.model' and scalar and container[-1] is not None:
+                        container[-1]['model_info']['model'] = value
+                elif isinstance(container, dict):
+                    # Single response
+                    if rest == 'model_info' and event == 'start_map':
+                        container['model_info'] = {}
+                    elif rest == 'model_info.model' and scalar:
+                        container['model_info']['model'] = value
+        return data
+    
     def _create_main_readme(self):
         """Create main README for the organized output"""
         readme_path = os.path.join(self.clean_output_dir, "README.md")
         
-        with open(readme_path, 'w') as f:
+        with open(readme_path, 'w', buffering=1 << 16) as f:
             f.write(f"""# Archaeological Discovery Results
 
 ## OpenAI to Z Challenge - Checkpoint 2 Solution
@@ -724,34 +718,210 @@ This directory contains the complete archaeological discovery analysis results,
 4. Review `4_metadata/` for technical details
 
 ---
-*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
+*Generated: {self.timestamp_human}*
 *OpenAI to Z Archaeological Discovery System*
 """)
         
-        print(f"   📄 Main README.md created")
+        self._log(f"   📄 Main README.md created")
+    
+    def _copy_files(self, copies, overwrite=True):
+        """
+        Copy (src, dest) pairs, concurrently while organize_outputs runs
+        Each pair is hardlinked or kernel-copied by _link_or_copy
+        """
+        copy = lambda pair: self._link_or_copy(*pair, overwrite=overwrite)
+        if self._copy_pool is None:
+            for pair in copies:
+                copy(pair)
+        else:
+            list(self._copy_pool.map(copy, copies))
+    
+    def _link_or_copy(self, src, dest, overwrite=True):
+        """
+        Hardlink src to dest when src lives under a temp root that cleanup is about to
+        delete and both share a filesystem, copy otherwise. Files that outlive the run
+        (outputs/, the thumbnail cache) are always copied, so rewriting them later can
+        never change a finished archive
+        An existing dest is detected by the failed link rather than a separate probe
+        """
+        dev = os.stat(src).st_dev
+        if dev not in self._link_ok:
+            self._link_ok[dev] = dev == os.stat(self.clean_output_dir).st_dev
+        
+        if self._link_ok[dev] and self._in_temp_root(src):
+            try:
+                os.link(src, dest)
+                return
+            except FileExistsError:
+                if not overwrite:
+                    return
+                # Replace the earlier file; writing into it could truncate a linked source
+                os.unlink(dest)
+                os.link(src, dest)
+                return
+            except OSError:
+                # EPERM/EXDEV etc. - stop trying links for this device
+                self._link_ok[dev] = False
+        elif not overwrite and os.path.exists(dest):
+            return
+        self._kernel_copy(src, dest)
+    
+    def _in_temp_root(self, src):
+        """Whether src lies under one of the temp roots removed by _cleanup_temp_directories"""
+        prefixes = self._file_index['temp_prefixes'] if self._file_index else ()
+        return bool(prefixes) and os.path.realpath(src).startswith(prefixes)
+    
+    @staticmethod
+    def _kernel_copy(src, dest):
+        """
+        Copy file data without passing it through Python: copy_file_range (which can
+        reflink on btrfs/XFS), then sendfile, then a buffered copy; metadata as copy2
+        """
+        with open(src, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+            size = os.fstat(in_fd).st_size
+            copied = 0
+            
+            if hasattr(os, 'copy_file_range'):
+                try:
+                    while copied < size:
+                        sent = os.copy_file_range(in_fd, out_fd, size - copied)
+                        if sent == 0:
+                            break
+                        copied += sent
+                except OSError:
+                    # EXDEV/ENOSYS/EINVAL - try the next method from where this one stopped
+                    pass
+            
+            if copied < size and hasattr(os, 'sendfile'):
+                try:
+                    while copied < size:
+                        sent = os.sendfile(out_fd, in_fd, copied, size - copied)
+                        if sent == 0:
+                            break
+                        copied += sent
+                except OSError:
+                    pass
+            
+            if copied < size:
+                fsrc.seek(copied)
+                fdst.seek(copied)
+                shutil.copyfileobj(fsrc, fdst, 1 << 16)
+        shutil.copystat(src, dest)
+    
+    def _build_file_index(self, temp_base=None):
+        """
+        Scan every output root once and bucket the files the organizer copies
+        Roots: temp_base, all archaeology temp dirs, outputs/, the current directory and its subdirectories
+        """
+        if self._file_index is not None:
+            return self._file_index
+        
+        temp_roots = [str(path) for path in self._temp_root.glob('archaeology_temp_*') if path.is_dir()]
+        roots = []
+        if temp_base:
+            roots.append(temp_base)
+        roots.extend(temp_roots)
+        roots.append("outputs")
+        roots.append(".")
+        # Pipeline folders in the current directory; outputs/ is already a root and earlier
+        # final_results_* runs, hidden dirs (.git, .venv) and node_modules never hold inputs
+        roots.extend(entry.name for entry in self._scan(".")
+                     if entry.is_dir()
+                     and not entry.name.startswith(('.', 'final_results_'))
+                     and entry.name not in self._SKIP_CWD_DIRS)
+        # The same folder can be reached twice (temp_base is usually a temp root or a
+        # cwd subfolder); keep the first spelling of each so nothing is indexed twice
+        unique_roots = {}
+        for root in roots:
+            unique_roots.setdefault(os.path.realpath(root), root)
+        roots = list(unique_roots.values())
+        
+        index = {
+            'roots': roots,
+            'temp_roots': temp_roots,
+            # Resolved temp roots with a trailing separator, for prefix checks on file paths
+            'temp_prefixes': tuple(os.path.join(os.path.realpath(root), '') for root in temp_roots),
+            'submission_json': [],  # (name, path)
+            'summary_md': [],       # (name, path)
+            'images': [],       # (scale, name, path) in root order
+            'analysis': []      # (name, path)
+        }
+        for root in roots:
+            self._index_root(root, index)
+        
+        self._file_index = index
+        return index
+    
+    def _index_root(self, root, index):
+        """Add the submission, image and analysis files under one root to the index"""
+        # Submission files directly in a root (current directory layouts)
+        for entry in self._scan(root):
+            name = entry.name
+            if not entry.is_file():
+                continue
+            if name.startswith('checkpoint2_submission_') and name.endswith('.json'):
+                index['submission_json'].append((name, entry.path))
+            elif name.startswith('checkpoint2_summary_') and name.endswith('.md'):
+                index['summary_md'].append((name, entry.path))
+            elif name.startswith('ai_archaeological_analysis_') and name.endswith('.json'):
+                index['analysis'].append((name, entry.path))
+        
+        # Submission files in competition_submissions/ or one of its run folders
+        for entry in self._scan(os.path.join(root, 'competition_submissions')):
+            if entry.is_dir():
+                for sub in self._scan(entry.path):
+                    if sub.name.startswith('checkpoint2_submission_') and sub.name.endswith('.json'):
+                        index['submission_json'].append((sub.name, sub.path))
+                    elif sub.name.startswith('checkpoint2_summary_') and sub.name.endswith('.md'):
+                        index['summary_md'].append((sub.name, sub.path))
+            elif entry.name.startswith('checkpoint2_'):
+                if entry.name.endswith('.json'):
+                    index['submission_json'].append((entry.name, entry.path))
+                elif entry.name.endswith('.md') and 'summary' in entry.name:
+                    index['summary_md'].append((entry.name, entry.path))
+        
+        # Satellite images by scale
+        for scale in self.IMAGE_SCALES:
+            for entry in self._scan(os.path.join(root, 'satellite_imagery', scale)):
+                if entry.name.endswith('.png') and entry.is_file():
+                    index['images'].append((scale, entry.name, entry.path))
+        
+        # Analysis JSON anywhere under archaeological_analysis/
+        for dirpath, _, filenames in os.walk(os.path.join(root, 'archaeological_analysis')):
+            index['analysis'].extend((name, os.path.join(dirpath, name)) for name in filenames if name.endswith('.json'))
+    
+    @staticmethod
+    def _scan(path):
+        """Entries of a directory, or none if it does not exist"""
+        try:
+            with os.scandir(path) as entries:
+                return list(entries)
+        except OSError:
+            return []
     
     def _cleanup_temp_directories(self, temp_base):
         """Clean up temporary processing directories"""
-        print(f"\n🧹 Cleaning up temporary directories...")
+        self._log(f"\n🧹 Cleaning up temporary directories...")
         
-        # Clean up ALL archaeology temp directories
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        temp_dirs = glob.glob(f"{temp_dir}/archaeology_temp_*")
+        # Clean up ALL archaeology temp directories (found by the file index scan)
+        temp_dirs = self._build_file_index(temp_base)['temp_roots']
         cleaned_count = 0
         
         for temp_directory in temp_dirs:
-            if os.path.exists(temp_directory):
-                try:
-                    shutil.rmtree(temp_directory)
-                    print(f"   ✅ Cleaned up: {temp_directory}")
-                    cleaned_count += 1
-                except Exception as e:
-                    print(f"   ⚠️ Could not clean {temp_directory}: {e}")
+            # One rmtree per root; on Linux it deletes with unlinkat relative to open
+            # directory fds, and keeps going past files it cannot remove
+            errors = []
+            shutil.rmtree(temp_directory, onerror=lambda func, path, exc_info: errors.append(exc_info[1]))
+            if not errors:
+                self._log(f"   ✅ Cleaned up: {temp_directory}")
+                cleaned_count += 1
+            elif not isinstance(errors[0], FileNotFoundError):
+                self._log(f"   ⚠️ Could not clean {temp_directory}: {errors[0]}")
         
         if cleaned_count > 0:
-            print(f"   ✅ Total temporary directories cleaned: {cleaned_count}")
+            self._log(f"   ✅ Total temporary directories cleaned: {cleaned_count}")
         else:
-            print(f"   ℹ️ No temporary directories found to clean")
+            self._log(f"   ℹ️ No temporary directories found to clean ({self._archaeology_temp_glob})")
         
-        print(f"   🎉 All temporary processing files cleaned up!") 
\ No newline at end of file
+        self._log(f"   🎉 All temporary processing files cleaned up!") 
\ No newline at end of file